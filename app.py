@@ -1,26 +1,43 @@
 # pyre-ignore-all-errors
+import startup  # Imported first so the import phase is timed from process start
 import os
+import time
 import sys
-import json
 import shutil
 import threading
-import smtplib
+import multiprocessing
+import bisect
+import collections
 import csv
-from email.message import EmailMessage
-import mimetypes
 import datetime
 import customtkinter as ctk
 import tkinter as tk
 from tkinter import filedialog, messagebox
 
 import ctypes
-ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID("eren.mailattacker.v1")
+if sys.platform == "win32":
+    ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID("eren.mailattacker.v1")
 
 import config
 import langs
 import crypto
+import migration
+import styles
+import selection
+import store
+import templating
+import reports
+import engine
+import profiling
+import stallwatch
+import progress
+import worker
+import preflight
+from engine import resolve_att_path
 from langs import t
 
+startup.mark("imports")
+
 ctk.set_appearance_mode(config.DEFAULT_THEME)
 ctk.set_default_color_theme(config.ACCENT_COLOR)
 
@@ -32,24 +49,410 @@ def resource_path(relative_path):
 
     return os.path.join(base_path, relative_path)
 
-def resolve_att_path(abs_path):
-    """Resolve an attachment path. If it exists, return as-is.
-    Otherwise, extract profile/filename and resolve against current ATTACHMENTS_DIR."""
-    if not abs_path:
-        return abs_path
-    if os.path.exists(abs_path):
-        return abs_path
-    # Try to extract the relative part: attachments/<profile>/<filename>
-    parts = abs_path.replace("\\", "/").split("/")
-    try:
-        att_idx = [p.lower() for p in parts].index("attachments")
-        rel = os.path.join(*parts[att_idx + 1:])
-        resolved = os.path.join(config.ATTACHMENTS_DIR, rel)
-        if os.path.exists(resolved):
-            return resolved
-    except (ValueError, TypeError):
-        pass
-    return abs_path
+def _safe_profile_name(company, email):
+    """Folder name for a contact's attachments, built from company name or email."""
+    profile_name = company or email
+    safe = "".join(c for c in profile_name if c.isalnum() or c in (" ", "-", "_", ".", "@")).strip()
+    return safe or f"profile_{int(time.time())}"
+
+class ContactEditor(ctk.CTkToplevel):
+    """Add/Edit contact dialog. Built once, then withdrawn and re-shown with open() for each contact."""
+
+    WIDTH = 920
+    HEIGHT = 560
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.app = app
+        self.contact = None
+        self.sync_state = {"folder": None, "active": False}
+
+        self.geometry(f"{self.WIDTH}x{self.HEIGHT}")
+        self.resizable(False, False)
+        self.transient(app)
+        self.protocol("WM_DELETE_WINDOW", self.close)
+
+        icon_path = resource_path(os.path.join("assets", "logo.ico"))
+        if os.path.exists(icon_path):
+            self.iconbitmap(icon_path)
+
+        self.comp_var = ctk.StringVar()
+        self.email_var = ctk.StringVar()
+        self.subj_var = ctk.StringVar()
+        self.tag_var = ctk.StringVar()
+        self.files_var = ctk.StringVar()
+
+        bottom_bar = ctk.CTkFrame(self, fg_color="transparent")
+        bottom_bar.pack(side="bottom", fill="x", padx=20, pady=(5, 15))
+        
+        self.save_btn_bottom = ctk.CTkButton(bottom_bar, text="", command=self.save_changes, fg_color="#1f538d", height=40, font=ctk.CTkFont(size=14, weight="bold"))
+        self.save_btn_bottom.pack(side="right", padx=5)
+
+        main_frame = ctk.CTkFrame(self, fg_color="transparent")
+        main_frame.pack(fill="both", expand=True, padx=20, pady=(15, 5))
+        
+        left_frame = ctk.CTkFrame(main_frame, fg_color="transparent", width=300)
+        left_frame.pack(side="left", fill="both", expand=False, padx=(0, 10))
+        left_frame.pack_propagate(False)
+        
+        right_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        right_frame.pack(side="right", fill="both", expand=True)
+
+        ctk.CTkLabel(left_frame, text=t("company_name"), anchor="w").pack(fill="x", padx=5, pady=config.LABEL_PAD_Y)
+        ctk.CTkEntry(left_frame, textvariable=self.comp_var).pack(fill="x", padx=5, pady=config.ENTRY_PAD_Y)
+
+        ctk.CTkLabel(left_frame, text=t("recipient_email"), anchor="w").pack(fill="x", padx=5, pady=config.LABEL_PAD_Y)
+        ctk.CTkEntry(left_frame, textvariable=self.email_var).pack(fill="x", padx=5, pady=config.ENTRY_PAD_Y)
+
+        ctk.CTkLabel(left_frame, text=t("subject"), anchor="w").pack(fill="x", padx=5, pady=config.LABEL_PAD_Y)
+        ctk.CTkEntry(left_frame, textvariable=self.subj_var).pack(fill="x", padx=5, pady=config.ENTRY_PAD_Y)
+
+        ctk.CTkLabel(left_frame, text=t("tag"), anchor="w").pack(fill="x", padx=5, pady=config.LABEL_PAD_Y)
+        self.tag_cb = ctk.CTkComboBox(left_frame, variable=self.tag_var, values=[""])
+        self.tag_cb.pack(fill="x", padx=5, pady=config.ENTRY_PAD_Y)
+
+        ctk.CTkLabel(left_frame, text=t("template"), anchor="w").pack(fill="x", padx=5, pady=config.LABEL_PAD_Y)
+        tpl_row = ctk.CTkFrame(left_frame, fg_color="transparent")
+        tpl_row.pack(fill="x", padx=5, pady=config.ENTRY_PAD_Y)
+        self.template_var = ctk.StringVar(value=t("no_template"))
+        self.template_cb = ctk.CTkComboBox(tpl_row, variable=self.template_var, values=[t("no_template")], state="readonly", command=self.on_template_selected)
+        self.template_cb.pack(side="left", fill="x", expand=True)
+        ctk.CTkButton(tpl_row, text="+", width=30, command=self.save_as_template).pack(side="right", padx=(5, 0))
+
+        ctk.CTkLabel(right_frame, text=t("message_body"), anchor="w", font=ctk.CTkFont(weight="bold")).pack(fill="x", padx=5, pady=config.LABEL_PAD_Y)
+        
+        vars_frame = ctk.CTkFrame(right_frame, fg_color="transparent")
+        vars_frame.pack(fill="x", padx=5)
+        ctk.CTkLabel(vars_frame, text=t("insert_label"), font=ctk.CTkFont(size=11, slant="italic"), text_color="gray").pack(side="left", padx=(0, 5))
+        
+        for var in templating.TEMPLATE_VARS:
+            ctk.CTkButton(vars_frame, text=var, width=len(var)*8, height=22, fg_color="gray30", hover_color="gray40", font=ctk.CTkFont(size=11),
+                          command=lambda v=var: self.msg_textbox.insert(tk.INSERT, v)).pack(side="left", padx=2)
+        
+        self.msg_textbox = ctk.CTkTextbox(right_frame)
+        self.msg_textbox.pack(fill="both", expand=True, padx=5, pady=config.ENTRY_PAD_Y)
+            
+        # Message right-click paste/copy menu
+        self.msg_menu = tk.Menu(self, tearoff=0)
+        self.msg_menu.add_command(label=t("copy"), command=self.copy_text)
+        self.msg_menu.add_command(label=t("paste"), command=self.paste_text)
+        self.msg_textbox._textbox.bind("<Button-3>", self.show_msg_menu)
+
+        ctk.CTkLabel(left_frame, text=t("attachments"), anchor="w", font=ctk.CTkFont(weight="bold")).pack(fill="x", padx=5, pady=config.LABEL_PAD_Y)
+        
+        self.prog_lbl = ctk.CTkLabel(left_frame, text="", text_color="gray")
+        self.prog_bar = ctk.CTkProgressBar(left_frame)
+        self.prog_bar.set(0)
+        
+        self.file_list_frame = ctk.CTkScrollableFrame(left_frame, fg_color=("gray85", "gray20"))
+        self.file_list_frame.pack(fill="both", expand=True, padx=5, pady=(0, 5))
+
+        ctk.CTkButton(bottom_bar, text=t("open_folder"), command=self.open_attachment_folder, width=130, fg_color="gray50", hover_color="gray40").pack(side="left", padx=5)
+        ctk.CTkButton(bottom_bar, text=t("add_select_files"), command=self.select_file, width=150).pack(side="left", padx=5)
+
+        self.withdraw()
+
+    def open(self, contact=None):
+        """Rebind the fields to contact (None for a new one) and show the dialog."""
+        self.contact = contact
+        self.sync_state = {"folder": None, "active": False}
+        self.title(t("add_new_contact_title") if contact is None else t("edit_contact_title"))
+        self.save_btn_bottom.configure(text=t("save_contact_list") if contact else t("add_to_contact_list"), state="normal")
+        self.prog_lbl.pack_forget()
+        self.prog_bar.pack_forget()
+
+        self.comp_var.set(contact.get("company", "") if contact else "")
+        self.email_var.set(contact.get("email", "") if contact else "")
+        self.tag_var.set(contact.get("tag", "") if contact else "")
+        self.tag_cb.configure(values=self.app.existing_tags() or [""])
+        
+        # Fields show the effective text; unchanged template text is not stored on the contact
+        templates = self.app.app_config["templates"]
+        self._refresh_template_choices()
+        tpl = templates.get(contact.get("template_id") or "") if contact else None
+        self.template_var.set(tpl["name"] if tpl else t("no_template"))
+        subject, message = templating.resolve(contact, templates) if contact else ("", "")
+        self.subj_var.set(subject)
+        
+        legacy_att = contact.get("attachment", "") if contact else ""
+        existing_atts = contact.get("attachments", [legacy_att] if legacy_att else []) if contact else []
+        existing_atts = [resolve_att_path(p) for p in existing_atts]
+        self.files_var.set("|".join(existing_atts))
+        self.update_files_display(existing_atts)
+
+        self.msg_textbox.delete("1.0", "end")
+        self.msg_textbox.insert("1.0", message)
+
+        app = self.app
+        x = app.winfo_x() + (app.winfo_width() - self.WIDTH) // 2
+        y = app.winfo_y() + (app.winfo_height() - self.HEIGHT) // 2
+        self.geometry(f"+{x}+{y}")
+        self.deiconify()
+        self.grab_set()
+        self.focus()
+
+    def _refresh_template_choices(self):
+        names = sorted(tpl["name"] for tpl in self.app.app_config["templates"].values())
+        self.template_cb.configure(values=[t("no_template")] + names)
+
+    def _selected_template_id(self):
+        name = self.template_var.get()
+        return next((tid for tid, tpl in self.app.app_config["templates"].items() if tpl["name"] == name), None)
+
+    def on_template_selected(self, choice=None):
+        tpl = self.app.app_config["templates"].get(self._selected_template_id() or "")
+        if tpl:
+            self.subj_var.set(tpl.get("subject", ""))
+            self.msg_textbox.delete("1.0", "end")
+            self.msg_textbox.insert("1.0", tpl.get("message", ""))
+
+    def save_as_template(self):
+        """Store the current subject and message as a new shared template."""
+        name = ctk.CTkInputDialog(text=t("template_name_prompt"), title=t("save_as_template")).get_input()
+        name = (name or "").strip()
+        if not name:
+            return
+        templates = self.app.app_config["templates"]
+        if any(tpl["name"] == name for tpl in templates.values()):
+            messagebox.showerror(t("error"), t("template_exists"), parent=self)
+            return
+        templates[templating.new_template_id(templates)] = {
+            "name": name,
+            "subject": self.subj_var.get().strip(),
+            "message": self.msg_textbox.get("1.0", "end-1c").strip(),
+        }
+        self.app.save_config()
+        self._refresh_template_choices()
+        self.template_var.set(name)
+
+    def close(self):
+        self.sync_state["active"] = False
+        self.grab_release()
+        self.withdraw()
+
+    @profiling.profiled("save_contact")
+    def save_changes(self):
+        email_val = self.email_var.get().strip()
+        if not email_val:
+            messagebox.showerror(t("error"), t("email_required"), parent=self)
+            return
+
+        final_attachments = [p for p in self.files_var.get().split("|") if p]
+        new_tag = self.tag_var.get().strip()
+        app = self.app
+        
+        # Only text that differs from the selected template is stored as a per-contact override
+        template_id = self._selected_template_id()
+        tpl = app.app_config["templates"].get(template_id or "", {})
+        subject = self.subj_var.get().strip()
+        message = self.msg_textbox.get("1.0", "end-1c").strip()
+        if tpl and subject == tpl.get("subject", ""):
+            subject = ""
+        if tpl and message == tpl.get("message", ""):
+            message = ""
+
+        if self.contact:
+            c_id = self.contact.get("id")
+            for c in app.app_config["contacts"]:
+                if c.get("id") == c_id:
+                    app.index_tags([c], -1)
+                    c["company"] = self.comp_var.get().strip()
+                    c["email"] = email_val
+                    c["subject"] = subject
+                    c["tag"] = new_tag
+                    c["message"] = message
+                    c["attachments"] = final_attachments
+                    if "attachment" in c: del c["attachment"]
+                    if template_id:
+                        c["template_id"] = template_id
+                    else:
+                        c.pop("template_id", None)
+                    app.index_tags([c], 1)
+                    app.save_contacts([c])
+                    break
+        else:
+            new_contact = {
+                "id": app.next_contact_id(),
+                "company": self.comp_var.get().strip(),
+                "email": email_val,
+                "subject": subject,
+                "tag": new_tag,
+                "message": message,
+                "attachments": final_attachments,
+                "enabled": True
+            }
+            if template_id:
+                new_contact["template_id"] = template_id
+            app.place_contacts([new_contact], 0)
+            app.index_tags([new_contact], 1)
+
+        app.refresh_contacts_list()
+        self.close()
+
+    def copy_text(self):
+        try:
+            selected_text = ""
+            try: selected_text = self.msg_textbox.selection_get()
+            except tk.TclError: pass
+            
+            self.clipboard_clear()
+            self.clipboard_append(selected_text)
+        except Exception:
+            pass
+            
+    def paste_text(self):
+        try:
+            self.msg_textbox.insert(tk.INSERT, self.clipboard_get())
+        except Exception:
+            pass
+
+    def show_msg_menu(self, event):
+        try:
+            self.msg_menu.tk_popup(event.x_root, event.y_root)
+        finally:
+            self.msg_menu.grab_release()
+
+    def update_files_display(self, paths_list):
+        for w in self.file_list_frame.winfo_children():
+            w.destroy()
+        
+        valid_paths = [p for p in paths_list if p]
+        if not valid_paths:
+            ctk.CTkLabel(self.file_list_frame, text=t("no_files_selected"), text_color="gray").pack(anchor="w", padx=5, pady=2)
+            return
+            
+        for p in valid_paths:
+            item_frame = ctk.CTkFrame(self.file_list_frame, fg_color="transparent")
+            item_frame.pack(fill="x", pady=2)
+            
+            lbl = ctk.CTkLabel(item_frame, text=os.path.basename(p), anchor="w")
+            lbl.pack(side="left", fill="x", expand=True, padx=5)
+            
+            del_btn = ctk.CTkButton(item_frame, text="X", width=20, fg_color="transparent", text_color="#ff5555", hover_color="#8b0000",
+                                    command=lambda path=p: self.delete_attachment(path))
+            del_btn.pack(side="right", padx=5)
+
+    def delete_attachment(self, path_to_delete):
+        try:
+            if os.path.exists(path_to_delete):
+                os.remove(path_to_delete)
+        except Exception as e:
+            print(f"Error deleting file: {e}")
+            
+        current_paths = self.files_var.get().split("|")
+        if path_to_delete in current_paths:
+            current_paths.remove(path_to_delete)
+            
+        new_val = "|".join([p for p in current_paths if p])
+        self.files_var.set(new_val)
+        self.update_files_display(new_val.split("|") if new_val else [])
+
+    def select_file(self):
+        paths = filedialog.askopenfilenames(parent=self)
+        if not paths:
+            return
+        safe_profile_name = _safe_profile_name(self.comp_var.get().strip(), self.email_var.get().strip())
+            
+        target_dir = os.path.join(config.ATTACHMENTS_DIR, safe_profile_name)
+        os.makedirs(target_dir, exist_ok=True)
+        
+        # Get currently existing files
+        current_files = [p for p in self.files_var.get().split("|") if p]
+        
+        self.prog_lbl.pack(pady=2)
+        self.prog_bar.pack(fill="x", padx=20, pady=5)
+        self.save_btn_bottom.configure(state="disabled")
+        self.update_idletasks()
+        
+        added_paths = []
+        total = len(paths)
+        
+        for i, p in enumerate(paths):
+            if os.path.exists(p):
+                try:
+                    filename = os.path.basename(p)
+                    target_path = os.path.join(target_dir, filename)
+                    shutil.copy2(p, target_path)
+                    added_paths.append(target_path)
+                    
+                    self.prog_bar.set((i + 1) / total)
+                    self.prog_lbl.configure(text=f"Copying files... ({i+1}/{total})")
+                    self.update_idletasks()
+                except Exception as e:
+                    messagebox.showerror("Error", f"Failed to copy {filename}: {e}", parent=self)
+                    self.save_btn_bottom.configure(state="normal")
+                    self.prog_lbl.pack_forget()
+                    self.prog_bar.pack_forget()
+                    return
+        
+        # Merge: replace old entries with same filename, add new ones
+        added_basenames = {os.path.basename(p) for p in added_paths}
+        kept = [p for p in current_files if os.path.basename(p) not in added_basenames]
+        all_paths = kept + added_paths
+        self.files_var.set("|".join(all_paths))
+        self.update_files_display(all_paths)
+        self.save_btn_bottom.configure(state="normal")
+        self.prog_lbl.pack_forget()
+        self.prog_bar.pack_forget()
+
+    def check_folder_sync(self, sync_state):
+        # A newer open() replaces sync_state, which stops this loop
+        if not self.winfo_exists() or sync_state is not self.sync_state or not sync_state["active"] or not sync_state["folder"]:
+            return
+            
+        folder = sync_state["folder"]
+        if os.path.exists(folder):
+            current_files = [os.path.join(folder, f) for f in os.listdir(folder) if os.path.isfile(os.path.join(folder, f))]
+            current_files_str = "|".join(current_files)
+            
+            if current_files_str != self.files_var.get():
+                self.files_var.set(current_files_str)
+                self.update_files_display(current_files)
+                
+        self.after(1000, lambda: self.check_folder_sync(sync_state))
+
+    def open_attachment_folder(self):
+        paths = [resolve_att_path(p) for p in self.files_var.get().split("|") if p]
+        folder_to_open = None
+        
+        # Try to get folder from first valid attachment
+        for p in paths:
+            d = os.path.normpath(os.path.dirname(p))
+            if d and os.path.isdir(d):
+                folder_to_open = d
+                break
+        
+        # Fallback: create/use profile folder in ATTACHMENTS_DIR
+        if not folder_to_open:
+            safe_profile_name = _safe_profile_name(self.comp_var.get().strip(), self.email_var.get().strip())
+            os.makedirs(config.ATTACHMENTS_DIR, exist_ok=True)
+            folder_to_open = os.path.normpath(os.path.join(config.ATTACHMENTS_DIR, safe_profile_name))
+            os.makedirs(folder_to_open, exist_ok=True)
+        
+        if folder_to_open and os.path.isdir(folder_to_open):
+            os.startfile(folder_to_open)
+            
+            if not self.sync_state["active"]:
+                self.sync_state["folder"] = folder_to_open
+                self.sync_state["active"] = True
+                sync_state = self.sync_state
+                self.after(1000, lambda: self.check_folder_sync(sync_state))
+
+# Boolean contact fields and their value when missing from a record
+CONTACT_FLAG_DEFAULTS = {"enabled": True, "favorite": False}
+
+# Row border color for each engine progress state
+ENGINE_STATE_COLORS = {"sending": "yellow", "sent": "green", "error": "red", "retry": "orange", "skipped": "gray"}
+
+# Views other than Contacts; built lazily and rebuilt after a language or data folder change
+SECONDARY_VIEWS = ("favorites", "settings", "reports", "help")
+
+# How often the campaign dashboard is redrawn / a campaign process's events are read while sending
+DASHBOARD_POLL_MS = 500
+EVENT_POLL_MS = 100
+
+# Started with --profile: time UI actions and save cProfile output for this session
+PROFILE_FLAG = "--profile" in sys.argv
 
 class MailAttackerApp(ctk.CTk):
     def __init__(self):
@@ -63,10 +466,52 @@ class MailAttackerApp(ctk.CTk):
         if os.path.exists(icon_path):
             self.iconbitmap(icon_path)
         
-        self.app_config = {"smtp": {}, "contacts": []}
+        self.app_config = {"smtp": {}, "contacts": [], "templates": {}}
         self.contact_widgets = {}
-        self.load_config()
-        self.apply_theme_and_lang()
+        self.data = None  # engine.DataFolder: contact, report, retry and suppression stores
+        self.contact_editor = None
+        self.tag_index = collections.Counter()
+        self.selection = selection.SelectionModel()
+        self.stall_watch = None
+        self.progress = None  # progress.ThroughputTracker of the running campaign
+        self.campaign = None  # engine.MailingEngine or worker.CampaignProcess while a campaign runs
+        self.campaign_paused = False
+        # An interrupted data folder migration must finish before any data is opened
+        pending_migration = migration.pending_job(config.APP_DIR)
+        with startup.phase("config_load"):
+            if not pending_migration:
+                self.load_config()
+        with startup.phase("view_build"):
+            self.apply_theme_and_lang()
+        self.after_idle(self._on_first_paint)
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Finish a data folder migration that was interrupted (crash, power loss)
+        if pending_migration:
+            self.after(200, lambda: self.run_data_migration(pending_migration, self._on_migration_resumed))
+
+    def _on_first_paint(self):
+        startup.mark("first_paint")
+        if self.data is not None:
+            self._on_data_ready()
+        # Otherwise a pending data folder migration runs first and _on_migration_resumed() calls it
+
+    def _on_data_ready(self):
+        """Startup work that uses the data folder: timings, report retention, stall watchdog, pending retries."""
+        startup.write_report(config.APP_DIR, config.APP_VERSION)
+        threading.Thread(target=self.apply_report_retention, daemon=True).start()
+        # Watch the main loop from here on; startup itself is covered by the startup timings
+        self.stall_watch = stallwatch.StallWatchdog(self, lambda: config.APP_DIR,
+                                                    threshold_ms=int(self.app_config.get("stall_threshold_ms", 500)))
+        self.stall_watch.start()
+        self.offer_pending_retries()
+
+    def on_close(self):
+        if isinstance(self.campaign, worker.CampaignProcess) and self.campaign.is_alive():
+            self.campaign.detach()  # The campaign process finishes on its own
+        if self.stall_watch is not None:
+            self.stall_watch.stop()  # Saves the final loop latency histogram
+        self.destroy()
 
     def apply_theme_and_lang(self):
         # Apply theme
@@ -110,6 +555,25 @@ class MailAttackerApp(ctk.CTk):
         
         self.send_all_button = ctk.CTkButton(self.sidebar_frame, text=t("send_all_now"), command=self.send_all_mails, fg_color="green", hover_color="darkgreen", height=45, font=ctk.CTkFont(size=14, weight="bold"))
         self.send_all_button.grid(row=7, column=0, padx=15, pady=(15, 25))
+        
+        # Campaign dashboard: fills the sidebar's spacer row while a campaign runs
+        self.dashboard_frame = ctk.CTkFrame(self.sidebar_frame, fg_color=("gray80", "gray22"))
+        self.dash_title_lbl = ctk.CTkLabel(self.dashboard_frame, text=t("dash_title"), font=ctk.CTkFont(weight="bold"))
+        self.dash_title_lbl.pack(fill="x", padx=10, pady=(8, 0))
+        self.dash_bar = ctk.CTkProgressBar(self.dashboard_frame, width=160)
+        self.dash_bar.set(0)
+        self.dash_bar.pack(padx=10, pady=(4, 2))
+        self.dash_labels = {}
+        for key in ("sent", "rate", "bytes", "errors", "eta"):
+            lbl = ctk.CTkLabel(self.dashboard_frame, text="", anchor="w", font=ctk.CTkFont(size=12))
+            lbl.pack(fill="x", padx=10)
+            self.dash_labels[key] = lbl
+        dash_btns = ctk.CTkFrame(self.dashboard_frame, fg_color="transparent")
+        dash_btns.pack(fill="x", padx=10, pady=(4, 8))
+        self.dash_pause_btn = ctk.CTkButton(dash_btns, text=t("pause"), width=75, height=26, command=self.toggle_campaign_pause)
+        self.dash_pause_btn.pack(side="left")
+        self.dash_cancel_btn = ctk.CTkButton(dash_btns, text=t("cancel"), width=75, height=26, fg_color="#b32d2d", hover_color="#8a2222", command=self.cancel_campaign)
+        self.dash_cancel_btn.pack(side="right")
 
         # --- Contacts Frame ---
         self.contacts_frame = ctk.CTkFrame(self, corner_radius=0, fg_color="transparent")
@@ -177,6 +641,85 @@ class MailAttackerApp(ctk.CTk):
         
         self.contacts_scrollable_frame.bind("<Button-3>", self.show_context_menu)
         
+        # Persistent widgets are re-translated in place when the language changes
+        for widget, key in [
+            (self.contacts_button, "contacts"), (self.help_button, "help"),
+            (self.favorites_button, "favorites"), (self.reports_button, "reports"),
+            (self.settings_button, "settings"), (self.send_all_button, "send_all_now"),
+            (self.add_btn_top, "add_new_contact"), (self.import_btn, "import_csv"),
+            (self.export_btn, "export_csv"), (self.toggle_all_btn, "select_deselect_all"),
+            (self.btn_sort_all, "sort_all"), (self.btn_sort_active, "sort_active"),
+            (self.btn_sort_inactive, "sort_inactive"), (self.btn_sort_favs, "sort_favs"),
+            (self.btn_sort_name, "sort_name"), (self.dash_title_lbl, "dash_title"), (self.dash_cancel_btn, "cancel"),
+        ]:
+            langs.bind(widget, key)
+        langs.bind(self.search_entry, "search_placeholder", option="placeholder_text")
+        for index, key in [(0, "toggle_selected"), (1, "toggle_favorite_selected"), (2, "delete_selected"),
+                           (4, "select_all"), (5, "deselect_all")]:
+            langs.bind(self.context_menu, key, option="label", index=index)
+        
+        # Secondary views are built the first time they are shown
+        self._unbuilt_views = set(SECONDARY_VIEWS)
+        self.show_contacts_view()
+
+    def _ensure_view(self, name):
+        """Build a secondary view on first use."""
+        if name in self._unbuilt_views:
+            self._unbuilt_views.discard(name)
+            with startup.phase(f"build_{name}_view"):
+                getattr(self, f"_build_{name}_view")()
+
+    def _reset_secondary_views(self):
+        """Destroy built secondary views so they are rebuilt (with current language and data) on next show."""
+        for name in SECONDARY_VIEWS:
+            frame = getattr(self, f"{name}_frame", None)
+            if frame is not None:
+                frame.destroy()
+                setattr(self, f"{name}_frame", None)
+        self._unbuilt_views = set(SECONDARY_VIEWS)
+        if self.contact_editor is not None:
+            self.contact_editor.destroy()
+            self.contact_editor = None
+
+    def _hide_views(self):
+        for name in ("contacts",) + SECONDARY_VIEWS:
+            frame = getattr(self, f"{name}_frame", None)
+            if frame is not None:
+                frame.grid_forget()
+
+    @profiling.profiled()
+    def relocalize(self, old_lang, rows=True):
+        """Apply the current language to the running UI without restarting."""
+        old_strings = langs.TRANSLATIONS.get(old_lang, langs.TRANSLATIONS["en"])
+        old_all_tags = old_strings["all_tags"]
+        langs.relocalize()
+        
+        # The tag filter shows the translated "All Tags" entry as its value
+        if self.tag_filter_var.get() == old_all_tags:
+            self.tag_filter_var.set(t("all_tags"))
+        tag_values = [v for v in self.btn_filter_tag.cget("values") if v != old_all_tags]
+        self.btn_filter_tag.configure(values=[t("all_tags")] + tag_values)
+        
+        self._reset_secondary_views()
+        
+        # Contact rows are updated in chunks so the switch stays responsive with large lists
+        if rows:
+            self._relocalize_rows(list(self.contact_widgets.keys()), 0, old_ready=old_strings["ready"])
+
+    def _relocalize_rows(self, ids, start, old_ready, chunk=300):
+        ready_txt, edit_txt, del_txt = t("ready"), t("edit"), t("del")
+        for c_id in ids[start:start + chunk]:
+            widgets = self.contact_widgets.get(c_id)
+            if not widgets or not widgets["row_frame"].winfo_exists():
+                continue
+            if widgets["status_lbl"].cget("text") == old_ready:
+                widgets["status_lbl"].configure(text=ready_txt)
+            widgets["edit_btn"].configure(text=edit_txt)
+            widgets["del_btn"].configure(text=del_txt)
+        if start + chunk < len(ids):
+            self.after(1, lambda: self._relocalize_rows(ids, start + chunk, old_ready, chunk))
+
+    def _build_favorites_view(self):
         # --- Favorites Frame ---
         self.favorites_frame = ctk.CTkFrame(self, corner_radius=0, fg_color="transparent")
         
@@ -205,11 +748,12 @@ class MailAttackerApp(ctk.CTk):
                 for c in self.app_config["contacts"]:
                     if c.get("id") == self.active_fav_contact_id:
                         c["notes"] = self.fav_notes_textbox.get("1.0", "end-1c")
-                        self.save_config()
+                        self.save_contacts([c])
                         break
                         
         self.fav_notes_textbox.bind("<KeyRelease>", on_note_modified)
 
+    def _build_settings_view(self):
         # --- Settings Frame ---
         self.settings_frame = ctk.CTkScrollableFrame(self, corner_radius=0, fg_color="transparent")
         settings_top_frame = ctk.CTkFrame(self.settings_frame, fg_color="transparent")
@@ -253,7 +797,7 @@ class MailAttackerApp(ctk.CTk):
         
         # Row 2: Email + Password
         smtp_row2 = ctk.CTkFrame(smtp_frame, fg_color="transparent")
-        smtp_row2.pack(fill="x", padx=config.PAD_X, pady=(8, 10))
+        smtp_row2.pack(fill="x", padx=config.PAD_X, pady=(8, 0))
         
         email_col = ctk.CTkFrame(smtp_row2, fg_color="transparent")
         email_col.pack(side="left", fill="x", expand=True, padx=(0, 5))
@@ -273,6 +817,15 @@ class MailAttackerApp(ctk.CTk):
         self.show_pass_btn = ctk.CTkCheckBox(pass_inner, text="👁", variable=self.show_pass_var, command=self.toggle_password_visibility, width=30)
         self.show_pass_btn.pack(side="right", padx=(5, 0))
         
+        # Row 3: The message size limit the server advertised (ESMTP SIZE)
+        smtp_row3 = ctk.CTkFrame(smtp_frame, fg_color="transparent")
+        smtp_row3.pack(fill="x", padx=config.PAD_X, pady=(8, 10))
+        self.size_limit_lbl = ctk.CTkLabel(smtp_row3, text="", anchor="w", text_color="gray")
+        self.size_limit_lbl.pack(side="left", fill="x", expand=True)
+        self.size_limit_btn = ctk.CTkButton(smtp_row3, text=t("size_limit_check"), command=self.check_size_limit, width=100)
+        self.size_limit_btn.pack(side="right")
+        self.refresh_size_limit_label()
+        
         others_frame = ctk.CTkFrame(self.settings_frame)
         others_frame.pack(fill="x", padx=config.PAD_X, pady=(5, 10))
         
@@ -317,6 +870,8 @@ class MailAttackerApp(ctk.CTk):
         ctk.CTkLabel(notif_col, text=" ", anchor="w").pack(fill="x")
         self.notif_checkbox = ctk.CTkCheckBox(notif_col, text=t("enable_notif"), variable=self.notif_var)
         self.notif_checkbox.pack(anchor="w", pady=(2, 0))
+        self.engine_process_var = ctk.BooleanVar(value=bool(self.app_config.get("engine_process", False)))
+        ctk.CTkCheckBox(notif_col, text=t("engine_process"), variable=self.engine_process_var).pack(anchor="w", pady=(6, 0))
         
         # Row 4: Date + Time Format
         date_map_reverse = {"%d/%m/%Y": "DD/MM/YYYY", "%m/%d/%Y": "MM/DD/YYYY", "%Y-%m-%d": "YYYY-MM-DD", "%d.%m.%Y": "DD.MM.YYYY"}
@@ -344,6 +899,19 @@ class MailAttackerApp(ctk.CTk):
         time_options = ["24H", "12H"]
         ctk.CTkComboBox(time_col, values=time_options, variable=self.time_format_var, state="readonly", width=100).pack(anchor="w", pady=(2, 0))
         
+        # Report retention (0 = no limit)
+        self.retention_days_var = ctk.StringVar(value=str(self.app_config.get("report_retention_days", 0)))
+        retention_col = ctk.CTkFrame(datetime_row, fg_color="transparent")
+        retention_col.pack(side="left", fill="x", expand=True)
+        ctk.CTkLabel(retention_col, text=t("report_retention_days"), anchor="w").pack(fill="x")
+        ctk.CTkEntry(retention_col, textvariable=self.retention_days_var, validate='key', validatecommand=vcmd_delay, width=80).pack(anchor="w", pady=(2, 0))
+        
+        self.report_max_mb_var = ctk.StringVar(value=str(self.app_config.get("report_max_mb", 0)))
+        max_size_col = ctk.CTkFrame(datetime_row, fg_color="transparent")
+        max_size_col.pack(side="left", fill="x", expand=True)
+        ctk.CTkLabel(max_size_col, text=t("report_max_mb"), anchor="w").pack(fill="x")
+        ctk.CTkEntry(max_size_col, textvariable=self.report_max_mb_var, validate='key', validatecommand=vcmd_delay, width=80).pack(anchor="w", pady=(2, 0))
+        
         # Data Folder
         data_folder_frame = ctk.CTkFrame(self.settings_frame)
         data_folder_frame.pack(fill="x", padx=config.PAD_X, pady=(5, 10))
@@ -368,6 +936,38 @@ class MailAttackerApp(ctk.CTk):
         ctk.CTkButton(df_row, text=t("browse"), command=browse_data_folder, width=80).pack(side="left", padx=(5, 0))
         ctk.CTkButton(df_row, text=t("reset_default"), command=reset_data_folder, width=80, fg_color="gray50", hover_color="gray40").pack(side="left", padx=(5, 0))
         
+        # Suppression List
+        supp_frame = ctk.CTkFrame(self.settings_frame)
+        supp_frame.pack(fill="x", padx=config.PAD_X, pady=(5, 10))
+        
+        ctk.CTkLabel(supp_frame, text=t("suppression_list"), font=ctk.CTkFont(size=14, weight="bold")).pack(fill="x", padx=config.PAD_X, pady=(10, 0))
+        ctk.CTkLabel(supp_frame, text=t("suppression_desc"), anchor="w", text_color="gray", wraplength=600).pack(fill="x", padx=config.PAD_X, pady=(2, 5))
+        
+        supp_row = ctk.CTkFrame(supp_frame, fg_color="transparent")
+        supp_row.pack(fill="x", padx=config.PAD_X, pady=(0, 15))
+        
+        self.suppression_count_lbl = ctk.CTkLabel(supp_row, text=t("suppression_count", count=len(self.data.suppression)), anchor="w")
+        self.suppression_count_lbl.pack(side="left", fill="x", expand=True)
+        ctk.CTkButton(supp_row, text=t("import_csv"), command=self.import_suppression, width=100).pack(side="left", padx=(5, 0))
+        ctk.CTkButton(supp_row, text=t("export_csv"), command=self.export_suppression, width=100).pack(side="left", padx=(5, 0))
+        ctk.CTkButton(supp_row, text=t("clear"), command=self.clear_suppression, width=80, fg_color="gray50", hover_color="gray40").pack(side="left", padx=(5, 0))
+        
+        # Profiling
+        prof_frame = ctk.CTkFrame(self.settings_frame)
+        prof_frame.pack(fill="x", padx=config.PAD_X, pady=(5, 10))
+        
+        ctk.CTkLabel(prof_frame, text=t("profiling"), font=ctk.CTkFont(size=14, weight="bold")).pack(fill="x", padx=config.PAD_X, pady=(10, 0))
+        ctk.CTkLabel(prof_frame, text=t("profiling_desc", folder=os.path.join(config.APP_DIR, profiling.PROFILE_DIR_NAME)), anchor="w", text_color="gray", wraplength=600).pack(fill="x", padx=config.PAD_X, pady=(2, 5))
+        
+        prof_row = ctk.CTkFrame(prof_frame, fg_color="transparent")
+        prof_row.pack(fill="x", padx=config.PAD_X, pady=(0, 15))
+        
+        self.profiling_var = ctk.BooleanVar(value=bool(self.app_config.get("profiling", False)))
+        self.profile_capture_var = ctk.BooleanVar(value=bool(self.app_config.get("profile_capture", False)))
+        ctk.CTkCheckBox(prof_row, text=t("profiling_enable"), variable=self.profiling_var).pack(side="left")
+        ctk.CTkCheckBox(prof_row, text=t("profiling_capture"), variable=self.profile_capture_var).pack(side="left", padx=(15, 0))
+        ctk.CTkButton(prof_row, text=t("slowest_actions"), command=self.show_profile_popup, width=140).pack(side="right")
+        
         # --- Signature Frame ---
         sig_frame = ctk.CTkFrame(self.settings_frame)
         sig_frame.pack(fill="x", padx=config.PAD_X, pady=(5, 10))
@@ -381,7 +981,8 @@ class MailAttackerApp(ctk.CTk):
         self.signature_textbox = ctk.CTkTextbox(sig_inner, height=100)
         self.signature_textbox.pack(fill="x", expand=True)
         self.signature_textbox.insert("1.0", self.app_config.get("signature", ""))
-        
+
+    def _build_reports_view(self):
         # --- Reports Frame ---
         self.reports_frame = ctk.CTkFrame(self, corner_radius=0, fg_color="transparent")
         
@@ -394,9 +995,31 @@ class MailAttackerApp(ctk.CTk):
         self.clear_reports_btn = ctk.CTkButton(report_top_frame, text=t("clear_reports"), fg_color="red", hover_color="darkred", command=self.clear_reports, width=100)
         self.clear_reports_btn.pack(side="right")
         
+        # Search bar: email / domain, status class and an inclusive date range
+        report_search_frame = ctk.CTkFrame(self.reports_frame, fg_color="transparent")
+        report_search_frame.pack(fill="x", padx=config.PAD_X)
+        
+        self.report_query_var = ctk.StringVar()
+        query_entry = ctk.CTkEntry(report_search_frame, textvariable=self.report_query_var, placeholder_text=t("report_search_placeholder"))
+        query_entry.pack(side="left", fill="x", expand=True)
+        query_entry.bind("<Return>", lambda e: self.search_reports())
+        
+        self.report_status_options = {t("status_all"): None, t("status_sent"): "sent", t("status_error"): "error", t("status_skipped"): "skipped"}
+        self.report_status_var = ctk.StringVar(value=t("status_all"))
+        ctk.CTkComboBox(report_search_frame, variable=self.report_status_var, values=list(self.report_status_options), state="readonly", width=110).pack(side="left", padx=(10, 0))
+        
+        self.report_from_var = ctk.StringVar()
+        self.report_to_var = ctk.StringVar()
+        ctk.CTkEntry(report_search_frame, textvariable=self.report_from_var, placeholder_text=t("date_from"), width=110).pack(side="left", padx=(10, 0))
+        ctk.CTkEntry(report_search_frame, textvariable=self.report_to_var, placeholder_text=t("date_to"), width=110).pack(side="left", padx=(5, 0))
+        
+        ctk.CTkButton(report_search_frame, text=t("search"), width=80, command=self.search_reports).pack(side="left", padx=(10, 0))
+        ctk.CTkButton(report_search_frame, text=t("reset"), width=60, fg_color="gray", command=self.reset_report_search).pack(side="left", padx=(5, 0))
+        
         self.reports_scrollable_frame = ctk.CTkScrollableFrame(self.reports_frame, label_text=t("recent_logs"))
         self.reports_scrollable_frame.pack(fill="both", expand=True, padx=config.PAD_X, pady=(5, 20))
 
+    def _build_help_view(self):
         # --- Help Frame ---
         self.help_frame = ctk.CTkFrame(self, corner_radius=0, fg_color="transparent")
         self.help_title = ctk.CTkLabel(self.help_frame, text=t("help_title"), font=ctk.CTkFont(size=24, weight="bold"))
@@ -420,8 +1043,6 @@ class MailAttackerApp(ctk.CTk):
         add_help_section(t("help_3_title"), t("help_3_body"), 100)
         add_help_section(t("help_4_title"), t("help_4_body"), 100)
 
-        self.show_contacts_view()
-
     def show_context_menu(self, event):
         try:
             self.context_menu.tk_popup(event.x_root, event.y_root)
@@ -434,60 +1055,61 @@ class MailAttackerApp(ctk.CTk):
         
     def set_all_contacts(self, state):
         self.toggle_all_var.set(state)
-        for c in self.app_config["contacts"]:
-            c["enabled"] = state
-            
-        self.save_config()
-        
-        # update UI checkboxes and labels
-        for c_id, widgets in self.contact_widgets.items():
-            if "is_enabled_var" in widgets:
-                widgets["is_enabled_var"].set(state)
-                # trigger the toggle command manually for each row frame since setting var doesn't trigger it automatically
-                if "toggle_cmd" in widgets:
-                    widgets["toggle_cmd"]()
+        self.set_contacts_flag([c.get("id") for c in self.app_config["contacts"]], "enabled", state)
                     
     def toggle_selected_contacts(self):
-        if not hasattr(self, 'selected_rows') or not self.selected_rows:
+        if not self.selection:
             return
-            
-        for r in self.selected_rows:
-            if r.winfo_exists():
-                c_id = getattr(r, "contact_id", None)
-                if c_id is not None:
-                    widgets = self.contact_widgets.get(c_id)
-                    if widgets and "is_enabled_var" in widgets:
-                        current_state = widgets["is_enabled_var"].get()
-                        widgets["is_enabled_var"].set(not current_state)
-                        if "toggle_cmd" in widgets:
-                            widgets["toggle_cmd"]()
+        self.set_contacts_flag(self.selection.selected, "enabled")
 
     def toggle_favorite_selected_contacts(self):
-        if not hasattr(self, 'selected_rows') or not self.selected_rows:
+        if not self.selection:
             return
-            
-        for r in self.selected_rows:
-            if r.winfo_exists():
-                c_id = getattr(r, "contact_id", None)
-                if c_id is not None:
-                    widgets = self.contact_widgets.get(c_id)
-                    if widgets and "toggle_fav_cmd" in widgets:
-                        widgets["toggle_fav_cmd"]()
+        self.set_contacts_flag(self.selection.selected, "favorite")
+
+    def set_contacts_flag(self, ids, field, state=None):
+        """Set a boolean contact field ("enabled" or "favorite") for many contacts at once.
+        When state is None each contact is toggled. Saves once and restyles only changed rows."""
+        ids = set(ids)
+        default = CONTACT_FLAG_DEFAULTS[field]
+        changed = []
+        for c in self.app_config["contacts"]:
+            if c.get("id") not in ids:
+                continue
+            current = c.get(field, default)
+            new_state = (not current) if state is None else state
+            if new_state != current:
+                c[field] = new_state
+                changed.append(c)
+                
+        if not changed:
+            return
+        self.save_contacts(changed)
+        
+        for c in changed:
+            widgets = self.contact_widgets.get(c.get("id"))
+            if widgets:
+                self._restyle_row(widgets, field, c[field])
+
+    def _restyle_row(self, widgets, field, state):
+        if field == "enabled":
+            widgets["is_enabled_var"].set(state)
+            row_font, text_color = styles.row_style(state)
+            for lbl in widgets["labels"]:
+                lbl.configure(text_color=text_color, font=row_font)
+        else:
+            widgets["is_fav_var"].set(state)
+            star_text, star_color = styles.star_style(state)
+            widgets["fav_btn"].configure(text=star_text, text_color=star_color)
 
     def delete_selected_contacts(self):
-        if not hasattr(self, 'selected_rows') or not self.selected_rows:
+        if not self.selection:
             return
             
-        if messagebox.askyesno("Delete Selected", f"Are you sure you want to delete {len(self.selected_rows)} selected contacts?"):
-            ids_to_del = []
-            for r in self.selected_rows:
-                if r.winfo_exists() and hasattr(r, "contact_id"):
-                    ids_to_del.append(r.contact_id)
-                    
-            self.app_config["contacts"] = [c for c in self.app_config["contacts"] if c.get("id") not in ids_to_del]
-            self.save_config()
+        if messagebox.askyesno("Delete Selected", f"Are you sure you want to delete {len(self.selection)} selected contacts?"):
+            self.remove_contacts(self.selection.selected)
+            self.selection.clear()
             self.refresh_contacts_list()
-            self.selected_rows.clear()
 
     def validate_port(self, P):
         if P == "" or P.isdigit():
@@ -505,55 +1127,79 @@ class MailAttackerApp(ctk.CTk):
         else:
             self.pass_entry.configure(show="*")
 
+    @profiling.profiled()
     def load_config(self):
-        if os.path.exists(config.CONFIG_FILE):
-            try:
-                with open(config.CONFIG_FILE, "r") as f:
-                    self.app_config = json.load(f)
-            except Exception as e:
-                print(f"Error loading config: {e}")
-                
-        self.reports_data = []
-        if hasattr(config, "REPORTS_FILE") and os.path.exists(config.REPORTS_FILE):
-            try:
-                with open(config.REPORTS_FILE, "r") as f:
-                    self.reports_data = json.load(f)
-            except Exception as e:
-                print(f"Error loading reports: {e}")
-
-        if "smtp" not in self.app_config:
-            self.app_config["smtp"] = {}
-        if "contacts" not in self.app_config:
-            self.app_config["contacts"] = []
-        if "delay" not in self.app_config:
-            self.app_config["delay"] = 2
-        if "notifications" not in self.app_config:
-            self.app_config["notifications"] = True
-        if "signature" not in self.app_config:
-            self.app_config["signature"] = ""
-
-        for i, c in enumerate(self.app_config["contacts"]):
-            if "id" not in c:
-                c["id"] = i
-            if "enabled" not in c:
-                c["enabled"] = True
-            if "_status_lbl_ref" in c:
-                del c["_status_lbl_ref"]
-
+        self.app_config = engine.load_settings()
+        if self.data:
+            self.data.close()
+        self.data = engine.DataFolder()
+        self.app_config["contacts"] = self.data.load_contacts(self.app_config)
+        self.tag_index = collections.Counter()
+        self.index_tags(self.app_config["contacts"], 1)
+        self.apply_profiling()
+
+    def apply_profiling(self):
+        """Turn timing spans on from the settings (or for this session with --profile, which also saves cProfile output)."""
+        on = self.app_config.get("profiling") or PROFILE_FLAG
+        capture = self.app_config.get("profile_capture") or PROFILE_FLAG
+        profiling.configure(on, os.path.join(config.APP_DIR, profiling.PROFILE_DIR_NAME) if capture else None)
+
+    @profiling.profiled()
     def save_config(self):
-        with open(config.CONFIG_FILE, "w") as f:
-            json.dump(self.app_config, f, indent=4)
+        """Write settings to config.json. Contacts are persisted per record through save_contacts()."""
+        engine.save_settings(self.app_config)
+
+    def index_tags(self, contacts, delta):
+        """Add (delta=1) or remove (delta=-1) the contacts' tags from the tag index."""
+        for c in contacts:
+            tag = c.get("tag", "").strip()
+            if tag:
+                self.tag_index[tag] += delta
+                if self.tag_index[tag] <= 0:
+                    del self.tag_index[tag]
+
+    def existing_tags(self):
+        return sorted(self.tag_index)
+
+    def next_contact_id(self):
+        return 0 if not self.app_config["contacts"] else max(int(c.get("id", 0)) for c in self.app_config["contacts"]) + 1
+
+    @profiling.profiled()
+    def save_contacts(self, contacts):
+        """Persist only the given (new or changed) contacts."""
+        self.data.contact_store.upsert(contacts)
+
+    def remove_contacts(self, ids):
+        """Delete contacts by ID from memory and the store."""
+        ids = set(ids)
+        kept = []
+        for c in self.app_config["contacts"]:
+            if c.get("id") in ids:
+                self.index_tags([c], -1)
+            else:
+                kept.append(c)
+        self.app_config["contacts"] = kept
+        self.data.contact_store.delete(ids)
+
+    def place_contacts(self, block, index):
+        """Insert contacts at index of the in-memory order and give them ranks between their new neighbours.
+        Only the placed contacts are written, unless the rank gap is exhausted and the list is re-spaced."""
+        contacts = self.app_config["contacts"]
+        contacts[index:index] = block
+        prev_rank = contacts[index - 1]["rank"] if index > 0 else None
+        next_c = index + len(block)
+        next_rank = contacts[next_c]["rank"] if next_c < len(contacts) else None
+        ranks = store.ranks_between(prev_rank, next_rank, len(block))
+        if ranks is None:
+            self.data.contact_store.rebalance(contacts)
+            return
+        for c, rank in zip(block, ranks):
+            c["rank"] = rank
+        self.save_contacts(block)
             
-    def save_reports(self):
-        if hasattr(config, "REPORTS_FILE"):
-            with open(config.REPORTS_FILE, "w") as f:
-                json.dump(self.reports_data, f, indent=4)
-
+    @profiling.profiled()
     def show_contacts_view(self):
-        self.settings_frame.grid_forget()
-        self.reports_frame.grid_forget()
-        self.help_frame.grid_forget()
-        self.favorites_frame.grid_forget()
+        self._hide_views()
         self.contacts_frame.grid(row=0, column=1, sticky="nsew")
         self.send_all_button.grid(row=7, column=0, padx=15, pady=(15, 25))
         
@@ -561,36 +1207,33 @@ class MailAttackerApp(ctk.CTk):
         if not self.contact_widgets and self.app_config.get("contacts"):
             self.refresh_contacts_list()
 
+    @profiling.profiled()
     def show_settings_view(self):
-        self.contacts_frame.grid_forget()
-        self.reports_frame.grid_forget()
-        self.help_frame.grid_forget()
-        self.favorites_frame.grid_forget()
+        self._ensure_view("settings")
+        self._hide_views()
         self.send_all_button.grid_remove()
         self.settings_frame.grid(row=0, column=1, sticky="nsew")
+        self.refresh_size_limit_label()  # A campaign may have seen a new limit since
         
+    @profiling.profiled()
     def show_reports_view(self):
-        self.contacts_frame.grid_forget()
-        self.settings_frame.grid_forget()
-        self.help_frame.grid_forget()
-        self.favorites_frame.grid_forget()
+        self._ensure_view("reports")
+        self._hide_views()
         self.send_all_button.grid_remove()
         self.reports_frame.grid(row=0, column=1, sticky="nsew")
         self.refresh_reports_list()
 
+    @profiling.profiled()
     def show_help_view(self):
-        self.contacts_frame.grid_forget()
-        self.settings_frame.grid_forget()
-        self.reports_frame.grid_forget()
-        self.favorites_frame.grid_forget()
+        self._ensure_view("help")
+        self._hide_views()
         self.send_all_button.grid_remove()
         self.help_frame.grid(row=0, column=1, sticky="nsew")
 
+    @profiling.profiled()
     def show_favorites_view(self):
-        self.contacts_frame.grid_forget()
-        self.settings_frame.grid_forget()
-        self.reports_frame.grid_forget()
-        self.help_frame.grid_forget()
+        self._ensure_view("favorites")
+        self._hide_views()
         self.send_all_button.grid_remove()
         self.favorites_frame.grid(row=0, column=1, sticky="nsew")
         self.refresh_favorites_list()
@@ -631,7 +1274,7 @@ class MailAttackerApp(ctk.CTk):
             row_frame.c_id = c.get("id")
             
             name = c.get("company") or c.get("email")
-            lbl = ctk.CTkLabel(row_frame, text=name, anchor="w", font=ctk.CTkFont(weight="bold"))
+            lbl = ctk.CTkLabel(row_frame, text=name, anchor="w", font=styles.font("bold"))
             lbl.pack(fill="x", padx=10, pady=8)
             
             for w in [row_frame, lbl]:
@@ -639,29 +1282,51 @@ class MailAttackerApp(ctk.CTk):
 
     def clear_reports(self):
         if messagebox.askyesno(t("clear_reports"), t("clear_reports_confirm")):
-            self.reports_data = []
-            self.save_reports()
+            self.data.report_store.clear(self.data.report_bodies)
             self.refresh_reports_list()
             
-    def toggle_report_group(self, subframe):
+    @profiling.profiled()
+    def toggle_report_group(self, subframe, run):
         if subframe.winfo_ismapped():
             subframe.pack_forget()
         else:
+            # Delivery rows are only loaded and built the first time a batch is opened
+            if not subframe.winfo_children():
+                if run["rolled_up"]:
+                    self.build_rollup_rows(subframe, self.data.report_store.rollup(run["id"]) or {})
+                else:
+                    self.build_report_rows(subframe, self.data.report_store.deliveries(run["id"]))
             subframe.pack(fill="x", padx=10, pady=(0, 5))
+
+    def build_rollup_rows(self, subframe, rollup):
+        """Build per-domain count rows for a batch compacted by the retention policy."""
+        ctk.CTkLabel(subframe, text=t("batch_rolled_up"), text_color="gray", anchor="w").pack(fill="x", padx=15, pady=(5, 0))
+        by_total = sorted(rollup.items(), key=lambda item: -sum(item[1].values()))
+        for domain, counts in by_total:
+            row = ctk.CTkFrame(subframe, fg_color="transparent")
+            row.pack(fill="x", pady=2, padx=5)
+            ctk.CTkLabel(row, text=domain or "-", anchor="w").pack(side="left", padx=10)
+            counts_text = t("rollup_counts", sent=counts.get("sent", 0), errors=counts.get("error", 0), skipped=counts.get("skipped", 0))
+            ctk.CTkLabel(row, text=counts_text, anchor="e").pack(side="right", padx=10)
+
+    def apply_report_retention(self):
+        """Compact report batches that fall outside the retention settings. Runs off the UI thread."""
+        try:
+            self.data.apply_retention(self.app_config)
+        except Exception as e:
+            print(f"Error applying report retention: {e}")  # Background failures are logged like file and notification errors
             
+    @profiling.profiled()
     def refresh_reports_list(self):
         for widget in self.reports_scrollable_frame.winfo_children():
             widget.destroy()
             
-        for run in reversed(self.reports_data):
+        for run in self.data.report_store.batches():
             run_frame = ctk.CTkFrame(self.reports_scrollable_frame, fg_color="transparent")
             run_frame.pack(fill="x", pady=5, padx=5)
             
             subframe = ctk.CTkFrame(run_frame, fg_color=("gray85", "gray20"))
             
-            deliveries = [r for r in run.get("deliveries", []) if r.get("status") != "Skipped (Disabled)"]
-            if not deliveries:
-                continue
             raw_date = run.get('date', 'Unknown Time')
             display_date = raw_date
             
@@ -683,49 +1348,100 @@ class MailAttackerApp(ctk.CTk):
                 # If it fails to parse (already formatted or otherwise), leave it as is
                 pass
 
-            summary_text = t("send_batch", date=display_date, count=len(deliveries))
+            summary_text = t("send_batch", date=display_date, count=run["total"])
             
 
             header_frame = ctk.CTkFrame(run_frame, fg_color="transparent")
             header_frame.pack(fill="x")
             
             btn = ctk.CTkButton(header_frame, text=summary_text, anchor="w", fg_color="#1f538d",
-                                command=lambda sf=subframe: self.toggle_report_group(sf))
+                                command=lambda sf=subframe, r=run: self.toggle_report_group(sf, r))
             btn.pack(side="left", fill="x", expand=True)
             
-            def delete_batch(r=run):
+            def delete_batch(r=run, frame=run_frame):
                 if messagebox.askyesno(t("delete_confirm_title"), t("delete_batch_confirm", date=r.get('date'))):
-                    self.reports_data.remove(r)
-                    self.save_reports()
-                    self.refresh_reports_list()
+                    self.data.report_store.delete_batch(r["id"], self.data.report_bodies)
+                    frame.destroy()
                     
             del_btn = ctk.CTkButton(header_frame, text="X", width=30, fg_color="transparent", text_color="#ff5555", hover_color="#8b0000", command=delete_batch)
             del_btn.pack(side="right", padx=(5, 0))
+
+    @profiling.profiled()
+    def search_reports(self):
+        """Show deliveries matching the search bar, one page at a time."""
+        dates = []
+        for var in (self.report_from_var, self.report_to_var):
+            value = var.get().strip()
+            if value:
+                try:
+                    datetime.datetime.strptime(value, "%Y-%m-%d")
+                except ValueError:
+                    messagebox.showerror(t("error"), t("invalid_date"))
+                    return
+            dates.append(value or None)
             
-            for rep in deliveries:
-                row = ctk.CTkFrame(subframe, fg_color="transparent", cursor="hand2")
-                row.pack(fill="x", pady=2, padx=5)
-                
-                row.grid_columnconfigure(0, weight=1)
-                row.grid_columnconfigure(1, weight=1)
-                row.grid_columnconfigure(2, weight=1)
-                
-                email_lbl = ctk.CTkLabel(row, text=rep.get("email", ""), anchor="w")
-                email_lbl.grid(row=0, column=0, sticky="ew", padx=10)
-                
-                subj_lbl = ctk.CTkLabel(row, text=rep.get("subject", ""), anchor="w")
-                subj_lbl.grid(row=0, column=1, sticky="ew", padx=10)
-                
-                status_txt = rep.get("status", "")
-                color = "green" if status_txt == "Sent" else ("gray" if "Skip" in status_txt else "red")
-                status_lbl = ctk.CTkLabel(row, text=status_txt, text_color=color, anchor="e")
-                status_lbl.grid(row=0, column=2, sticky="ew", padx=10)
+        filters = {
+            "text": self.report_query_var.get(),
+            "status": self.report_status_options.get(self.report_status_var.get()),
+            "date_from": dates[0],
+            "date_to": dates[1],
+        }
+        if not any(filters.values()):
+            self.refresh_reports_list()
+            return
+            
+        for widget in self.reports_scrollable_frame.winfo_children():
+            widget.destroy()
+        self.load_report_page(filters)
 
-                def show_msg(event, r=rep):
-                    self.show_report_message_popup(r)
+    def load_report_page(self, filters, before=None):
+        page = self.data.report_store.search(before=before, **filters)
+        if not page and before is None:
+            ctk.CTkLabel(self.reports_scrollable_frame, text=t("no_results"), text_color="gray").pack(pady=20)
+            return
+        self.build_report_rows(self.reports_scrollable_frame, page)
+        if len(page) == reports.PAGE_SIZE:
+            def load_more():
+                more_btn.destroy()
+                self.load_report_page(filters, page[-1]["id"])
                 
-                for w in [row, email_lbl, subj_lbl, status_lbl]:
-                    w.bind("<Button-1>", show_msg)
+            more_btn = ctk.CTkButton(self.reports_scrollable_frame, text=t("load_more"), fg_color="transparent", border_width=1, command=load_more)
+            more_btn.pack(pady=10)
+
+    def reset_report_search(self):
+        for var in (self.report_query_var, self.report_from_var, self.report_to_var):
+            var.set("")
+        self.report_status_var.set(t("status_all"))
+        self.refresh_reports_list()
+
+    def build_report_rows(self, subframe, deliveries):
+        """Build the delivery rows of one report batch."""
+        for rep in deliveries:
+            row = ctk.CTkFrame(subframe, fg_color="transparent", cursor="hand2")
+            row.pack(fill="x", pady=2, padx=5)
+            
+            row.grid_columnconfigure(0, weight=1)
+            row.grid_columnconfigure(1, weight=1)
+            row.grid_columnconfigure(2, weight=1)
+            
+            # Search results span batches, so they also show the send date
+            email_text = f"{rep['date'][:10]}   {rep.get('email', '')}" if rep.get("date") else rep.get("email", "")
+            email_lbl = ctk.CTkLabel(row, text=email_text, anchor="w")
+            email_lbl.grid(row=0, column=0, sticky="ew", padx=10)
+            
+            subj_lbl = ctk.CTkLabel(row, text=rep.get("subject", ""), anchor="w")
+            subj_lbl.grid(row=0, column=1, sticky="ew", padx=10)
+            
+            status_txt = rep.get("status", "")
+            color = "green" if status_txt == "Sent" else ("gray" if "Skip" in status_txt else "red")
+            status_lbl = ctk.CTkLabel(row, text=status_txt, text_color=color, anchor="e")
+            status_lbl.grid(row=0, column=2, sticky="ew", padx=10)
+
+            def show_msg(event, r=rep):
+                self.show_report_message_popup(r)
+            
+            for w in [row, email_lbl, subj_lbl, status_lbl]:
+                w.bind("<Button-1>", show_msg)
 
     def show_report_message_popup(self, rep_data):
         if getattr(self, 'report_popup', None) and self.report_popup.winfo_exists():
@@ -753,7 +1469,8 @@ class MailAttackerApp(ctk.CTk):
         
         textbox = ctk.CTkTextbox(msg_frame)
         textbox.pack(fill="both", expand=True, padx=2, pady=2)
-        textbox.insert("1.0", rep_data.get("message", t("no_message")))
+        message = reports.message_of(rep_data, self.data.report_bodies)
+        textbox.insert("1.0", message if message is not None else t("no_message"))
         textbox.configure(state="disabled")
         
         att_str = rep_data.get('attachment', '')
@@ -767,7 +1484,65 @@ class MailAttackerApp(ctk.CTk):
                 if a:
                     ctk.CTkLabel(att_frame, text=f"- {a}", anchor="w", text_color="lightgray").pack(fill="x", padx=10)
 
+    def show_profile_popup(self):
+        """Table of the slowest recent actions and, below it, the time spent in nested steps."""
+        if getattr(self, 'profile_popup', None) and self.profile_popup.winfo_exists():
+            self.profile_popup.destroy()
+            
+        self.profile_popup = ctk.CTkToplevel(self)
+        self.profile_popup.title(t("slowest_actions"))
+        self.profile_popup.geometry("760x520")
+        self.profile_popup.transient(self)
+        
+        table = ctk.CTkScrollableFrame(self.profile_popup)
+        table.pack(fill="both", expand=True, padx=20, pady=(20, 10))
+        table.grid_columnconfigure(0, weight=1)
+        
+        def fill():
+            for widget in table.winfo_children():
+                widget.destroy()
+            bold = ctk.CTkFont(weight="bold")
+            row = 0
+            actions = profiling.slowest()
+            if not actions:
+                msg = t("profiling_no_data") if profiling.enabled else t("profiling_off")
+                ctk.CTkLabel(table, text=msg, text_color="gray").grid(row=0, column=0, columnspan=4, pady=20)
+                return
+            for col, key in enumerate(["prof_action", "prof_duration", "prof_time", "prof_thread"]):
+                ctk.CTkLabel(table, text=t(key), font=bold, anchor="w").grid(row=row, column=col, sticky="w", padx=5)
+            for a in actions:
+                row += 1
+                name = a["name"] + ("  [.prof]" if a["profile"] else "")
+                for col, text in enumerate([name, f"{a['ms']:.1f} ms", a["at"], a["thread"]]):
+                    ctk.CTkLabel(table, text=text, anchor="w").grid(row=row, column=col, sticky="w", padx=5)
+            steps = profiling.breakdown()
+            if steps:
+                row += 1
+                ctk.CTkLabel(table, text=t("prof_breakdown"), font=bold, anchor="w").grid(row=row, column=0, columnspan=4, sticky="w", padx=5, pady=(15, 0))
+                row += 1
+                for col, key in enumerate(["prof_step", "prof_calls", "prof_avg", "prof_max"]):
+                    ctk.CTkLabel(table, text=t(key), font=bold, anchor="w").grid(row=row, column=col, sticky="w", padx=5)
+                for name, count, avg, mx in steps:
+                    row += 1
+                    for col, text in enumerate([name, str(count), f"{avg:.1f} ms", f"{mx:.1f} ms"]):
+                        ctk.CTkLabel(table, text=text, anchor="w").grid(row=row, column=col, sticky="w", padx=5)
+        
+        def clear():
+            profiling.clear()
+            fill()
+        
+        btn_row = ctk.CTkFrame(self.profile_popup, fg_color="transparent")
+        btn_row.pack(fill="x", padx=20, pady=(0, 20))
+        ctk.CTkButton(btn_row, text=t("refresh"), command=fill, width=100).pack(side="left")
+        ctk.CTkButton(btn_row, text=t("clear"), command=clear, width=80, fg_color="gray50", hover_color="gray40").pack(side="left", padx=(5, 0))
+        fill()
+
+    @profiling.profiled()
     def save_settings(self):
+        # The campaign writes to the open stores, which a data folder change closes and moves
+        if self.campaign is not None and self.data_folder_var.get().strip() != config.get_data_folder_raw():
+            messagebox.showwarning(t("info"), t("data_folder_campaign_running"))
+            return
         try:
             delay = int(self.delay_var.get().strip())
         except ValueError:
@@ -777,22 +1552,22 @@ class MailAttackerApp(ctk.CTk):
             "server": self.smtp_server_var.get().strip(),
             "port": self.smtp_port_var.get().strip(),
             "user": self.smtp_user_var.get().strip(),
-            "password": crypto.encrypt(self.smtp_pass_var.get().strip())
+            "password": crypto.encrypt(self.smtp_pass_var.get().strip()),
+            "starttls": self.app_config.get("smtp", {}).get("starttls", True)  # Not shown in the UI; keep a hand-edited value
         }
         self.app_config["delay"] = delay
+        self.app_config["report_retention_days"] = int(self.retention_days_var.get().strip() or 0)
+        self.app_config["report_max_mb"] = int(self.report_max_mb_var.get().strip() or 0)
         self.app_config["date_format"] = self.date_format_var.get().strip()
         self.app_config["time_format"] = self.time_format_var.get().strip()
         self.app_config["notifications"] = self.notif_var.get()
+        self.app_config["engine_process"] = self.engine_process_var.get()
+        self.app_config["profiling"] = self.profiling_var.get()
+        self.app_config["profile_capture"] = self.profile_capture_var.get()
+        self.apply_profiling()
         self.app_config["signature"] = self.signature_textbox.get("1.0", "end-1c").strip()
         
-        # Save language
-        lang_reverse = {"English": "en", "Türkçe": "tr"}
-        new_lang = lang_reverse.get(self.lang_var.get(), "en")
-        old_lang = self.app_config.get("language", "")
-        self.app_config["language"] = new_lang
-        langs.set_language(new_lang)
-
-        # Save Theme
+        # Save Theme (mapped back before the language changes, the combobox shows the current language)
         theme_display = self.theme_var.get()
         # Reverse translation mapping
         if theme_display == t("theme_light"): new_theme = "Light"
@@ -802,10 +1577,15 @@ class MailAttackerApp(ctk.CTk):
         self.app_config["theme"] = new_theme
         ctk.set_appearance_mode(new_theme)
         
+        # Save language
+        lang_reverse = {"English": "en", "Türkçe": "tr"}
+        new_lang = lang_reverse.get(self.lang_var.get(), "en")
+        old_lang = langs.get_language()
+        self.app_config["language"] = new_lang
+        
         # Handle data folder change
         new_data_folder = self.data_folder_var.get().strip()
         old_data_folder = config.get_data_folder_raw()
-        need_restart = False
         
         if new_data_folder != old_data_folder:
             old_app_dir = config.APP_DIR  # Current data directory before change
@@ -818,65 +1598,159 @@ class MailAttackerApp(ctk.CTk):
             # If the new directory already contains data, don't migrate/overwrite
             if os.path.exists(os.path.join(new_app_dir, "config.json")):
                 messagebox.showinfo(t("info"), t("data_folder_exists_loading"))
-            else:
-                # Migrate data files from old to new location
-                files_to_move = ["config.json", "reports.json"]
-                dirs_to_move = ["attachments"]
-                
-                for fname in files_to_move:
-                    src = os.path.join(old_app_dir, fname)
-                    dst = os.path.join(new_app_dir, fname)
-                    if os.path.exists(src) and not os.path.exists(dst):
-                        try:
-                            shutil.move(src, dst)
-                        except Exception as e:
-                            print(f"Failed to move {fname}: {e}")
-                
-                for dname in dirs_to_move:
-                    src = os.path.join(old_app_dir, dname)
-                    dst = os.path.join(new_app_dir, dname)
-                    if os.path.isdir(src) and not os.path.exists(dst):
-                        try:
-                            shutil.move(src, dst)
-                        except Exception as e:
-                            print(f"Failed to move {dname}: {e}")
-                
-                messagebox.showinfo(t("info"), t("data_folder_moved"))
+                self.after_idle(self.reload_data)  # Rebuilds the settings view, like a language change
+                return
             
-            need_restart = True
+            # Migrate in the background; current state is saved once the move is verified
+            def on_migrated(job):
+                if job.errors:
+                    if not self._migration_failed(job):
+                        return
+                    self.save_config()
+                else:
+                    self.save_config()
+                    messagebox.showinfo(t("info"), t("data_folder_moved"))
+                self.reload_data()
+            
+            # The databases have to be closed before their files can be moved
+            self.data.close()
+            self.run_data_migration(migration.MigrationJob(old_app_dir, new_app_dir), on_migrated)
+            return
         
-        # Only save current config state if we didn't just switch to an existing data folder
-        is_existing_data = (new_data_folder != old_data_folder and 
-                           os.path.exists(os.path.join(config.APP_DIR, "config.json")))
+        self.save_config()
+        
+        langs.set_language(new_lang)
+        messagebox.showinfo(t("success"), t("settings_saved"))
+        
+        # Rebuilds the settings view, so it runs after the Save button's click handling has finished
+        if new_lang != old_lang:
+            self.after_idle(self._relocalize_settings, old_lang)
+
+    def _relocalize_settings(self, old_lang):
+        self.relocalize(old_lang)
+        self.show_settings_view()
+
+    def reload_data(self):
+        """Reload config, reports and contacts from the current data folder without restarting."""
+        old_lang = langs.get_language()
+        self.load_config()
         
-        if not is_existing_data:
+        ctk.set_appearance_mode(self.app_config.get("theme", "System"))
+        saved_lang = self.app_config.get("language", "")
+        langs.set_language(saved_lang if saved_lang in langs.TRANSLATIONS else langs.detect_system_language())
+        
+        if not os.path.exists(config.ATTACHMENTS_DIR):
+            os.makedirs(config.ATTACHMENTS_DIR)
+        
+        # relocalize() also resets the secondary views so they pick up the new data
+        self.relocalize(old_lang, rows=False)
+        self.selection.clear()
+        self.refresh_contacts_list()
+        self.show_settings_view()
+
+    def _on_migration_resumed(self, job):
+        if job.errors and not self._migration_failed(job):
+            return
+        self.reload_data()
+        self._on_data_ready()
+
+    def _migration_failed(self, job):
+        """Handle a data folder move that failed. Returns True if the app goes on with the old folder."""
+        errors = "\n".join(job.errors[:5])
+        if not job.restored:
+            # The data is split between both folders; the kept journal makes the next start retry the move
+            messagebox.showerror(t("error"), t("data_folder_restore_failed", errors=errors))
+            self.on_close()
+            return False
+        # The job put every file back, so the old folder is complete (opening the new one would create empty stores there).
+        # The pointer goes back too, or the next start would open the new folder.
+        config.set_data_folder(config.data_folder_of(job.src_dir))
+        config.use_app_dir(job.src_dir)
+        messagebox.showerror(t("error"), t("data_folder_move_failed", errors=errors))
+        return True
+
+    def refresh_size_limit_label(self):
+        """Show the last SIZE limit seen for the server and port currently entered in the form."""
+        seen = self.app_config.get("smtp_size_limit") or {}
+        form = {"smtp_size_limit": seen, "smtp": {"server": self.smtp_server_var.get().strip(), "port": self.smtp_port_var.get().strip() or 587}}
+        limit = engine.known_size_limit(form)
+        if limit is None:
+            text = t("size_limit_unknown")
+        elif limit:
+            text = t("size_limit_label", limit=progress.format_bytes(limit), checked=seen.get("checked", ""))
+        else:
+            text = t("size_limit_none", checked=seen.get("checked", ""))
+        self.size_limit_lbl.configure(text=text)
+
+    def check_size_limit(self):
+        """Read the server's SIZE limit on a worker thread (EHLO only, no login) and remember it."""
+        smtp_conf = dict(self.app_config.get("smtp", {}),
+                         server=self.smtp_server_var.get().strip(), port=self.smtp_port_var.get().strip() or 587)
+        if not smtp_conf["server"]:
+            messagebox.showerror(t("error"), t("smtp_error"))
+            return
+        result = {}
+        
+        def work():
+            try:
+                result["limit"] = engine.probe_size_limit(smtp_conf)
+            except Exception as e:
+                result["error"] = e
+        
+        threading.Thread(target=work, daemon=True).start()
+        self.size_limit_btn.configure(state="disabled")
+        self.size_limit_lbl.configure(text=t("size_limit_checking"))
+        
+        def poll():
+            if not result:
+                self.after(50, poll)
+                return
+            self.size_limit_btn.configure(state="normal")
+            if "error" in result:
+                self.size_limit_lbl.configure(text=t("size_limit_failed", error=result["error"]))
+                return
+            engine.remember_size_limit(self.app_config, result["limit"], smtp_conf)
             self.save_config()
+            self.refresh_size_limit_label()
+            
+        poll()
+
+    def run_data_migration(self, job, on_done):
+        """Run a MigrationJob on a worker thread while showing a modal progress dialog."""
+        dlg = ctk.CTkToplevel(self)
+        dlg.title(t("data_folder"))
+        dlg.geometry("420x140")
+        dlg.resizable(False, False)
+        dlg.transient(self)
+        dlg.grab_set()
+        dlg.protocol("WM_DELETE_WINDOW", lambda: None)  # Closing mid-move is not allowed
+        
+        ctk.CTkLabel(dlg, text=t("data_folder_moving"), font=ctk.CTkFont(weight="bold")).pack(padx=20, pady=(20, 5))
+        prog_bar = ctk.CTkProgressBar(dlg)
+        prog_bar.pack(fill="x", padx=20, pady=5)
+        prog_bar.set(0)
+        current_lbl = ctk.CTkLabel(dlg, text="", text_color="gray")
+        current_lbl.pack(padx=20)
+        
+        threading.Thread(target=job.run, daemon=True).start()
         
-        if not need_restart and new_lang != old_lang:
-            need_restart = True
-        
-        if not need_restart:
-            messagebox.showinfo(t("success"), t("settings_saved"))
-        
-        if need_restart:
-            self.withdraw()
-            # Strip existing --view args to prevent accumulation
-            clean_args = []
-            skip_next = False
-            for arg in sys.argv:
-                if skip_next:
-                    skip_next = False
-                    continue
-                if arg == "--view":
-                    skip_next = True
-                    continue
-                clean_args.append(arg)
-            os.execv(sys.executable, [sys.executable] + clean_args + ["--view", "settings"])
+        def poll():
+            prog_bar.set(job.progress())
+            current_lbl.configure(text=os.path.basename(job.current))
+            if not job.finished:
+                self.after(100, poll)
+                return
+            dlg.grab_release()
+            dlg.destroy()
+            on_done(job)
+            
+        poll()
 
     def apply_sorting(self, event=None):
         # We no longer destroy all widgets; instead we just un-pack and re-pack them in order.
         self.filter_contacts_list()
 
+    @profiling.profiled()
     def filter_contacts_list(self, event=None):
         query = self.search_var.get().strip().lower()
         sort_mode = self.sort_var.get()
@@ -892,6 +1766,7 @@ class MailAttackerApp(ctk.CTk):
             contacts_to_render = sorted(contacts_to_render, key=lambda x: x.get("company", "").lower())
         
         # Step 3: Filter and pack visible ones
+        visible_ids = []
         for c in contacts_to_render:
             widgets = self.contact_widgets.get(c.get("id"))
             if not widgets or "row_frame" not in widgets:
@@ -920,7 +1795,11 @@ class MailAttackerApp(ctk.CTk):
             
             if show_item:
                 row_frame.pack(fill="x", pady=5, padx=5)
+                visible_ids.append(c.get("id"))
+        
+        self.selection.set_order(visible_ids)
 
+    @profiling.profiled()
     def refresh_contacts_list(self):
         # This function should only be called when loading config, adding, or deleting contacts.
         for widget in self.contacts_scrollable_frame.winfo_children():
@@ -930,17 +1809,22 @@ class MailAttackerApp(ctk.CTk):
         
         # Update available tags dropdown based on current data
         if hasattr(self, "btn_filter_tag"):
-            existing_tags = sorted(list(set(c.get("tag", "").strip() for c in self.app_config["contacts"] if c.get("tag", "").strip())))
+            existing_tags = self.existing_tags()
             self.btn_filter_tag.configure(values=[t("all_tags")] + existing_tags)
             if self.tag_filter_var.get() not in [t("all_tags")] + existing_tags:
                 self.tag_filter_var.set(t("all_tags"))
         
         for c in self.app_config["contacts"]:
             self.create_contact_row(c)
+        
+        # Selection is keyed by ID, so it survives the rebuild; drop IDs that no longer exist
+        self.selection.discard(self.selection.selected - self.contact_widgets.keys())
+        self._apply_selection(self.selection.selected)
             
         # Apply filters/sort immediately after drawing
         self.filter_contacts_list()
 
+    @profiling.profiled()
     def import_csv(self):
         filepath = filedialog.askopenfilename(title="Select CSV to Import", filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
         if not filepath:
@@ -959,13 +1843,14 @@ class MailAttackerApp(ctk.CTk):
                                 return row[actual_k].strip()
                     return ""
 
-                added_count = 0
+                new_contacts = []
+                next_id = self.next_contact_id()
                 for row in reader:
                     email_val = get_val(row, ['email', 'e-mail', 'mail'])
                     if not email_val:
                         continue # Skip rows without email
                         
-                    new_id = 0 if not self.app_config["contacts"] else max(int(c.get("id", 0)) for c in self.app_config["contacts"]) + 1
+                    new_id = next_id + len(new_contacts)
                     
                     new_contact = {
                         "id": new_id,
@@ -976,11 +1861,14 @@ class MailAttackerApp(ctk.CTk):
                         "attachments": [],
                         "enabled": True
                     }
-                    self.app_config["contacts"].append(new_contact)
-                    added_count += 1
+                    new_contacts.append(new_contact)
 
+            added_count = len(new_contacts)
             if added_count > 0:
-                self.save_config()
+                if self.share_repeated_bodies(new_contacts, os.path.splitext(os.path.basename(filepath))[0]):
+                    self.save_config()
+                self.place_contacts(new_contacts, len(self.app_config["contacts"]))
+                self.index_tags(new_contacts, 1)
                 self.refresh_contacts_list()
                 messagebox.showinfo(t("success"), t("csv_import_success", count=added_count))
             else:
@@ -989,6 +1877,65 @@ class MailAttackerApp(ctk.CTk):
         except Exception as e:
             messagebox.showerror("Import Error", f"Failed to import CSV:\n{str(e)}")
 
+    def import_suppression(self):
+        filepath = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv"), ("Text files", "*.txt"), ("All files", "*.*")])
+        if not filepath:
+            return
+        try:
+            added = self.data.suppression.import_file(filepath)
+        except Exception as e:
+            messagebox.showerror(t("error"), str(e))
+            return
+        self.suppression_count_lbl.configure(text=t("suppression_count", count=len(self.data.suppression)))
+        messagebox.showinfo(t("success"), t("suppression_imported", count=added))
+
+    def export_suppression(self):
+        filepath = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        if not filepath:
+            return
+        try:
+            count = self.data.suppression.export_file(filepath)
+        except Exception as e:
+            messagebox.showerror(t("error"), str(e))
+            return
+        messagebox.showinfo(t("success"), t("suppression_exported", count=count))
+
+    def clear_suppression(self):
+        if messagebox.askyesno(t("suppression_list"), t("suppression_clear_confirm")):
+            self.data.suppression.clear()
+            self.suppression_count_lbl.configure(text=t("suppression_count", count=0))
+
+    def share_repeated_bodies(self, contacts, name_prefix):
+        """Move subject/message pairs used by more than one contact into shared templates.
+        Returns True if any template was created."""
+        groups = collections.defaultdict(list)
+        for c in contacts:
+            if c.get("message") and not c.get("template_id"):
+                groups[(c.get("subject", ""), c["message"])].append(c)
+                
+        templates = self.app_config["templates"]
+        # Names must stay unique: the contact editor picks templates by name
+        names = {tpl["name"] for tpl in templates.values()}
+        created = False
+        n = 0
+        for (subject, message), members in groups.items():
+            if len(members) < 2:
+                continue
+            n += 1
+            while f"{name_prefix} #{n}" in names:
+                n += 1  # An earlier import with the same prefix took this number
+            name = f"{name_prefix} #{n}"
+            names.add(name)
+            tid = templating.new_template_id(templates)
+            templates[tid] = {"name": name, "subject": subject, "message": message}
+            for c in members:
+                c["template_id"] = tid
+                c["subject"] = ""
+                c["message"] = ""
+            created = True
+        return created
+
+    @profiling.profiled()
     def export_csv(self):
         if not self.app_config["contacts"]:
             messagebox.showinfo(t("info"), t("csv_export_success", count=0))
@@ -1003,12 +1950,14 @@ class MailAttackerApp(ctk.CTk):
                 fieldnames = ['company', 'email', 'subject', 'message']
                 writer = csv.DictWriter(f, fieldnames=fieldnames)
                 writer.writeheader()
+                templates = self.app_config["templates"]
                 for c in self.app_config["contacts"]:
+                    subject, message = templating.resolve(c, templates)
                     writer.writerow({
                         'company': c.get('company', ''),
                         'email': c.get('email', ''),
-                        'subject': c.get('subject', ''),
-                        'message': c.get('message', '')
+                        'subject': subject,
+                        'message': message
                     })
             messagebox.showinfo(t("success"), t("csv_export_success", count=len(self.app_config['contacts'])))
         except Exception as e:
@@ -1020,7 +1969,7 @@ class MailAttackerApp(ctk.CTk):
         c_favorite = contact.get("favorite", False)
         c_company = contact.get("company", "")
         c_email = contact.get("email", "")
-        c_subject = contact.get("subject", "")
+        c_subject = templating.resolve(contact, self.app_config["templates"])[0]
         c_tag = contact.get("tag", "").strip()
         
         row_frame = ctk.CTkFrame(self.contacts_scrollable_frame)
@@ -1046,27 +1995,19 @@ class MailAttackerApp(ctk.CTk):
         enable_cb.grid(row=0, column=1, padx=5)
         
         is_fav = ctk.BooleanVar(value=c_favorite)
-        fav_btn = ctk.CTkButton(row_frame, text="⭐️" if c_favorite else "☆", width=30, fg_color="transparent", text_color="gold" if c_favorite else "gray", hover_color="gray30", font=ctk.CTkFont(size=18))
+        star_text, star_color = styles.star_style(c_favorite)
+        fav_btn = ctk.CTkButton(row_frame, text=star_text, width=30, fg_color="transparent", text_color=star_color, hover_color="gray30", font=styles.font("star"))
         fav_btn.grid(row=0, column=2, padx=5)
         
         def toggle_favorite():
-            new_state = not is_fav.get()
-            is_fav.set(new_state)
-            fav_btn.configure(text="⭐️" if new_state else "☆", text_color="gold" if new_state else "gray")
-            
-            for c in self.app_config["contacts"]:
-                if c.get("id") == c_id:
-                    c["favorite"] = new_state
-                    self.save_config()
-                    break
+            self.set_contacts_flag([c_id], "favorite", not is_fav.get())
                     
         fav_btn.configure(command=toggle_favorite)
 
         def truncate(text, max_len=20):
             return text if len(text) <= max_len else text[:max_len-3] + "..."
             
-        font_style = ctk.CTkFont(overstrike=not c_enabled, slant="italic" if not c_enabled else "roman")
-        text_color = "gray50" if not c_enabled else ["gray10", "#DCE4EE"]
+        font_style, text_color = styles.row_style(c_enabled)
 
         display_name = truncate(c_company)
         if c_tag:
@@ -1087,6 +2028,9 @@ class MailAttackerApp(ctk.CTk):
         self.contact_widgets[c_id] = {
             "status_lbl": status_lbl,
             "is_enabled_var": is_enabled,
+            "is_fav_var": is_fav,
+            "fav_btn": fav_btn,
+            "labels": (company_lbl, email_lbl, subj_lbl),
             "row_frame": row_frame,
             "toggle_fav_cmd": toggle_favorite
         }
@@ -1096,20 +2040,12 @@ class MailAttackerApp(ctk.CTk):
 
         del_btn = ctk.CTkButton(row_frame, text=t("del"), width=60, fg_color="red", hover_color="darkred", command=lambda c=contact: self.delete_contact(c))
         del_btn.grid(row=0, column=8, padx=(5, 10))
+        self.contact_widgets[c_id]["edit_btn"] = edit_btn
+        self.contact_widgets[c_id]["del_btn"] = del_btn
         
         def toggle_contact_state():
-            enabled = is_enabled.get()
-            new_f_style = ctk.CTkFont(overstrike=not enabled, slant="italic" if not enabled else "roman")
-            new_t_color = "gray50" if not enabled else ["gray10", "#DCE4EE"]
-            company_lbl.configure(text_color=new_t_color, font=new_f_style)
-            email_lbl.configure(text_color=new_t_color, font=new_f_style)
-            subj_lbl.configure(text_color=new_t_color, font=new_f_style)
-            
-            for c in self.app_config["contacts"]:
-                if c.get("id") == c_id:
-                    c["enabled"] = enabled
-                    self.save_config()
-                    break
+            # The checkbox has already flipped is_enabled; persist it and restyle the row
+            self.set_contacts_flag([c_id], "enabled", is_enabled.get())
 
         enable_cb.configure(command=toggle_contact_state)
         self.contact_widgets[c_id]["toggle_cmd"] = toggle_contact_state
@@ -1126,77 +2062,44 @@ class MailAttackerApp(ctk.CTk):
         for w in [row_frame, company_lbl, email_lbl, subj_lbl]:
             w.bind("<Button-1>", select_row, add="+")
             
+    def _apply_selection(self, changed_ids):
+        """Restyle only the rows whose selected state changed."""
+        for c_id in changed_ids:
+            widgets = self.contact_widgets.get(c_id)
+            if not widgets:
+                continue
+            if c_id in self.selection:
+                widgets["row_frame"].configure(border_width=2, border_color=config.ACCENT_COLOR)
+            else:
+                widgets["row_frame"].configure(border_width=0)
+
     def select_contact_row(self, event, row_frame):
         self.pending_single_select = None
-        
-        if not hasattr(self, 'selected_rows'):
-            self.selected_rows = []
+        c_id = row_frame.contact_id
             
         ctrl_pressed = (event.state & 0x0004) != 0
         shift_pressed = (event.state & 0x0001) != 0
 
         if ctrl_pressed:
-            if row_frame in self.selected_rows:
-                self.selected_rows.remove(row_frame)
-                row_frame.configure(border_width=0)
-            else:
-                self.selected_rows.append(row_frame)
-                row_frame.configure(border_width=2, border_color=config.ACCENT_COLOR)
-            self.last_selected_row = row_frame
-            
-        elif shift_pressed and getattr(self, 'last_selected_row', None) and self.last_selected_row.winfo_exists():
-            children = [w for w in self.contacts_scrollable_frame.winfo_children() if hasattr(w, "contact_id")]
-            # Sort by visual position so the slice matches what the user sees
-            children.sort(key=lambda w: w.winfo_y())
-            try:
-                start_idx = children.index(self.last_selected_row)
-                end_idx = children.index(row_frame)
-                
-                if start_idx > end_idx:
-                    start_idx, end_idx = end_idx, start_idx
-                    
-                for r in self.selected_rows:
-                    if r.winfo_exists():
-                        r.configure(border_width=0)
-                self.selected_rows.clear()
-                
-                for i in range(start_idx, end_idx + 1):
-                    r = children[i]
-                    self.selected_rows.append(r)
-                    r.configure(border_width=2, border_color=config.ACCENT_COLOR)
-                    
-            except ValueError:
-                pass
+            self._apply_selection(self.selection.toggle(c_id))
+        elif shift_pressed and self.selection.anchor is not None:
+            self._apply_selection(self.selection.select_range(c_id))
+        elif c_id in self.selection and len(self.selection) > 1:
+            # Instead of clearing selection instantly, defer it in case they want to drag
+            self.pending_single_select = c_id
         else:
-            if row_frame in self.selected_rows and len(self.selected_rows) > 1:
-                # Instead of clearing selection instantly, defer it in case they want to drag
-                self.pending_single_select = row_frame
-            else:
-                for r in self.selected_rows:
-                    if r.winfo_exists():
-                        r.configure(border_width=0)
-                self.selected_rows = [row_frame]
-                row_frame.configure(border_width=2, border_color=config.ACCENT_COLOR)
-                self.last_selected_row = row_frame
+            self._apply_selection(self.selection.select_only(c_id))
         
         self.bind("<Delete>", self.delete_selected_contact)
         
     def delete_selected_contact(self, event=None):
-        if hasattr(self, 'selected_rows') and self.selected_rows:
-            to_delete = []
-            for r in self.selected_rows:
-                if r.winfo_exists():
-                    c_id = getattr(r, "contact_id", None)
-                    if c_id is not None:
-                        to_delete.append(c_id)
-            
-            if to_delete:
-                msg = t("delete_selected_confirm", count=len(to_delete)) if len(to_delete) > 1 else t("delete_confirm_msg", email="")
-                if messagebox.askyesno(t("delete_confirm_title"), msg):
-                    self.app_config["contacts"] = [c for c in self.app_config["contacts"] if c.get("id") not in to_delete]
-                    self.save_config()
-                    self.selected_rows.clear()
-                    self.refresh_contacts_list()
+        to_delete = set(self.selection.selected)
+        if to_delete:
+            msg = t("delete_selected_confirm", count=len(to_delete)) if len(to_delete) > 1 else t("delete_confirm_msg", email="")
+            if messagebox.askyesno(t("delete_confirm_title"), msg):
+                self.remove_contacts(to_delete)
+                self.selection.clear()
+                self.refresh_contacts_list()
 
     def start_drag(self, event, row_frame):
         self.drag_start_y = event.y_root
@@ -1205,20 +2108,15 @@ class MailAttackerApp(ctk.CTk):
 
     def init_drag_visuals(self):
         row_frame = self.potential_drag_row
-        
-        if not hasattr(self, 'selected_rows'):
-            self.selected_rows = []
             
         # If the user drags a row that isn't selected, they intend to drag just that row
-        if row_frame not in self.selected_rows:
-            for r in self.selected_rows:
-                if r.winfo_exists(): r.configure(border_width=0)
-            self.selected_rows = [row_frame]
-            row_frame.configure(border_width=2, border_color=config.ACCENT_COLOR)
-            self.last_selected_row = row_frame
+        if row_frame.contact_id not in self.selection:
+            self._apply_selection(self.selection.select_only(row_frame.contact_id))
 
-        self.dragged_rows = [r for r in self.selected_rows if r.winfo_exists()]
-        self.dragged_rows.sort(key=lambda r: r.winfo_y())
+        # Only visible rows can be dragged; ordered() already follows the on-screen order
+        self.dragged_ids = [c_id for c_id in self.selection.ordered()
+                            if c_id in self.selection.index and c_id in self.contact_widgets]
+        self.dragged_rows = [self.contact_widgets[c_id]["row_frame"] for c_id in self.dragged_ids]
 
         self.drag_win = ctk.CTkToplevel(self)
         self.drag_win.overrideredirect(True)
@@ -1229,7 +2127,7 @@ class MailAttackerApp(ctk.CTk):
         
         drag_frame = ctk.CTkFrame(self.drag_win, fg_color="#1f538d", corner_radius=5)
         drag_frame.pack(fill="both", expand=True)
-        ctk.CTkLabel(drag_frame, text=info_text, padx=10, pady=5, font=ctk.CTkFont(weight="bold")).pack()
+        ctk.CTkLabel(drag_frame, text=info_text, padx=10, pady=5, font=styles.font("bold")).pack()
         
         self.drag_offset_x = 15
         self.drag_offset_y = 15
@@ -1243,6 +2141,30 @@ class MailAttackerApp(ctk.CTk):
         
         for r in self.dragged_rows:
             r.pack_forget()
+        
+        self._capture_drag_geometry(total_height)
+
+    def _capture_drag_geometry(self, placeholder_height):
+        """Read the remaining rows' offsets once; do_drag hit-tests against this cache."""
+        self.update_idletasks()
+        dragged = set(self.dragged_ids)
+        first_dragged = self.selection.index[self.dragged_ids[0]]
+        
+        # Rows that stay put, in visible order, and the slot the placeholder occupies among them
+        self.drag_remaining = [c_id for c_id in self.selection.order if c_id not in dragged]
+        self.drag_slot = sum(1 for c_id in self.selection.order[:first_dragged] if c_id not in dragged)
+        self.drag_ph_height = placeholder_height + 10  # pady=5 above and below
+        
+        # Offsets are stored as if the placeholder were absent, so they stay valid wherever it moves
+        self.drag_tops = []
+        self.drag_heights = []
+        for i, c_id in enumerate(self.drag_remaining):
+            w = self.contact_widgets[c_id]["row_frame"]
+            top = w.winfo_y()
+            if i >= self.drag_slot:
+                top -= self.drag_ph_height
+            self.drag_tops.append(top)
+            self.drag_heights.append(w.winfo_height())
 
     def do_drag(self, event):
         if not getattr(self, 'is_dragging', False):
@@ -1262,36 +2184,40 @@ class MailAttackerApp(ctk.CTk):
         if abs(event.y_root - getattr(self, 'last_drag_y', event.y_root)) < 5:
             return
         self.last_drag_y = event.y_root
-            
-        y = event.y_root
         
-        children = [w for w in self.contacts_scrollable_frame.winfo_children() if hasattr(w, "contact_id")]
+        # Pointer position inside the list content (the inner frame moves when scrolled)
+        y = event.y_root - self.contacts_scrollable_frame.winfo_rooty()
         
-        for widget in children:
-            if widget in self.dragged_rows:
-                continue
+        tops = self.drag_tops
+        if self.drag_slot < len(tops):
+            ph_top = tops[self.drag_slot]
+        elif tops:
+            ph_top = tops[-1] + self.drag_heights[-1] + 10
+        else:
+            return
+        if ph_top <= y < ph_top + self.drag_ph_height:
+            return  # Over the placeholder itself
+        if y >= ph_top + self.drag_ph_height:
+            y -= self.drag_ph_height
             
-            wy = widget.winfo_rooty()
-            wh = widget.winfo_height()
+        i = bisect.bisect_right(tops, y) - 1
+        if i < 0 or y >= tops[i] + self.drag_heights[i]:
+            return  # In the padding between rows
             
-            if wy < y < wy + wh:
-                if y < wy + (wh / 2):
-                    self.placeholder.pack(before=widget)
-                else:
-                    self.placeholder.pack(after=widget)
-                break
+        new_slot = i if y < tops[i] + self.drag_heights[i] / 2 else i + 1
+        if new_slot == self.drag_slot:
+            return
+        self.drag_slot = new_slot
+        widget = self.contact_widgets[self.drag_remaining[i]]["row_frame"]
+        if new_slot == i:
+            self.placeholder.pack(before=widget)
+        else:
+            self.placeholder.pack(after=widget)
 
     def stop_drag(self, event):
         if not getattr(self, 'is_dragging', False):
-            if getattr(self, 'pending_single_select', None):
-                row_frame = self.pending_single_select
-                for r in self.selected_rows:
-                    if r.winfo_exists():
-                        r.configure(border_width=0)
-                self.selected_rows = [row_frame]
-                if row_frame.winfo_exists():
-                    row_frame.configure(border_width=2, border_color=config.ACCENT_COLOR)
-                self.last_selected_row = row_frame
+            if getattr(self, 'pending_single_select', None) is not None:
+                self._apply_selection(self.selection.select_only(self.pending_single_select))
                 self.pending_single_select = None
             return
             
@@ -1310,525 +2236,265 @@ class MailAttackerApp(ctk.CTk):
         elif getattr(self, 'dragged_rows', None):
             for r in self.dragged_rows:
                 r.pack(fill="x", pady=5, padx=5)
-            
+        
+        # New visible order comes from the model, not from widget coordinates
+        new_visible = self.drag_remaining[:self.drag_slot] + self.dragged_ids + self.drag_remaining[self.drag_slot:]
         self.dragged_rows = None
         self.is_dragging = False
         
-        # Ensure the layout is fully redrawn before reading winfo_y()
-        self.update_idletasks()
-        
-        new_contacts = []
-        # winfo_children() returns in creation order, not pack order. We must sort by Y coordinate to get visual order.
-        children_widgets = [w for w in self.contacts_scrollable_frame.winfo_children() if hasattr(w, "contact_id")]
-        children_widgets.sort(key=lambda w: w.winfo_y())
-        
-        for widget in children_widgets:
-            c_id = getattr(widget, "contact_id", None)
-            if c_id is not None:
-                contact = next((c for c in self.app_config["contacts"] if c.get("id") == c_id), None)
-                if contact:
-                    new_contacts.append(contact)
-                    
-        if len(new_contacts) == len(self.app_config["contacts"]):
-            self.app_config["contacts"] = new_contacts
-            self.save_config()
+        if new_visible == self.selection.order:
+            return
+        self.selection.set_order(new_visible)
+        
+        # Only the dragged contacts move (and get new ranks); everything else, including rows hidden
+        # by the current filter, keeps its place. The block lands right after its new upper neighbour.
+        dragged = set(self.dragged_ids)
+        by_id = {c.get("id"): c for c in self.app_config["contacts"]}
+        block = [by_id[c_id] for c_id in self.dragged_ids]
+        self.app_config["contacts"] = [c for c in self.app_config["contacts"] if c.get("id") not in dragged]
+        
+        if self.drag_slot > 0:
+            anchor_id, offset = self.drag_remaining[self.drag_slot - 1], 1
+        elif self.drag_remaining:
+            anchor_id, offset = self.drag_remaining[0], 0
+        else:
+            anchor_id, offset = None, 0
+        index = next((i for i, c in enumerate(self.app_config["contacts"]) if c.get("id") == anchor_id), 0) + offset
+        self.place_contacts(block, index)
 
     def delete_contact(self, contact_to_del):
         if messagebox.askyesno(t("delete_confirm_title"), t("delete_confirm_msg", email=contact_to_del.get('email'))):
-            self.app_config["contacts"] = [c for c in self.app_config["contacts"] if c.get("id") != contact_to_del.get("id")]
-            self.save_config()
+            self.remove_contacts([contact_to_del.get("id")])
             self.refresh_contacts_list()
 
     def open_contact_popup(self, contact=None):
-        popup = ctk.CTkToplevel(self)
-        popup.title(t("add_new_contact_title") if contact is None else t("edit_contact_title"))
-        popup.geometry("920x560")
-        popup.resizable(False, False)
-        popup.transient(self)
-        popup.grab_set()
-
-        icon_path = resource_path(os.path.join("assets", "logo.ico"))
-        if os.path.exists(icon_path):
-            popup.iconbitmap(icon_path)
-
-        popup.update_idletasks()
-        x = self.winfo_x() + (self.winfo_width() - 920) // 2
-        y = self.winfo_y() + (self.winfo_height() - 560) // 2
-        popup.geometry(f"+{x}+{y}")
-
-        comp_var = ctk.StringVar(value=contact.get("company", "") if contact else "")
-        email_var = ctk.StringVar(value=contact.get("email", "") if contact else "")
-        subj_var = ctk.StringVar(value=contact.get("subject", "") if contact else "")
-        tag_var = ctk.StringVar(value=contact.get("tag", "") if contact else "")
-        
-        legacy_att = contact.get("attachment", "") if contact else ""
-        existing_atts = contact.get("attachments", [legacy_att] if legacy_att else []) if contact else []
-        existing_atts = [resolve_att_path(p) for p in existing_atts]
-        files_var = ctk.StringVar(value="|".join(existing_atts))
+        # One editor instance is reused; it is rebuilt only after a language change
+        if self.contact_editor is None or not self.contact_editor.winfo_exists():
+            self.contact_editor = ContactEditor(self)
+        self.contact_editor.open(contact)
 
-        def save_changes():
-            email_val = email_var.get().strip()
-            if not email_val:
-                messagebox.showerror(t("error"), t("email_required"), parent=popup)
-                return
-
-            final_attachments = [p for p in files_var.get().split("|") if p]
-
-            if contact:
-                c_id = contact.get("id")
-                for c in self.app_config["contacts"]:
-                    if c.get("id") == c_id:
-                        c["company"] = comp_var.get().strip()
-                        c["email"] = email_val
-                        c["subject"] = subj_var.get().strip()
-                        c["tag"] = tag_var.get().strip()
-                        c["message"] = msg_textbox.get("1.0", "end-1c").strip()
-                        c["attachments"] = final_attachments
-                        if "attachment" in c: del c["attachment"]
-                        break
-            else:
-                new_id = 0 if not self.app_config["contacts"] else max(int(c.get("id", 0)) for c in self.app_config["contacts"]) + 1
-                new_contact = {
-                    "id": new_id,
-                    "company": comp_var.get().strip(),
-                    "email": email_val,
-                    "subject": subj_var.get().strip(),
-                    "tag": tag_var.get().strip(),
-                    "message": msg_textbox.get("1.0", "end-1c").strip(),
-                    "attachments": final_attachments,
-                    "enabled": True
-                }
-                self.app_config["contacts"].insert(0, new_contact)
-
-            self.save_config()
-            self.refresh_contacts_list()
-            popup.destroy()
-
-        bottom_bar = ctk.CTkFrame(popup, fg_color="transparent")
-        bottom_bar.pack(side="bottom", fill="x", padx=20, pady=(5, 15))
-        
-        save_btn_bottom = ctk.CTkButton(bottom_bar, text=t("save_contact_list") if contact else t("add_to_contact_list"), command=save_changes, fg_color="#1f538d", height=40, font=ctk.CTkFont(size=14, weight="bold"))
-        save_btn_bottom.pack(side="right", padx=5)
-
-        main_frame = ctk.CTkFrame(popup, fg_color="transparent")
-        main_frame.pack(fill="both", expand=True, padx=20, pady=(15, 5))
-        
-        left_frame = ctk.CTkFrame(main_frame, fg_color="transparent", width=300)
-        left_frame.pack(side="left", fill="both", expand=False, padx=(0, 10))
-        left_frame.pack_propagate(False)
-        
-        right_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
-        right_frame.pack(side="right", fill="both", expand=True)
-
-        ctk.CTkLabel(left_frame, text=t("company_name"), anchor="w").pack(fill="x", padx=5, pady=config.LABEL_PAD_Y)
-        ctk.CTkEntry(left_frame, textvariable=comp_var).pack(fill="x", padx=5, pady=config.ENTRY_PAD_Y)
-
-        ctk.CTkLabel(left_frame, text=t("recipient_email"), anchor="w").pack(fill="x", padx=5, pady=config.LABEL_PAD_Y)
-        ctk.CTkEntry(left_frame, textvariable=email_var).pack(fill="x", padx=5, pady=config.ENTRY_PAD_Y)
-
-        ctk.CTkLabel(left_frame, text=t("subject"), anchor="w").pack(fill="x", padx=5, pady=config.LABEL_PAD_Y)
-        ctk.CTkEntry(left_frame, textvariable=subj_var).pack(fill="x", padx=5, pady=config.ENTRY_PAD_Y)
-
-        ctk.CTkLabel(left_frame, text=t("tag"), anchor="w").pack(fill="x", padx=5, pady=config.LABEL_PAD_Y)
-        existing_tags = sorted(list(set(c.get("tag", "").strip() for c in self.app_config["contacts"] if c.get("tag", "").strip())))
-        if not existing_tags: existing_tags = [""]
-        ctk.CTkComboBox(left_frame, variable=tag_var, values=existing_tags).pack(fill="x", padx=5, pady=config.ENTRY_PAD_Y)
+    def send_all_mails(self):
+        smtp_conf = self.app_config.get("smtp", {})
+        if not smtp_conf.get("server") or not smtp_conf.get("port") or not smtp_conf.get("user") or not smtp_conf.get("password"):
+            messagebox.showerror(t("error"), t("smtp_error"))
+            return
+        if self.campaign is not None:
+            messagebox.showwarning(t("info"), t("campaign_running"))
+            return
+        self.run_preflight()
 
-        ctk.CTkLabel(right_frame, text=t("message_body"), anchor="w", font=ctk.CTkFont(weight="bold")).pack(fill="x", padx=5, pady=config.LABEL_PAD_Y)
+    def run_preflight(self):
+        """Check the whole campaign on a worker thread, then start it, or show what was found first."""
+        mailer = engine.MailingEngine(self.app_config, self.app_config.get("contacts", []), self.data)
+        result = {}
         
-        vars_frame = ctk.CTkFrame(right_frame, fg_color="transparent")
-        vars_frame.pack(fill="x", padx=5)
-        ctk.CTkLabel(vars_frame, text=t("insert_label"), font=ctk.CTkFont(size=11, slant="italic"), text_color="gray").pack(side="left", padx=(0, 5))
+        def work():
+            try:
+                result["report"] = preflight.check(mailer)
+            except Exception as e:
+                result["error"] = e
         
-        template_vars = ["{company_name}", "{email}", "{email_prefix}", "{date}", "{time}", "{signature}"]
-        for var in template_vars:
-            def make_insert(v=var):
-                def _insert():
-                    msg_textbox.insert(tk.INSERT, v)
-                return _insert
-            ctk.CTkButton(vars_frame, text=var, width=len(var)*8, height=22, fg_color="gray30", hover_color="gray40", font=ctk.CTkFont(size=11), command=make_insert()).pack(side="left", padx=2)
+        threading.Thread(target=work, daemon=True).start()
+        self.send_all_button.configure(state="disabled", text=t("preflight_checking"))
         
-        msg_textbox = ctk.CTkTextbox(right_frame)
-        msg_textbox.pack(fill="both", expand=True, padx=5, pady=config.ENTRY_PAD_Y)
-        if contact:
-            msg_textbox.insert("1.0", contact.get("message", ""))
+        def poll():
+            if not result:
+                self.after(50, poll)
+                return
+            self.send_all_button.configure(state="normal", text=t("send_all_now"))
+            if "error" in result:
+                messagebox.showerror(t("error"), str(result["error"]))
+            elif result["report"].issues:
+                self.show_preflight_report(result["report"])
+            else:
+                self.start_campaign()
             
-        # Message right-click paste/copy menu
-        msg_menu = tk.Menu(popup, tearoff=0)
-        
-        def copy_text():
-            try:
-                selected_text = ""
-                try: selected_text = msg_textbox.selection_get()
-                except tk.TclError: pass
-                
-                popup.clipboard_clear()
-                popup.clipboard_append(selected_text)
-            except Exception:
-                pass
-                
-        def paste_text():
-            try:
-                msg_textbox.insert(tk.INSERT, popup.clipboard_get())
-            except Exception:
-                pass
-                
-        msg_menu.add_command(label=t("copy"), command=copy_text)
-        msg_menu.add_command(label=t("paste"), command=paste_text)
-        
-        def show_msg_menu(event):
-            try:
-                msg_menu.tk_popup(event.x_root, event.y_root)
-            finally:
-                msg_menu.grab_release()
-
-        msg_textbox._textbox.bind("<Button-3>", show_msg_menu)
-
-        ctk.CTkLabel(left_frame, text=t("attachments"), anchor="w", font=ctk.CTkFont(weight="bold")).pack(fill="x", padx=5, pady=config.LABEL_PAD_Y)
+        poll()
+
+    def show_preflight_report(self, report):
+        dlg = ctk.CTkToplevel(self)
+        dlg.title(t("preflight_title"))
+        dlg.geometry("640x480")
+        dlg.transient(self)
+        dlg.grab_set()
+        
+        summary = t("preflight_summary", checked=report.checked, errors=len(report.errors), warnings=len(report.warnings),
+                    size=progress.format_bytes(report.total_bytes), largest=progress.format_bytes(report.largest[0]))
+        ctk.CTkLabel(dlg, text=summary, anchor="w", justify="left", wraplength=600, font=ctk.CTkFont(weight="bold")).pack(fill="x", padx=20, pady=(20, 10))
+        
+        textbox = ctk.CTkTextbox(dlg, font=ctk.CTkFont(family="Consolas", size=12))
+        textbox.pack(fill="both", expand=True, padx=20)
+        textbox.insert("1.0", "\n".join(report.lines()))
+        textbox.configure(state="disabled")
         
-        prog_lbl = ctk.CTkLabel(left_frame, text="", text_color="gray")
-        prog_bar = ctk.CTkProgressBar(left_frame)
-        prog_bar.set(0)
+        def send_anyway():
+            dlg.grab_release()
+            dlg.destroy()
+            self.start_campaign()
         
-        file_list_frame = ctk.CTkScrollableFrame(left_frame, fg_color=("gray85", "gray20"))
-        file_list_frame.pack(fill="both", expand=True, padx=5, pady=(0, 5))
+        btn_row = ctk.CTkFrame(dlg, fg_color="transparent")
+        btn_row.pack(fill="x", padx=20, pady=(10, 20))
+        ctk.CTkButton(btn_row, text=t("cancel"), command=dlg.destroy, width=100, fg_color="gray50", hover_color="gray40").pack(side="right")
+        ctk.CTkButton(btn_row, text=t("send_anyway"), command=send_anyway, width=120,
+                      fg_color="#b32d2d" if report.errors else "green").pack(side="right", padx=(0, 10))
 
-        def update_files_display(paths_list):
-            for w in file_list_frame.winfo_children():
-                w.destroy()
-            
-            valid_paths = [p for p in paths_list if p]
-            if not valid_paths:
-                ctk.CTkLabel(file_list_frame, text=t("no_files_selected"), text_color="gray").pack(anchor="w", padx=5, pady=2)
-                return
-                
-            def make_delete_cmd(path_to_delete):
-                def _delete():
-                    try:
-                        if os.path.exists(path_to_delete):
-                            os.remove(path_to_delete)
-                    except Exception as e:
-                        print(f"Error deleting file: {e}")
-                        
-                    current_paths = files_var.get().split("|")
-                    if path_to_delete in current_paths:
-                        current_paths.remove(path_to_delete)
-                        
-                    new_val = "|".join([p for p in current_paths if p])
-                    files_var.set(new_val)
-                    update_files_display(new_val.split("|") if new_val else [])
-                return _delete
-                
-            for p in valid_paths:
-                item_frame = ctk.CTkFrame(file_list_frame, fg_color="transparent")
-                item_frame.pack(fill="x", pady=2)
-                
-                lbl = ctk.CTkLabel(item_frame, text=os.path.basename(p), anchor="w")
-                lbl.pack(side="left", fill="x", expand=True, padx=5)
-                
-                del_btn = ctk.CTkButton(item_frame, text="X", width=20, fg_color="transparent", text_color="#ff5555", hover_color="#8b0000", command=make_delete_cmd(p))
-                del_btn.pack(side="right", padx=5)
-                
-        update_files_display(existing_atts)
-
-        def select_file():
-            paths = filedialog.askopenfilenames()
-            if paths:
-                email_val = email_var.get().strip()
-                profile_name = comp_var.get().strip() or email_val
-                safe_profile_name = "".join(c for c in profile_name if c.isalnum() or c in (" ", "-", "_", ".", "@")).strip()
-                if not safe_profile_name:
-                    safe_profile_name = f"profile_{int(time.time())}"
-                    
-                target_dir = os.path.join(config.ATTACHMENTS_DIR, safe_profile_name)
-                os.makedirs(target_dir, exist_ok=True)
-                
-                # Get currently existing files
-                current_files = [p for p in files_var.get().split("|") if p]
-                
-                prog_lbl.pack(pady=2)
-                prog_bar.pack(fill="x", padx=20, pady=5)
-                save_btn_bottom.configure(state="disabled")
-                popup.update_idletasks()
-                
-                added_paths = []
-                total = len(paths)
-                
-                for i, p in enumerate(paths):
-                    if os.path.exists(p):
-                        try:
-                            filename = os.path.basename(p)
-                            target_path = os.path.join(target_dir, filename)
-                            shutil.copy2(p, target_path)
-                            added_paths.append(target_path)
-                            
-                            prog_bar.set((i + 1) / total)
-                            prog_lbl.configure(text=f"Copying files... ({i+1}/{total})")
-                            popup.update_idletasks()
-                        except Exception as e:
-                            messagebox.showerror("Error", f"Failed to copy {filename}: {e}", parent=popup)
-                            save_btn_bottom.configure(state="normal")
-                            prog_lbl.pack_forget()
-                            prog_bar.pack_forget()
-                            return
-                
-                # Merge: replace old entries with same filename, add new ones
-                added_basenames = {os.path.basename(p) for p in added_paths}
-                kept = [p for p in current_files if os.path.basename(p) not in added_basenames]
-                all_paths = kept + added_paths
-                files_var.set("|".join(all_paths))
-                update_files_display(all_paths)
-                save_btn_bottom.configure(state="normal")
-                prog_lbl.pack_forget()
-                prog_bar.pack_forget()
-
-        sync_state = {"folder": None, "active": False}
-        
-        def check_folder_sync():
-            if not popup.winfo_exists() or not sync_state["active"] or not sync_state["folder"]:
-                return
-                
-            folder = sync_state["folder"]
-            if os.path.exists(folder):
-                current_files = [os.path.join(folder, f) for f in os.listdir(folder) if os.path.isfile(os.path.join(folder, f))]
-                current_files_str = "|".join(current_files)
-                
-                if current_files_str != files_var.get():
-                    files_var.set(current_files_str)
-                    update_files_display(current_files)
-                    
-            popup.after(1000, check_folder_sync)
+    def offer_pending_retries(self):
+        """Ask to resume deliveries that were still waiting for a retry when the app last closed."""
+        if not len(self.data.retry_queue) or not self.app_config.get("smtp", {}).get("server"):
+            return
+        if messagebox.askyesno(t("retry_pending_title"), t("retry_pending_msg", count=len(self.data.retry_queue))):
+            self.start_campaign(resume=True)
+        else:
+            self.data.retry_queue.clear()
 
-        def open_attachment_folder():
-            paths = [resolve_att_path(p) for p in files_var.get().split("|") if p]
-            folder_to_open = None
-            
-            # Try to get folder from first valid attachment
-            for p in paths:
-                d = os.path.normpath(os.path.dirname(p))
-                if d and os.path.isdir(d):
-                    folder_to_open = d
-                    break
-            
-            # Fallback: create/use profile folder in ATTACHMENTS_DIR
-            if not folder_to_open:
-                email_val = email_var.get().strip()
-                profile_name = comp_var.get().strip() or email_val
-                safe_profile_name = "".join(c for c in profile_name if c.isalnum() or c in (" ", "-", "_", ".", "@")).strip()
-                if not safe_profile_name:
-                    safe_profile_name = f"profile_{int(time.time())}"
-                os.makedirs(config.ATTACHMENTS_DIR, exist_ok=True)
-                folder_to_open = os.path.normpath(os.path.join(config.ATTACHMENTS_DIR, safe_profile_name))
-                os.makedirs(folder_to_open, exist_ok=True)
-            
-            if folder_to_open and os.path.isdir(folder_to_open):
-                os.startfile(folder_to_open)
-                
-                if not sync_state["active"]:
-                    sync_state["folder"] = folder_to_open
-                    sync_state["active"] = True
-                    popup.after(1000, check_folder_sync)
+    def start_campaign(self, resume=False):
+        """Create the engine (in this process or a child process) and its progress tracker,
+        show the dashboard and send in the background."""
+        if self.campaign is not None:
+            messagebox.showwarning(t("info"), t("campaign_running"))
+            return
+        contacts = self.app_config.get("contacts", [])
+        total = len(self.data.retry_queue) if resume else sum(1 for c in contacts if c.get("enabled", True))
+        if self.app_config.get("engine_process", False):
+            handle = worker.CampaignProcess(self.app_config, contacts, resume)
+        else:
+            handle = worker.CampaignThread(self.app_config, contacts, self.data, resume)
+        self.progress = progress.ThroughputTracker(total, lambda: handle.bytes_sent)
+        handle.start()
+        contacts_by_id = {c.get("id"): c for c in contacts}
+        self.after(EVENT_POLL_MS, lambda: self.poll_campaign_events(handle, contacts_by_id))
+        self.campaign = handle
+        self.campaign_paused = False
+        self._set_text(self.dash_pause_btn, "pause")
+        self.dash_pause_btn.configure(state="normal")
+        self.dash_cancel_btn.configure(state="normal")
+        self.dashboard_frame.grid(row=6, column=0, padx=15, pady=(10, 0), sticky="s")
+        self.update_dashboard(self.progress)
+
+    def toggle_campaign_pause(self):
+        if self.campaign is None:
+            return
+        self.campaign_paused = not self.campaign_paused
+        if self.campaign_paused:
+            self.campaign.pause()
+        else:
+            self.campaign.resume()
+        self._set_text(self.dash_pause_btn, "resume" if self.campaign_paused else "pause")
+
+    def cancel_campaign(self):
+        if self.campaign is not None and messagebox.askyesno(t("cancel"), t("cancel_campaign_confirm")):
+            self.campaign.cancel()
+            self.dash_pause_btn.configure(state="disabled")
+            self.dash_cancel_btn.configure(state="disabled")
+
+    def poll_campaign_events(self, handle, contacts_by_id):
+        """Apply progress events from a campaign thread or process on the UI thread. Only the latest
+        state of each contact is drawn per poll, so a burst of events costs one row update per contact."""
+        events = handle.poll()
+        latest = {}
+        done = None
+        for event in events:
+            if event[0] == "status":
+                _, c_id, state, text, _ = event
+                self.progress.record(state, contacts_by_id.get(c_id, {}).get("enabled", True))
+                latest[c_id] = (state, text)
+            elif event[0] == "error":
+                self._on_engine_error(event[1], event[2])
+            elif event[0] == "done":
+                done = event
+        for c_id, (state, text) in latest.items():
+            self._show_contact_state(c_id, state, text)
+        if done is None and not events and not handle.is_alive():
+            done = ("done", None, False, None)  # The process ended without reporting (crashed or killed)
+        if done is None:
+            self.after(EVENT_POLL_MS, lambda: self.poll_campaign_events(handle, contacts_by_id))
+            return
+        if isinstance(handle, worker.CampaignProcess):
+            self.data.reload_campaign_state()
+        self._campaign_finished(done[1], done[3])
+
+    @staticmethod
+    def _set_text(widget, key, **kwargs):
+        """Show a translated text and keep it bound, so a language switch re-translates it in place."""
+        widget.configure(text=t(key, **kwargs))
+        langs.bind(widget, key, **kwargs)
+
+    def update_dashboard(self, tracker):
+        """Redraw the dashboard from the tracker (constant time) and poll again while the campaign runs."""
+        if tracker is not self.progress:
+            return  # A newer campaign took over the dashboard
+        v = tracker.view()
+        self.dash_bar.set(v["done"] / v["total"] if v["total"] else 1)
+        self._set_text(self.dash_labels["sent"], "dash_sent", done=v["done"], total=v["total"])
+        self._set_text(self.dash_labels["rate"], "dash_rate", rate=f"{v['msgs_per_min']:.1f}")
+        self._set_text(self.dash_labels["bytes"], "dash_bytes", rate=progress.format_bytes(v["bytes_per_sec"]))
+        self._set_text(self.dash_labels["errors"], "dash_errors", errors=v["errors"], pct=f"{v['error_rate'] * 100:.1f}")
+        if v["finished"]:
+            self._set_text(self.dash_labels["eta"], "dash_finished", elapsed=progress.format_duration(v["elapsed"]))
+        elif v["eta_seconds"] is None:
+            self._set_text(self.dash_labels["eta"], "dash_eta", eta="--")
+        else:
+            self._set_text(self.dash_labels["eta"], "dash_eta", eta=progress.format_duration(v["eta_seconds"]))
+        self._set_text(self.dash_pause_btn, "resume" if self.campaign_paused else "pause")
+        if not v["finished"]:
+            self.after(DASHBOARD_POLL_MS, lambda: self.update_dashboard(tracker))
+        else:
+            self.dash_pause_btn.configure(state="disabled")
+            self.dash_cancel_btn.configure(state="disabled")
+
+    def _show_contact_state(self, c_id, state, text):
+        widgets = self.contact_widgets.get(c_id, {})
+        status_lbl = widgets.get("status_lbl")
+        row_frame = widgets.get("row_frame")
+        if status_lbl:
+            status_lbl.configure(text=text, text_color=ENGINE_STATE_COLORS[state])
+        if row_frame:
+            # Contacts being processed are highlighted with a yellow border
+            if state == "sending":
+                row_frame.configure(border_width=2, border_color="yellow")
+            else:
+                row_frame.configure(border_width=0)
 
-        ctk.CTkButton(bottom_bar, text=t("open_folder"), command=open_attachment_folder, width=130, fg_color="gray50", hover_color="gray40").pack(side="left", padx=5)
-        ctk.CTkButton(bottom_bar, text=t("add_select_files"), command=select_file, width=150).pack(side="left", padx=5)
+    def _on_engine_error(self, kind, error):
+        if kind == "login":
+            messagebox.showerror("SMTP Login Error", f"Failed to login to SMTP server: {error}")
+        else:
+            messagebox.showerror("SMTP Connection Error", f"Failed to connect: {error}")
 
-    def send_all_mails(self):
-        smtp_conf = self.app_config.get("smtp", {})
-        if not smtp_conf.get("server") or not smtp_conf.get("port") or not smtp_conf.get("user") or not smtp_conf.get("password"):
-            messagebox.showerror(t("error"), t("smtp_error"))
+    def _campaign_finished(self, stats, size_limit=None):
+        """End of a campaign (on the UI thread): size limit, notification and report retention."""
+        self.progress.finish()  # The dashboard's next poll shows the final numbers
+        self.campaign = None
+        if stats is None:
             return
-            
-        threading.Thread(target=self._mailing_engine_worker, daemon=True).start()
-
-    def _mailing_engine_worker(self):
-        smtp_conf = self.app_config.get("smtp", {})
-        server = smtp_conf.get("server")
-        port = int(smtp_conf.get("port", 587))
-        user = smtp_conf.get("user")
-        password = smtp_conf.get("password") # This is the encrypted password
+        if size_limit is not None and size_limit != engine.known_size_limit(self.app_config):
+            engine.remember_size_limit(self.app_config, size_limit)
+            self.save_config()
 
-        contacts = self.app_config.get("contacts", [])
-        current_run = {
-            "date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "deliveries": []
-        }
-        self.reports_data.append(current_run)
-        
-        def log_report(email, subj, status_msg, msg_body="", attachment=""):
-            if status_msg == "Skipped (Disabled)":
-                return # User requested not to log skipped items
-                
-            current_run["deliveries"].append({
-                "email": email,
-                "subject": subj,
-                "status": status_msg,
-                "message": msg_body,
-                "attachment": attachment
-            })
-            self.save_reports()
-        
-        
-        stats = {"sent": 0, "error": 0, "skipped": 0}
-        
-        try:
-            with smtplib.SMTP(server, port) as smtp:
-                smtp.ehlo()
-                smtp.starttls()
-                try:
-                    # Always decrypt the password to memory before usage
-                    pwd = crypto.decrypt(password)
-                    smtp.login(user, pwd)
-                except Exception as e:
-                    messagebox.showerror("SMTP Login Error", f"Failed to login to SMTP server: {e}")
-                    log_report("SYSTEM", "N/A", f"SMTP Login Error: {e}", "")
-                    return # Exit the worker if login fails
-                
-                delay_seconds = int(self.app_config.get("delay", 2))
+        if self.app_config.get("notifications", True):
+            try:
+                from win10toast import ToastNotifier
+                toaster = ToastNotifier()
+                toaster.show_toast(
+                    t("notif_title"),
+                    t("notif_body", sent=stats['sent'], errors=stats['error'], skipped=stats['skipped'], suppressed=stats['suppressed']),
+                    icon_path=resource_path(os.path.join("assets", "logo.ico")),
+                    duration=5,
+                    threaded=True
+                )
+            except Exception as ex:
+                print(f"Failed to show Windows notification: {ex}")
                 
-                for i, contact in enumerate(contacts):
-                    c_id = contact.get("id")
-                    recipient = contact.get("email", "Unknown")
-                    subject = contact.get("subject", "")
-                    widgets = self.contact_widgets.get(c_id, {})
-                    status_lbl = widgets.get("status_lbl")
-                    row_frame = widgets.get("row_frame")
-                        
-                    if not contact.get("enabled", True):
-                        msg = "Skipped (Disabled)"
-                        if status_lbl: status_lbl.configure(text=msg, text_color="gray")
-                        log_report(recipient, subject, msg, contact.get("message", ""))
-                        stats["skipped"] += 1
-                        continue
-                        
-                    if status_lbl: status_lbl.configure(text=t("sending"), text_color="yellow")
-                    if row_frame:
-                        row_frame.configure(border_width=2, border_color="yellow")
-                    
-                    legacy_att = contact.get("attachment")
-                    atts_list = contact.get("attachments", [legacy_att] if legacy_att else [])
-                    atts_list = [resolve_att_path(p) for p in atts_list]
-                    att_bases = [os.path.basename(p) for p in atts_list if p]
-                    att_summary = ", ".join(att_bases) if att_bases else ""
-                    
-                    if not recipient or recipient == "Unknown":
-                        msg = "Error: No Email"
-                        if status_lbl: status_lbl.configure(text=msg, text_color="red")
-                        if row_frame: row_frame.configure(border_width=0)
-                        log_report(recipient, subject, msg, contact.get("message", ""), att_summary)
-                        continue
-                        
-                    missing_files = [p for p in atts_list if p and not os.path.exists(p)]
-                    if missing_files:
-                        msg = "Error: File(s) Missing"
-                        if status_lbl: status_lbl.configure(text=msg, text_color="red")
-                        if row_frame: row_frame.configure(border_width=0)
-                        log_report(recipient, subject, msg, contact.get("message", ""), att_summary)
-                        continue
-                        
-                    # Process Dynamic Template Variables
-                    now = datetime.datetime.now()
-                    
-                    date_map = {"DD/MM/YYYY": "%d/%m/%Y", "MM/DD/YYYY": "%m/%d/%Y", "YYYY-MM-DD": "%Y-%m-%d", "DD.MM.YYYY": "%d.%m.%Y"}
-                    time_map = {"24H": "%H:%M", "12H": "%I:%M %p"}
-                    
-                    date_fmt_key = self.app_config.get("date_format", "DD/MM/YYYY")
-                    time_fmt_key = self.app_config.get("time_format", "24H")
-                    
-                    date_fmt = date_fmt_key if "%" in date_fmt_key else date_map.get(date_fmt_key, "%d/%m/%Y")
-                    time_fmt = time_fmt_key if "%" in time_fmt_key else time_map.get(time_fmt_key, "%H:%M")
-                    
-                    current_date_str = now.strftime(date_fmt)
-                    current_time_str = now.strftime(time_fmt)
-                    
-                    msg_body = contact.get("message", "")
-                    global_sig = self.app_config.get("signature", "")
-            
-                    # Fill predefined template variables
-                    replacements = {
-                        "{company_name}": contact.get("company", ""),
-                        "{email}": recipient,
-                        "{email_prefix}": recipient.split("@")[0] if "@" in recipient else recipient,
-                        "{date}": current_date_str,
-                        "{time}": current_time_str,
-                        "{signature}": global_sig
-                    }
-                    
-                    for key, val in replacements.items():
-                        msg_body = msg_body.replace(key, val)
-                        subject = subject.replace(key, val)
-                    
-                    msg = EmailMessage()
-                    msg['Subject'] = subject
-                    msg['From'] = user
-                    msg['To'] = recipient
-                    msg.set_content(msg_body)
-                    
-                    file_attach_err = False
-                    for attachment_path in atts_list:
-                        if attachment_path and os.path.exists(attachment_path):
-                            try:
-                                with open(attachment_path, 'rb') as f:
-                                    file_data = f.read()
-                                    file_name = os.path.basename(attachment_path)
-                                mime_type, _ = mimetypes.guess_type(file_name)
-                                if mime_type is None:
-                                    mime_type = 'application/octet-stream'
-                                maintype, subtype = mime_type.split('/', 1)
-                                msg.add_attachment(file_data, maintype=maintype, subtype=subtype, filename=file_name)
-                            except Exception as e:
-                                errMsg = f"Error: Attaching {file_name}"
-                                if status_lbl: status_lbl.configure(text=errMsg, text_color="red")
-                                if row_frame: row_frame.configure(border_width=0)
-                                log_report(recipient, subject, errMsg, msg_body, att_summary)
-                                file_attach_err = True
-                                break
-                                
-                    if file_attach_err:
-                        continue
-
-                    try:
-                        smtp.send_message(msg)
-                        if status_lbl: status_lbl.configure(text="Sent", text_color="green")
-                        if row_frame: row_frame.configure(border_width=0)
-                        log_report(recipient, subject, "Sent", msg_body, att_summary)
-                        stats["sent"] += 1
-                    except Exception as e:
-                        if status_lbl: status_lbl.configure(text="Error: Sending", text_color="red")
-                        if row_frame: row_frame.configure(border_width=0)
-                        log_report(recipient, subject, "Error: Sending", msg_body, att_summary)
-                        stats["error"] += 1
-                        
-                    # Anti-spam Delay (skip if no more enabled contacts remain)
-                    remaining_enabled = any(c.get("enabled", True) for c in contacts[i+1:])
-                    if remaining_enabled and delay_seconds > 0:
-                        import time
-                        time.sleep(delay_seconds)
-
-            if self.app_config.get("notifications", True):
-                try:
-                    from win10toast import ToastNotifier
-                    toaster = ToastNotifier()
-                    toaster.show_toast(
-                        t("notif_title"),
-                        t("notif_body", sent=stats['sent'], errors=stats['error'], skipped=stats['skipped']),
-                        icon_path=resource_path(os.path.join("assets", "logo.ico")),
-                        duration=5,
-                        threaded=True
-                    )
-                except Exception as ex:
-                    print(f"Failed to show Windows notification: {ex}")
-
-        except Exception as e:
-            messagebox.showerror("SMTP Connection Error", f"Failed to connect: {e}")
-            log_report("SYSTEM", "N/A", f"SMTP Error: {e}", "")
+        threading.Thread(target=self.apply_report_retention, daemon=True).start()
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Campaign processes of the packaged app start through this executable
     config.reload_paths()
     app = MailAttackerApp()
     if "--view" in sys.argv:
         idx = sys.argv.index("--view")
         if idx + 1 < len(sys.argv):
             view = sys.argv[idx + 1]
-            if view == "settings":
+            if view == "settings" and app.data is not None:  # After a resumed migration it is shown anyway
                 app.show_settings_view()
     app.mainloop()
@@ -0,0 +1,337 @@
+# bench.py - Reproducible performance benchmarks on synthetic data folders (python bench.py --help)
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import datetime
+import platform
+import statistics
+import subprocess
+import tempfile
+
+import config
+import crypto
+import store
+import reports
+import engine
+from smtpsink import SmtpSink
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_ATTACHMENT_KB = [0, 100, 1024]
+DELIVERIES_PER_BATCH = 1000
+
+DOMAINS = ["example.com", "example.org", "example.net", "mail.test", "corp.test", "shop.test"]
+TAGS = ["", "", "Leads", "Customers", "Partners", "Press"]
+
+
+# --- Synthetic data ---
+
+def attachment_file(folder, kb):
+    """Create (once) a random attachment of the given size and return its path."""
+    path = os.path.join(folder, f"bench_{kb}kb.bin")
+    if not os.path.exists(path):
+        rng = random.Random(kb)
+        with open(path, "wb") as f:
+            f.write(rng.randbytes(kb * 1024))
+    return path
+
+
+def make_contacts(count, attachments, seed=0):
+    """Return count contact dicts. Attachments (a list of paths, may be empty) are spread round-robin."""
+    rng = random.Random(seed)
+    contacts = []
+    for i in range(count):
+        domain = DOMAINS[i % len(DOMAINS)]
+        contacts.append({
+            "id": i,
+            "company": f"Company {i:06d}",
+            "email": f"user{i:06d}@{domain}",
+            "subject": f"Offer for {{company_name}} #{i % 50}",
+            "message": f"Hello {{company_name}},\n\nThis is message variant {i % 50}.\n\n{{signature}}",
+            "attachments": [attachments[i % len(attachments)]] if attachments else [],
+            "enabled": rng.random() > 0.05,
+            "favorite": rng.random() < 0.1,
+            "tag": TAGS[i % len(TAGS)],
+        })
+    return contacts
+
+
+def make_data_folder(folder, count, attachment_kb, smtp_port):
+    """Write config.json, contacts.db, a report history and an import CSV into folder."""
+    os.makedirs(folder, exist_ok=True)
+    config.use_app_dir(folder)
+    att_dir = os.path.join(config.ATTACHMENTS_DIR, "bench")
+    os.makedirs(att_dir, exist_ok=True)
+    attachments = [attachment_file(att_dir, kb) for kb in attachment_kb if kb > 0]
+
+    settings = {k: (v.copy() if isinstance(v, dict) else v) for k, v in engine.SETTING_DEFAULTS.items()}
+    settings.update({
+        "smtp": {"server": "127.0.0.1", "port": smtp_port, "user": "bench@mail.test",
+                 "password": crypto.encrypt("bench"), "starttls": False},
+        "delay": 0,
+        "notifications": False,
+        "language": "en",
+    })
+    engine.save_settings(settings)
+
+    contact_store = store.ContactStore(config.CONTACTS_DB)
+    contact_store.rebalance(make_contacts(count, attachments))
+    contact_store.close()
+
+    # One delivery per contact, split into batches like a history of campaigns
+    report_store = reports.ReportStore(config.REPORTS_DB)
+    blobs = reports.BlobStore(config.REPORT_BODIES_DIR)
+    bodies = [blobs.put(f"Hello,\n\nThis is message variant {v}.") for v in range(50)]
+    start = datetime.datetime(2025, 1, 1)
+    for b in range(0, count, DELIVERIES_PER_BATCH):
+        date = (start + datetime.timedelta(days=b // DELIVERIES_PER_BATCH)).strftime("%Y-%m-%d %H:%M:%S")
+        batch_id = report_store.start_batch(date)
+        with report_store.lock, report_store.conn:
+            for i in range(b, min(count, b + DELIVERIES_PER_BATCH)):
+                status = "Sent" if i % 20 else ("Error: Sending (550)" if i % 40 else "Skipped (Suppressed)")
+                report_store._insert(batch_id, date, {
+                    "email": f"user{i:06d}@{DOMAINS[i % len(DOMAINS)]}", "subject": f"Offer #{i % 50}",
+                    "status": status, "message_hash": bodies[i % 50], "attachment": ""})
+    report_store.close()
+
+    with open(os.path.join(folder, "import.csv"), "w", encoding="utf-8", newline="") as f:
+        f.write("company,email,subject,message\n")
+        for i in range(min(count, 1000)):
+            f.write(f"Imported {i},import{i:06d}@example.com,Hello,Message body {i % 10}\n")
+
+
+# --- Measurement ---
+
+def measure(fn, repeat, setup=None):
+    """Run fn repeat times (calling setup before each run, untimed) and summarize wall time in ms."""
+    runs = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - start) * 1000)
+    return {"runs_ms": [round(r, 2) for r in runs], "min_ms": round(min(runs), 2),
+            "median_ms": round(statistics.median(runs), 2)}
+
+
+def peak_rss_kb():
+    """Peak resident memory of this process in KB, or None where it can't be read (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss  # Bytes on macOS, KB elsewhere
+
+
+def bench_headless(folder, repeat):
+    """Operations that don't need a display: settings/contacts load and report search."""
+    config.use_app_dir(folder)
+    results = {}
+
+    def load():
+        settings = engine.load_settings()
+        data = engine.DataFolder()
+        data.load_contacts(settings)
+        data.close()
+    results["load_data_folder"] = measure(load, repeat)
+
+    data = engine.DataFolder()
+    try:
+        rs = data.report_store
+        results["report_batches"] = measure(rs.batches, repeat)
+        results["report_search_email"] = measure(lambda: rs.search("user0001"), repeat)
+        results["report_search_domain"] = measure(lambda: rs.search("@mail.test"), repeat)
+        results["report_search_errors"] = measure(lambda: rs.search("", status="error"), repeat)
+    finally:
+        data.close()
+    return results
+
+
+def bench_send(folder, sink, count, attachment_kb, repeat):
+    """End-to-end send throughput through MailingEngine against the sink, per attachment size."""
+    config.use_app_dir(folder)
+    settings = engine.load_settings()
+    att_dir = os.path.join(config.ATTACHMENTS_DIR, "bench")
+    results = {}
+    for kb in attachment_kb:
+        attachments = [attachment_file(att_dir, kb)] if kb > 0 else []
+        contacts = make_contacts(count, attachments, seed=kb)
+        for c in contacts:
+            c["enabled"] = True
+        runs = []
+        for _ in range(repeat):
+            data = engine.DataFolder()
+            try:
+                sink.reset()
+                start = time.perf_counter()
+                stats = engine.MailingEngine(settings, contacts, data).run()
+                elapsed = time.perf_counter() - start
+            finally:
+                data.close()
+            if stats is None or stats["sent"] != count:
+                raise RuntimeError(f"Send benchmark failed: {stats}")
+            runs.append(elapsed)
+        best = min(runs)
+        results[f"send_{kb}kb"] = {
+            "messages": count,
+            "runs_ms": [round(r * 1000, 2) for r in runs],
+            "min_ms": round(best * 1000, 2),
+            "median_ms": round(statistics.median(runs) * 1000, 2),
+            "msgs_per_sec": round(count / best, 1),
+            "wire_bytes_per_msg": sink.bytes // max(1, sink.messages),
+        }
+    return results
+
+
+def start_virtual_display():
+    """Make sure Tk has a display: use $DISPLAY, or start Xvfb if it is installed.
+    Returns (Popen or None, reason or None)."""
+    if sys.platform == "win32" or os.environ.get("DISPLAY"):
+        return None, None
+    if not shutil.which("Xvfb"):
+        return None, "no DISPLAY and Xvfb is not installed"
+    display = ":99"
+    proc = subprocess.Popen(["Xvfb", display, "-screen", "0", "1600x1000x24", "-nolisten", "tcp"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(1)
+    if proc.poll() is not None:
+        return None, "Xvfb failed to start"
+    os.environ["DISPLAY"] = display
+    return proc, None
+
+
+def bench_gui(folder, repeat):
+    """Time the app's own handlers on a real (possibly virtual) display. Dialogs are answered
+    automatically so import/export run without interaction."""
+    import app as app_module  # Imports customtkinter; only loaded when GUI benchmarks run
+    from tkinter import font as tkfont
+
+    config.use_app_dir(folder)
+    export_path = os.path.join(folder, "export.csv")
+    import_path = os.path.join(folder, "import.csv")
+    saved = [(mod, name, getattr(mod, name)) for mod, names in (
+        (app_module.filedialog, ("askopenfilename", "asksaveasfilename")),
+        (app_module.messagebox, ("showinfo", "showwarning", "showerror"))) for name in names]
+    app_module.filedialog.askopenfilename = lambda **kw: import_path
+    app_module.filedialog.asksaveasfilename = lambda **kw: export_path
+    for name in ("showinfo", "showwarning", "showerror"):
+        setattr(app_module.messagebox, name, lambda *a, **kw: None)
+
+    results = {}
+    app = app_module.MailAttackerApp()
+    try:
+        app.update()
+
+        def timed(fn):
+            def run():
+                fn()
+                app.update_idletasks()
+            return run
+
+        results["load_config"] = measure(timed(app.load_config), repeat)
+        results["refresh_contacts_list"] = measure(timed(app.refresh_contacts_list), repeat)
+        # Every row of the full list is built now; named fonts must not grow with the row count
+        results["named_fonts"] = len(tkfont.names(app))
+        results["peak_rss_kb"] = peak_rss_kb()
+
+        def set_query():
+            app.search_var.set("company 00")
+        results["filter_contacts_list"] = measure(timed(app.filter_contacts_list), repeat, setup=set_query)
+        app.search_var.set("")
+
+        base_ids = {c["id"] for c in app.app_config["contacts"]}
+
+        def drop_imported():
+            imported = [c["id"] for c in app.app_config["contacts"] if c["id"] not in base_ids]
+            if imported:
+                app.data.contact_store.delete(imported)
+                app.load_config()
+        results["import_csv"] = measure(timed(app.import_csv), repeat, setup=drop_imported)
+        drop_imported()
+
+        results["export_csv"] = measure(timed(app.export_csv), repeat)
+
+        app._ensure_view("reports")
+        results["refresh_reports_list"] = measure(timed(app.refresh_reports_list), repeat)
+    finally:
+        app.destroy()
+        for mod, name, fn in saved:
+            setattr(mod, name, fn)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=f"{config.APP_NAME} {config.APP_VERSION} benchmarks")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)), help="Contact counts, comma separated")
+    parser.add_argument("--attachment-kb", default=",".join(map(str, DEFAULT_ATTACHMENT_KB)),
+                        help="Attachment sizes in KB, comma separated (0 = no attachment)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement")
+    parser.add_argument("--send-count", type=int, default=200, help="Messages per send throughput run")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Artificial sink latency per message")
+    parser.add_argument("--gui-max", type=int, default=10000,
+                        help="Largest contact count to run the GUI benchmarks on (0 = skip GUI)")
+    parser.add_argument("--work-dir", help="Where to generate data folders (default: a temporary folder)")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated data folders")
+    parser.add_argument("--output", default="bench_results.json", help="JSON results file")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    attachment_kb = [int(s) for s in args.attachment_kb.split(",") if s.strip()]
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="mailflow_bench_")
+    xvfb, gui_skip = (None, "disabled") if not args.gui_max else start_virtual_display()
+    if not gui_skip:
+        try:
+            import customtkinter  # noqa: F401
+        except ImportError:
+            gui_skip = "customtkinter is not installed"
+
+    result = {
+        "app_version": config.APP_VERSION,
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {"sizes": sizes, "attachment_kb": attachment_kb, "repeat": args.repeat,
+                   "send_count": args.send_count, "latency_ms": args.latency_ms},
+        "gui_skipped": gui_skip,
+        "results": {},
+    }
+    sink = SmtpSink(latency=args.latency_ms / 1000).start()
+    try:
+        for i, count in enumerate(sizes):
+            folder = os.path.join(work_dir, f"contacts_{count}")
+            print(f"Generating {count} contacts in {folder}", flush=True)
+            start = time.perf_counter()
+            make_data_folder(folder, count, attachment_kb, sink.port)
+            entry = {"generate_s": round(time.perf_counter() - start, 2)}
+            entry.update(bench_headless(folder, args.repeat))
+            if not gui_skip and count <= args.gui_max:
+                entry.update(bench_gui(folder, args.repeat))
+            if i == 0:  # Throughput doesn't depend on the folder size; measure it once
+                entry.update(bench_send(folder, sink, args.send_count, attachment_kb, args.repeat))
+            result["results"][str(count)] = entry
+            for name, r in entry.items():
+                if isinstance(r, dict):
+                    extra = f"  {r['msgs_per_sec']} msg/s" if "msgs_per_sec" in r else ""
+                    print(f"  {name:<24} min {r['min_ms']:>10.2f} ms  median {r['median_ms']:>10.2f} ms{extra}", flush=True)
+                elif name in ("named_fonts", "peak_rss_kb"):
+                    print(f"  {name:<24} {r}", flush=True)
+    finally:
+        sink.stop()
+        if xvfb:
+            xvfb.terminate()
+        if not args.keep and not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
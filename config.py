@@ -21,8 +21,8 @@ ENTRY_PAD_Y = (0, 10)
 # System settings
 import os
 
-# Default AppData location (always exists for the pointer file)
-_DEFAULT_APP_DIR = os.path.join(os.environ.get("APPDATA"), APP_NAME)
+# Default AppData location (always exists for the pointer file); ~/.config where APPDATA is unset
+_DEFAULT_APP_DIR = os.path.join(os.environ.get("APPDATA") or os.path.expanduser(os.path.join("~", ".config")), APP_NAME)
 if not os.path.exists(_DEFAULT_APP_DIR):
     os.makedirs(_DEFAULT_APP_DIR)
 
@@ -57,6 +57,12 @@ def set_data_folder(new_path):
         if os.path.exists(_DATA_FOLDER_FILE):
             os.remove(_DATA_FOLDER_FILE)
 
+def data_folder_of(app_dir):
+    """Return the raw data folder setting that points at app_dir (the inverse of _get_data_folder)."""
+    if os.path.normcase(os.path.abspath(app_dir)) == os.path.normcase(os.path.abspath(_DEFAULT_APP_DIR)):
+        return ""
+    return os.path.dirname(app_dir)
+
 def get_data_folder_raw():
     """Get the raw custom path (or empty string if using default)."""
     if os.path.exists(_DATA_FOLDER_FILE):
@@ -69,14 +75,28 @@ def get_data_folder_raw():
 
 def reload_paths():
     """Reload all data paths based on current data folder setting."""
-    global APP_DIR, CONFIG_FILE, REPORTS_FILE, ATTACHMENTS_DIR
-    APP_DIR = _get_data_folder()
+    use_app_dir(_get_data_folder())
+
+def use_app_dir(app_dir):
+    """Point all data paths at app_dir (the folder holding config.json), e.g. for command-line runs."""
+    global APP_DIR, CONFIG_FILE, CONTACTS_DB, REPORTS_FILE, REPORTS_DB, REPORT_BODIES_DIR, RETRY_QUEUE_FILE, SUPPRESSION_DB, ATTACHMENTS_DIR
+    APP_DIR = app_dir
     CONFIG_FILE = os.path.join(APP_DIR, "config.json")
-    REPORTS_FILE = os.path.join(APP_DIR, "reports.json")
+    CONTACTS_DB = os.path.join(APP_DIR, "contacts.db")
+    REPORTS_FILE = os.path.join(APP_DIR, "reports.json")  # Legacy; imported into REPORTS_DB
+    REPORTS_DB = os.path.join(APP_DIR, "reports.db")
+    REPORT_BODIES_DIR = os.path.join(APP_DIR, "report_bodies")
+    RETRY_QUEUE_FILE = os.path.join(APP_DIR, "retry_queue.json")
+    SUPPRESSION_DB = os.path.join(APP_DIR, "suppression.db")
     ATTACHMENTS_DIR = os.path.join(APP_DIR, "attachments")
 
 # Initialize paths
 APP_DIR = _get_data_folder()
 CONFIG_FILE = os.path.join(APP_DIR, "config.json")
-REPORTS_FILE = os.path.join(APP_DIR, "reports.json")
+CONTACTS_DB = os.path.join(APP_DIR, "contacts.db")
+REPORTS_FILE = os.path.join(APP_DIR, "reports.json")  # Legacy; imported into REPORTS_DB
+REPORTS_DB = os.path.join(APP_DIR, "reports.db")
+REPORT_BODIES_DIR = os.path.join(APP_DIR, "report_bodies")
+RETRY_QUEUE_FILE = os.path.join(APP_DIR, "retry_queue.json")
+SUPPRESSION_DB = os.path.join(APP_DIR, "suppression.db")
 ATTACHMENTS_DIR = os.path.join(APP_DIR, "attachments")
@@ -0,0 +1,585 @@
+# engine.py - Tk-free campaign core shared by the GUI and the command-line runner
+import os
+import re
+import json
+import time
+import smtplib
+import threading
+import datetime
+import mimetypes
+from email.message import EmailMessage
+
+import config
+import crypto
+import store
+import templating
+import reports
+import retry
+import suppression
+import profiling
+import metrics
+import progress
+from langs import t
+
+SETTING_DEFAULTS = {
+    "smtp": {},
+    "delay": 2,
+    "notifications": True,
+    "signature": "",
+    "templates": {},
+    "report_retention_days": 0,
+    "report_max_mb": 0,
+    "profiling": False,
+    "profile_capture": False,
+    "stall_threshold_ms": 500,
+    "metrics_port": 0,
+    "engine_process": False,
+    "smtp_size_limit": {},  # Last SIZE limit seen: {"server", "port", "bytes", "checked"}
+}
+
+# Deliberately loose: one @, no spaces or separators, a dot in the domain
+ADDRESS_RE = re.compile(r"^[^@\s,;<>]+@[^@\s,;<>]+\.[^@\s,;<>.]{2,}$")
+
+DATE_FORMATS = {"DD/MM/YYYY": "%d/%m/%Y", "MM/DD/YYYY": "%m/%d/%Y", "YYYY-MM-DD": "%Y-%m-%d", "DD.MM.YYYY": "%d.%m.%Y"}
+TIME_FORMATS = {"24H": "%H:%M", "12H": "%I:%M %p"}
+
+
+def relocated_att_path(abs_path):
+    """Return where an attachment stored under another data folder lives in the current
+    ATTACHMENTS_DIR (attachments/<profile>/<filename>), or None if the path has no such part."""
+    parts = abs_path.replace("\\", "/").split("/")
+    try:
+        att_idx = [p.lower() for p in parts].index("attachments")
+    except ValueError:
+        return None
+    rel = parts[att_idx + 1:]
+    return os.path.join(config.ATTACHMENTS_DIR, *rel) if rel else None
+
+
+def resolve_att_path(abs_path):
+    """Resolve an attachment path. If it exists, return as-is.
+    Otherwise, extract profile/filename and resolve against current ATTACHMENTS_DIR."""
+    if not abs_path:
+        return abs_path
+    if os.path.exists(abs_path):
+        return abs_path
+    resolved = relocated_att_path(abs_path)
+    if resolved and os.path.exists(resolved):
+        return resolved
+    return abs_path
+
+
+# Rough MIME overhead: top-level headers, and per-part headers of each attachment
+MESSAGE_HEADER_BYTES = 300
+PART_HEADER_BYTES = 250
+
+
+def estimate_message_size(subject, body, attachment_sizes):
+    """Estimate the wire size in bytes of a message without building it. Attachments are
+    base64 encoded (4/3 of their size, in 76-character lines); non-ASCII bodies may be too."""
+    body_bytes = len(body.encode("utf-8"))
+    if not body.isascii():
+        body_bytes = body_bytes * 4 // 3
+    size = MESSAGE_HEADER_BYTES + 2 * len(subject.encode("utf-8")) + body_bytes + body_bytes // 76 * 2
+    for n in attachment_sizes:
+        encoded = (n + 2) // 3 * 4
+        size += PART_HEADER_BYTES + encoded + (encoded + 75) // 76 * 2
+    return size
+
+
+def advertised_size_limit(smtp):
+    """Return the ESMTP SIZE limit from a connection's last EHLO reply in bytes (0 = none advertised)."""
+    try:
+        return int(smtp.esmtp_features.get("size", "").split()[0])
+    except (IndexError, ValueError):
+        return 0
+
+
+def known_size_limit(settings):
+    """Return the last SIZE limit seen for the configured server: bytes, 0 if it advertised
+    none, or None if it has not been seen yet."""
+    seen = settings.get("smtp_size_limit") or {}
+    smtp_conf = settings.get("smtp", {})
+    if not seen or seen.get("server") != smtp_conf.get("server") or str(seen.get("port")) != str(smtp_conf.get("port", 587)):
+        return None
+    return int(seen.get("bytes") or 0)
+
+
+def remember_size_limit(settings, size_limit, smtp_conf=None):
+    """Record the SIZE limit seen for smtp_conf (default: the configured server). The caller saves the settings."""
+    smtp_conf = smtp_conf or settings.get("smtp", {})
+    settings["smtp_size_limit"] = {
+        "server": smtp_conf.get("server"),
+        "port": str(smtp_conf.get("port", 587)),
+        "bytes": int(size_limit),
+        "checked": datetime.datetime.now().strftime("%Y-%m-%d %H:%M"),
+    }
+
+
+def probe_size_limit(smtp_conf, timeout=15):
+    """Connect (no login) and return the server's SIZE limit in bytes, 0 if it advertises none."""
+    smtp = smtplib.SMTP(smtp_conf.get("server"), int(smtp_conf.get("port", 587)), timeout=timeout)
+    try:
+        smtp.ehlo()
+        if smtp_conf.get("starttls", True):
+            smtp.starttls()
+            smtp.ehlo()  # Features can differ after STARTTLS
+        return advertised_size_limit(smtp)
+    finally:
+        try:
+            smtp.quit()
+        except Exception:
+            pass
+
+
+# --- Data folder ---
+
+def load_settings():
+    """Read config.json (settings only) and fill in defaults."""
+    settings = {}
+    if os.path.exists(config.CONFIG_FILE):
+        try:
+            with open(config.CONFIG_FILE, "r") as f:
+                settings = json.load(f)
+        except Exception as e:
+            print(f"Error loading config: {e}")
+    for key, value in SETTING_DEFAULTS.items():
+        if key not in settings:
+            settings[key] = value.copy() if isinstance(value, dict) else value
+    return settings
+
+
+def save_settings(settings):
+    """Write settings to config.json. Contacts are persisted per record in the contact store."""
+    with open(config.CONFIG_FILE, "w") as f:
+        json.dump({k: v for k, v in settings.items() if k != "contacts"}, f, indent=4)
+
+
+class DataFolder:
+    """Open handles on the stores in the current data folder (see config.reload_paths)."""
+
+    def __init__(self):
+        # Reports: a batch manifest plus per-delivery rows in reports.db, message bodies in a blob store
+        self.report_store = reports.ReportStore(config.REPORTS_DB)
+        self.report_bodies = reports.BlobStore(config.REPORT_BODIES_DIR)
+        reports.import_legacy_file(config.REPORTS_FILE, self.report_store, self.report_bodies)
+        self.retry_queue = retry.RetryQueue(config.RETRY_QUEUE_FILE)
+        self.suppression = suppression.SuppressionList(config.SUPPRESSION_DB)
+        self.contact_store = store.ContactStore(config.CONTACTS_DB)
+
+    def load_contacts(self, settings):
+        """Return all contacts in order. Older versions kept them in config.json; those are
+        moved into the contact store once and settings are rewritten without them."""
+        legacy_contacts = settings.pop("contacts", None)
+        if legacy_contacts and self.contact_store.is_empty():
+            for i, c in enumerate(legacy_contacts):
+                if "id" not in c:
+                    c["id"] = i
+                if "enabled" not in c:
+                    c["enabled"] = True
+                if "_status_lbl_ref" in c:
+                    del c["_status_lbl_ref"]
+            self.contact_store.rebalance(legacy_contacts)
+            save_settings(settings)  # Drop the contacts array from config.json
+        return self.contact_store.load_all()
+
+    def apply_retention(self, settings):
+        """Compact report batches that fall outside the retention settings."""
+        return reports.apply_retention(
+            self.report_store, self.report_bodies,
+            max_age_days=int(settings.get("report_retention_days", 0)),
+            max_bytes=int(settings.get("report_max_mb", 0)) * 1024 * 1024)
+
+    def reload_campaign_state(self):
+        """Re-read the retry queue and suppression list after another process sent a campaign."""
+        self.retry_queue = retry.RetryQueue(config.RETRY_QUEUE_FILE)
+        self.suppression.close()
+        self.suppression = suppression.SuppressionList(config.SUPPRESSION_DB)
+
+    def close(self):
+        for s in (self.contact_store, self.report_store, self.suppression):
+            s.close()
+
+
+# --- Mailing engine ---
+
+class _CountingSMTP(smtplib.SMTP):
+    """SMTP connection that counts the bytes it writes (commands and message data, before TLS)."""
+    bytes_sent = 0
+
+    def send(self, s):
+        super().send(s)
+        self.bytes_sent += len(s)
+
+
+class MailingEngine:
+    """Sends one campaign: a pass over the contacts, then the retry queue.
+
+    on_status(contact, state, text) is called as each contact progresses; state is one of
+    "sending", "sent", "error", "retry", "skipped". on_error(kind, error) reports a
+    "login" or "connection" failure that ends the run. Both are called on the thread
+    that runs the engine. pause(), resume() and cancel() may be called from any thread.
+    """
+
+    def __init__(self, settings, contacts, data, on_status=None, on_error=None):
+        self.settings = settings
+        self.contacts = contacts
+        self.data = data
+        self.on_status = on_status or (lambda contact, state, text: None)
+        self.on_error = on_error or (lambda kind, error: None)
+
+        smtp_conf = settings.get("smtp", {})
+        self.server = smtp_conf.get("server")
+        self.port = int(smtp_conf.get("port", 587))
+        self.user = smtp_conf.get("user")
+        self.password = smtp_conf.get("password")  # This is the encrypted password
+        self.starttls = smtp_conf.get("starttls", True)  # Only plain local relays / test sinks turn this off
+
+        self.templates = settings.get("templates", {})
+        self.render = templating.Renderer()  # Each distinct template text is compiled once per run
+        self.delay_seconds = int(settings.get("delay", 2))
+        self.smtp = None
+        self.batch_id = None
+        self.stats = {"sent": 0, "error": 0, "skipped": 0, "suppressed": 0}
+        self.metrics = metrics.CampaignMetrics()
+        self.metrics_port = int(settings.get("metrics_port", 0) or 0)
+        self.connections = 0
+        self.size_limit = known_size_limit(settings) or 0  # ESMTP SIZE of the server, re-read on every connect
+        self.att_sizes = {}  # Attachment path -> size in bytes, stat'ed once per run
+        self.metrics_written = 0.0
+        self.unpaused = threading.Event()
+        self.unpaused.set()
+        self.cancelled = threading.Event()
+
+    # --- Control (safe to call from any thread) ---
+
+    def pause(self):
+        """Stop before the next delivery until resume() or cancel()."""
+        self.unpaused.clear()
+
+    def resume(self):
+        self.unpaused.set()
+
+    def cancel(self):
+        """End the run before the next delivery. Pending retries stay queued for --resume."""
+        self.cancelled.set()
+        self.unpaused.set()
+
+    def _checkpoint(self):
+        """Block while paused. Returns False once the run has been cancelled."""
+        if not self.unpaused.is_set():
+            self.disconnect()  # A paused connection would time out; deliver() reconnects
+            self.unpaused.wait()
+        return not self.cancelled.is_set()
+
+    def _wait(self, seconds):
+        """Sleep, returning False early if the run is cancelled."""
+        return not self.cancelled.wait(seconds)
+
+    # --- Connection ---
+
+    def connect(self):
+        with self.metrics.timer("connect"):
+            smtp = _CountingSMTP(self.server, self.port)
+            smtp.ehlo()
+        if self.starttls:
+            with self.metrics.timer("tls"):
+                smtp.starttls()
+        # Always decrypt the password to memory before usage
+        with self.metrics.timer("auth"):
+            smtp.login(self.user, crypto.decrypt(self.password))
+        self.size_limit = advertised_size_limit(smtp)  # login() re-ran EHLO after STARTTLS
+        self.metrics.set("smtp_size_limit_bytes", self.size_limit)
+        self.connections += 1
+        if self.connections > 1:
+            self.metrics.inc("reconnects_total")
+        self.smtp = smtp
+
+    def disconnect(self):
+        if self.smtp is not None:
+            try:
+                self.smtp.quit()
+            except Exception:
+                pass
+            self.smtp = None
+
+    def attachment_size(self, path):
+        """Size of an attachment in bytes (None if missing). Found sizes are cached for the run."""
+        size = self.att_sizes.get(path)
+        if size is None:
+            try:
+                size = self.att_sizes[path] = os.stat(path).st_size
+            except OSError:
+                return None
+        return size
+
+    def oversized(self, contact, subject, msg_body, att_sizes):
+        """Return the estimated size of the message if it exceeds the server's SIZE limit, else 0."""
+        if not self.size_limit:
+            return 0
+        values = self.template_values(contact)
+        size = estimate_message_size(self.render(subject, values), self.render(msg_body, values), att_sizes)
+        return size if size > self.size_limit else 0
+
+    # --- Reports ---
+
+    def log_report(self, email, subj, status_msg, msg_body="", attachment=""):
+        if status_msg == "Skipped (Disabled)":
+            return  # User requested not to log skipped items
+        self.data.report_store.add_delivery(self.batch_id, {
+            "email": email,
+            "subject": subj,
+            "status": status_msg,
+            "attachment": attachment
+        }, msg_body, self.data.report_bodies)
+
+    # --- Sending ---
+
+    def template_values(self, contact, now=None):
+        """Return the {variable} -> value map for a contact."""
+        recipient = contact.get("email", "")
+        now = now or datetime.datetime.now()
+        date_fmt_key = self.settings.get("date_format", "DD/MM/YYYY")
+        time_fmt_key = self.settings.get("time_format", "24H")
+        date_fmt = date_fmt_key if "%" in date_fmt_key else DATE_FORMATS.get(date_fmt_key, "%d/%m/%Y")
+        time_fmt = time_fmt_key if "%" in time_fmt_key else TIME_FORMATS.get(time_fmt_key, "%H:%M")
+        return {
+            "{company_name}": contact.get("company", ""),
+            "{email}": recipient,
+            "{email_prefix}": recipient.split("@")[0] if "@" in recipient else recipient,
+            "{date}": now.strftime(date_fmt),
+            "{time}": now.strftime(time_fmt),
+            "{signature}": self.settings.get("signature", "")
+        }
+
+    def build_message(self, contact, subject, msg_body, atts_list):
+        """Render template variables and return (subject, body, EmailMessage).
+        Raises OSError naming the attachment that could not be read."""
+        recipient = contact.get("email", "")
+        # Fill predefined template variables
+        replacements = self.template_values(contact)
+        msg_body = self.render(msg_body, replacements)
+        subject = self.render(subject, replacements)
+
+        msg = EmailMessage()
+        msg['Subject'] = subject
+        msg['From'] = self.user
+        msg['To'] = recipient
+        msg.set_content(msg_body)
+
+        for attachment_path in atts_list:
+            if attachment_path:  # deliver() checked they exist; one removed since fails to open
+                file_name = os.path.basename(attachment_path)
+                try:
+                    with open(attachment_path, 'rb') as f:
+                        file_data = f.read()
+                except OSError:
+                    raise OSError(file_name)
+                mime_type, _ = mimetypes.guess_type(file_name)
+                if mime_type is None:
+                    mime_type = 'application/octet-stream'
+                maintype, subtype = mime_type.split('/', 1)
+                msg.add_attachment(file_data, maintype=maintype, subtype=subtype, filename=file_name)
+        return subject, msg_body, msg
+
+    def deliver(self, contact):
+        """Send one contact's message. Returns "sent", "error", "retry", "skipped", "suppressed" or "invalid"."""
+        c_id = contact.get("id")
+        recipient = contact.get("email", "Unknown")
+        subject, msg_body = templating.resolve(contact, self.templates)
+        queue = self.data.retry_queue
+
+        if not contact.get("enabled", True):
+            msg = "Skipped (Disabled)"
+            self.on_status(contact, "skipped", msg)
+            self.log_report(recipient, subject, msg, msg_body)
+            return "skipped"
+
+        self.on_status(contact, "sending", t("sending"))
+
+        legacy_att = contact.get("attachment")
+        atts_list = contact.get("attachments", [legacy_att] if legacy_att else [])
+        atts_list = [resolve_att_path(p) for p in atts_list]
+        att_bases = [os.path.basename(p) for p in atts_list if p]
+        att_summary = ", ".join(att_bases) if att_bases else ""
+
+        if not recipient or recipient == "Unknown":
+            msg = "Error: No Email"
+            self.on_status(contact, "error", msg)
+            self.log_report(recipient, subject, msg, msg_body, att_summary)
+            return "invalid"
+
+        # The pre-flight check reports these as errors too
+        if not ADDRESS_RE.match(recipient.strip()):
+            msg = "Error: Invalid Address"
+            self.on_status(contact, "error", msg)
+            self.log_report(recipient, subject, msg, msg_body, att_summary)
+            return "invalid"
+
+        # Addresses that permanently rejected mail before are not contacted again
+        if recipient in self.data.suppression:
+            msg = "Skipped (Suppressed)"
+            self.on_status(contact, "skipped", msg)
+            self.log_report(recipient, subject, msg, msg_body, att_summary)
+            queue.remove(c_id)
+            return "suppressed"
+
+        if templating.missing_template(contact, self.templates):
+            msg = "Error: Template Missing"
+            self.on_status(contact, "error", msg)
+            self.log_report(recipient, subject, msg, msg_body, att_summary)
+            return "invalid"
+
+        att_sizes = [self.attachment_size(p) for p in atts_list if p]
+        if None in att_sizes:
+            msg = "Error: File(s) Missing"
+            self.on_status(contact, "error", msg)
+            self.log_report(recipient, subject, msg, msg_body, att_summary)
+            return "invalid"
+
+        # Checked before building, so an oversized message is never encoded or uploaded
+        size = self.oversized(contact, subject, msg_body, att_sizes)
+        if size:
+            msg = f"Error: Too Large ({progress.format_bytes(size)} > {progress.format_bytes(self.size_limit)} limit)"
+            self.on_status(contact, "error", msg)
+            self.log_report(recipient, subject, msg, msg_body, att_summary)
+            queue.remove(c_id)
+            self.metrics.inc("messages_oversized_total")
+            return "invalid"
+
+        try:
+            with profiling.span("engine.build_message"), self.metrics.timer("build"):
+                subject, msg_body, msg = self.build_message(contact, subject, msg_body, atts_list)
+            self.metrics.inc("messages_built_total")
+        except OSError as e:
+            err_msg = f"Error: Attaching {e}"
+            self.on_status(contact, "error", err_msg)
+            self.log_report(recipient, subject, err_msg, msg_body, att_summary)
+            return "invalid"
+
+        try:
+            if self.smtp is None:
+                with profiling.span("engine.connect"):
+                    self.connect()
+            sent_before = self.smtp.bytes_sent
+            try:
+                with profiling.span("engine.smtp_send"), self.metrics.timer("data"):
+                    self.smtp.send_message(msg)
+            finally:
+                if self.smtp is not None:
+                    self.metrics.inc("bytes_sent_total", self.smtp.bytes_sent - sent_before)
+        except Exception as e:
+            transient, code, error = retry.classify(e)
+            if isinstance(e, smtplib.SMTPServerDisconnected):
+                self.smtp = None
+            entry = queue.schedule(c_id, recipient, code, error) if transient else None
+            if entry:
+                wait = int(entry["next_at"] - time.time())
+                self.on_status(contact, "retry", t("retry_scheduled", attempt=entry["attempts"], max=retry.MAX_ATTEMPTS, seconds=wait))
+                self.metrics.inc("retries_total")
+                return "retry"
+            # Permanent (5xx) or out of attempts: final
+            queue.remove(c_id)
+            if code in suppression.ADDRESS_CODES and isinstance(e, (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError)):
+                self.data.suppression.add(recipient, code, error)
+            status_msg = f"Error: Sending ({code})" if code else "Error: Sending"
+            self.on_status(contact, "error", status_msg)
+            self.log_report(recipient, subject, status_msg, msg_body, att_summary)
+            return "error"
+
+        queue.remove(c_id)
+        self.metrics.inc("messages_sent_total")
+        self.on_status(contact, "sent", "Sent")
+        self.log_report(recipient, subject, "Sent", msg_body, att_summary)
+        return "sent"
+
+    def _count(self, outcome):
+        # A delivery that could not be attempted (no address, unusable attachments) failed as well
+        stat = "error" if outcome == "invalid" else outcome
+        if stat in self.stats:
+            self.stats[stat] += 1
+        if outcome != "retry":
+            self.metrics.inc("deliveries_total", outcome=outcome)
+        if time.monotonic() - self.metrics_written >= metrics.WRITE_INTERVAL:
+            self.write_metrics()
+
+    def start_metrics_server(self):
+        """Serve the live metrics on localhost if a metrics port is configured."""
+        if not self.metrics_port:
+            return None
+        try:
+            return metrics.MetricsServer(self.metrics, self.metrics_port)
+        except OSError as e:
+            print(f"Metrics endpoint not available on port {self.metrics_port}: {e}")
+            return None
+
+    def write_metrics(self):
+        """Snapshot the metrics to metrics.prom / metrics.json in the data folder."""
+        self.metrics_written = time.monotonic()
+        self.metrics.write_files(config.APP_DIR)
+
+    @profiling.profiled("campaign")
+    def run(self, resume=False):
+        """Send to every contact, then work through the retry queue. With resume=True only
+        the retry queue left over from an earlier run is processed.
+        Returns the stats dict, or None if the run ended on a login or connection error."""
+        self.batch_id = self.data.report_store.start_batch(datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        queue = self.data.retry_queue
+        contacts_by_id = {c.get("id"): c for c in self.contacts}
+        self.metrics.set("campaign_running", 1)
+        self.metrics.set("campaign_contacts", len(self.contacts))
+        self.metrics.set("campaign_started_timestamp_seconds", int(time.time()))
+        server = self.start_metrics_server()
+        try:
+            try:
+                with profiling.span("engine.connect"):
+                    self.connect()
+            except smtplib.SMTPAuthenticationError as e:
+                self.on_error("login", e)
+                self.log_report("SYSTEM", "N/A", f"SMTP Login Error: {e}", "")
+                return None  # Exit the worker if login fails
+
+            if not resume:
+                # A fresh run sends to every contact, so older pending retries are superseded
+                queue.clear()
+                last_enabled = max((i for i, c in enumerate(self.contacts) if c.get("enabled", True)), default=-1)
+                for i, contact in enumerate(self.contacts):
+                    if not self._checkpoint():
+                        break
+                    outcome = self.deliver(contact)
+                    self._count(outcome)
+                    if outcome in ("skipped", "suppressed", "invalid"):
+                        continue
+
+                    # Anti-spam Delay (skip if no more enabled contacts remain)
+                    if i < last_enabled and self.delay_seconds > 0:
+                        self._wait(self.delay_seconds)
+
+            # Retry pass: transient failures are re-sent with exponential backoff until they
+            # succeed, fail permanently or run out of attempts. The queue is on disk, so an
+            # interrupted pass can be resumed after a restart.
+            while len(queue) and self._checkpoint():
+                entry = queue.next_due()
+                contact = contacts_by_id.get(entry["contact_id"])
+                if contact is None or not contact.get("enabled", True):
+                    queue.remove(entry["contact_id"])
+                    continue
+                wait = max(self.delay_seconds, entry["next_at"] - time.time())
+                if wait > 60:
+                    self.disconnect()  # Don't hold an idle connection the server would drop anyway
+                if not self._wait(wait):
+                    break
+                self._count(self.deliver(contact))
+            self.disconnect()
+            return self.stats
+
+        except Exception as e:
+            self.disconnect()
+            self.on_error("connection", e)
+            self.log_report("SYSTEM", "N/A", f"SMTP Error: {e}", "")
+            return None
+        finally:
+            self.metrics.set("campaign_running", 0)
+            self.write_metrics()
+            if server is not None:
+                server.close()
@@ -52,7 +52,72 @@ TRANSLATIONS = {
         "data_folder_desc": "Custom location for app data (config, reports, attachments). Leave empty for default (AppData).",
         "browse": "Browse",
         "reset_default": "Reset",
-        "data_folder_moved": "Data folder changed and files have been moved. The app will restart.",
+        "suppression_list": "Suppression List",
+        "suppression_desc": "Addresses that permanently rejected mail (550/551/553) are added automatically and skipped in later campaigns.",
+        "suppression_count": "{count} suppressed addresses",
+        "suppression_imported": "{count} addresses added to the suppression list.",
+        "suppression_exported": "{count} addresses exported.",
+        "suppression_clear_confirm": "Remove every address from the suppression list?",
+        "clear": "Clear",
+        "refresh": "Refresh",
+        "dash_title": "Campaign",
+        "dash_sent": "Done: {done} / {total}",
+        "dash_rate": "Rate: {rate} msg/min",
+        "dash_bytes": "Upload: {rate}/s",
+        "dash_errors": "Errors: {errors} ({pct}%)",
+        "dash_eta": "ETA: {eta}",
+        "dash_finished": "Finished in {elapsed}",
+        "pause": "Pause",
+        "resume": "Resume",
+        "cancel": "Cancel",
+        "cancel_campaign_confirm": "Stop the campaign? Contacts not yet reached are not sent; pending retries stay queued.",
+        "campaign_running": "A campaign is already running.",
+        "data_folder_campaign_running": "The data folder can't be changed while a campaign is running.",
+        "engine_process": "Send in a separate process",
+        "size_limit_label": "Server message size limit: {limit} (checked {checked})",
+        "size_limit_none": "The server does not advertise a message size limit (checked {checked})",
+        "size_limit_unknown": "Server message size limit: unknown",
+        "size_limit_checking": "Checking server...",
+        "size_limit_check": "Check",
+        "size_limit_failed": "Could not read the size limit: {error}",
+        "preflight_title": "Pre-flight Check",
+        "preflight_checking": "Checking...",
+        "preflight_summary": "{checked} contacts checked: {errors} errors, {warnings} warnings. Estimated total size {size}, largest message {largest}.",
+        "preflight_error": "Error",
+        "preflight_warning": "Warning",
+        "preflight_no_email": "Contacts without an email address",
+        "preflight_bad_address": "Invalid email addresses",
+        "preflight_missing_file": "Missing attachments",
+        "preflight_missing_template": "Shared template not found",
+        "preflight_too_large": "Larger than the server's size limit",
+        "preflight_unknown_variable": "Unknown template variables",
+        "preflight_empty_subject": "Empty subject",
+        "preflight_empty_message": "Empty message",
+        "preflight_duplicate": "Duplicate addresses",
+        "preflight_suppressed": "Suppressed addresses (will be skipped)",
+        "preflight_more": "... and {count} more",
+        "send_anyway": "Send Anyway",
+        "profiling": "Profiling",
+        "profiling_desc": "Records how long screen changes, refreshes, imports, saves and campaigns take. cProfile output of slow actions is saved to {folder}.",
+        "profiling_enable": "Record action timings",
+        "profiling_capture": "Save cProfile output",
+        "slowest_actions": "Slowest Actions",
+        "profiling_off": "Profiling is off. Enable it in Settings (or start the app with --profile).",
+        "profiling_no_data": "No actions recorded yet.",
+        "prof_action": "Action",
+        "prof_duration": "Duration",
+        "prof_time": "Time",
+        "prof_thread": "Thread",
+        "prof_breakdown": "Steps inside actions",
+        "prof_step": "Step",
+        "prof_calls": "Calls",
+        "prof_avg": "Average",
+        "prof_max": "Max",
+        "data_folder_moved": "Data folder changed and files have been moved.",
+        "data_folder_exists_loading": "The selected folder already contains MailFlow data. It will be loaded instead.",
+        "data_folder_moving": "Moving data files...",
+        "data_folder_move_failed": "Some files could not be moved. They were left in the old folder:\n{errors}",
+        "data_folder_restore_failed": "The data folder could not be moved, and some files could not be moved back:\n{errors}\n\nThe app will close. The move is retried at the next start.",
         "settings_saved": "Settings saved.",
         "lang_restart": "Language changed. Please restart the application for it to take full effect.",
         "theme": "Appearance Theme",
@@ -74,6 +139,22 @@ TRANSLATIONS = {
         "report_subject": "Subject",
         "no_message": "No message content recorded.",
         "attachments_label": "Attachments:",
+        "report_search_placeholder": "Email or domain (e.g. @example.com)",
+        "status_all": "All",
+        "status_sent": "Sent",
+        "status_error": "Error",
+        "status_skipped": "Skipped",
+        "date_from": "From YYYY-MM-DD",
+        "date_to": "To YYYY-MM-DD",
+        "search": "Search",
+        "reset": "Reset",
+        "load_more": "Load more",
+        "no_results": "No matching deliveries.",
+        "invalid_date": "Dates must be in YYYY-MM-DD format.",
+        "batch_rolled_up": "Older batch: only per-domain totals are kept.",
+        "rollup_counts": "Sent: {sent}   Errors: {errors}   Skipped: {skipped}",
+        "report_retention_days": "Keep Report Details (days, 0 = forever)",
+        "report_max_mb": "Max Reports Size (MB, 0 = no limit)",
 
         # Help
         "help_title": "MailFlow Help & Guide",
@@ -125,6 +206,11 @@ TRANSLATIONS = {
         "copying_files": "Copying files... ({current}/{total})",
         "email_required": "Recipient Email is required",
         "tag": "Category Tag",
+        "template": "Message Template",
+        "no_template": "(No template)",
+        "save_as_template": "Save as Template",
+        "template_name_prompt": "Template name:",
+        "template_exists": "A template with this name already exists.",
         "all_tags": "All Tags",
         
         # Favorites
@@ -141,11 +227,14 @@ TRANSLATIONS = {
         # Mail Engine
         "smtp_error": "Please configure SMTP settings first.",
         "sending": "Sending...",
+        "retry_scheduled": "Retry {attempt}/{max} in {seconds}s",
+        "retry_pending_title": "Pending Retries",
+        "retry_pending_msg": "{count} deliveries failed temporarily last time and are waiting to be retried. Retry them now?",
         "sent_ok": "Sent ✓",
         "error_prefix": "Error",
         "skipped_disabled": "Skipped (Disabled)",
         "notif_title": "MailFlow - Sending Complete",
-        "notif_body": "Sent: {sent} | Errors: {errors} | Skipped: {skipped}",
+        "notif_body": "Sent: {sent} | Errors: {errors} | Skipped: {skipped} | Suppressed: {suppressed}",
 
         # Dialogs
         "delete_confirm_title": "Confirm Deletion",
@@ -206,7 +295,72 @@ TRANSLATIONS = {
         "data_folder_desc": "Uygulama verileri için özel konum (ayarlar, raporlar, ekler). Varsayılan (AppData) için boş bırakın.",
         "browse": "Gözat",
         "reset_default": "Sıfırla",
-        "data_folder_moved": "Veri klasörü değiştirildi ve dosyalar taşındı. Uygulama yeniden başlatılacak.",
+        "suppression_list": "Engelleme Listesi",
+        "suppression_desc": "Postayı kalıcı olarak reddeden adresler (550/551/553) otomatik eklenir ve sonraki gönderimlerde atlanır.",
+        "suppression_count": "{count} engellenmiş adres",
+        "suppression_imported": "Engelleme listesine {count} adres eklendi.",
+        "suppression_exported": "{count} adres dışa aktarıldı.",
+        "suppression_clear_confirm": "Engelleme listesindeki tüm adresler kaldırılsın mı?",
+        "clear": "Temizle",
+        "refresh": "Yenile",
+        "dash_title": "Gönderim",
+        "dash_sent": "Tamamlanan: {done} / {total}",
+        "dash_rate": "Hız: {rate} e-posta/dk",
+        "dash_bytes": "Yükleme: {rate}/sn",
+        "dash_errors": "Hatalar: {errors} (%{pct})",
+        "dash_eta": "Kalan süre: {eta}",
+        "dash_finished": "{elapsed} içinde tamamlandı",
+        "pause": "Duraklat",
+        "resume": "Devam Et",
+        "cancel": "İptal",
+        "cancel_campaign_confirm": "Gönderim durdurulsun mu? Henüz ulaşılmayan kişilere gönderilmez; bekleyen yeniden denemeler kuyrukta kalır.",
+        "campaign_running": "Zaten devam eden bir gönderim var.",
+        "data_folder_campaign_running": "Gönderim devam ederken veri klasörü değiştirilemez.",
+        "engine_process": "Ayrı bir işlemde gönder",
+        "size_limit_label": "Sunucu mesaj boyutu sınırı: {limit} (kontrol: {checked})",
+        "size_limit_none": "Sunucu bir mesaj boyutu sınırı bildirmiyor (kontrol: {checked})",
+        "size_limit_unknown": "Sunucu mesaj boyutu sınırı: bilinmiyor",
+        "size_limit_checking": "Sunucu kontrol ediliyor...",
+        "size_limit_check": "Kontrol Et",
+        "size_limit_failed": "Boyut sınırı okunamadı: {error}",
+        "preflight_title": "Gönderim Öncesi Kontrol",
+        "preflight_checking": "Kontrol ediliyor...",
+        "preflight_summary": "{checked} kişi kontrol edildi: {errors} hata, {warnings} uyarı. Tahmini toplam boyut {size}, en büyük mesaj {largest}.",
+        "preflight_error": "Hata",
+        "preflight_warning": "Uyarı",
+        "preflight_no_email": "E-posta adresi olmayan kişiler",
+        "preflight_bad_address": "Geçersiz e-posta adresleri",
+        "preflight_missing_file": "Eksik ekler",
+        "preflight_missing_template": "Ortak şablon bulunamadı",
+        "preflight_too_large": "Sunucunun boyut sınırından büyük",
+        "preflight_unknown_variable": "Bilinmeyen şablon değişkenleri",
+        "preflight_empty_subject": "Boş konu",
+        "preflight_empty_message": "Boş mesaj",
+        "preflight_duplicate": "Tekrarlanan adresler",
+        "preflight_suppressed": "Engellenmiş adresler (atlanacak)",
+        "preflight_more": "... ve {count} tane daha",
+        "send_anyway": "Yine de Gönder",
+        "profiling": "Profilleme",
+        "profiling_desc": "Ekran geçişleri, yenilemeler, içe aktarmalar, kayıtlar ve gönderimlerin ne kadar sürdüğünü kaydeder. Yavaş işlemlerin cProfile çıktısı {folder} klasörüne kaydedilir.",
+        "profiling_enable": "İşlem sürelerini kaydet",
+        "profiling_capture": "cProfile çıktısını kaydet",
+        "slowest_actions": "En Yavaş İşlemler",
+        "profiling_off": "Profilleme kapalı. Ayarlardan açın (veya uygulamayı --profile ile başlatın).",
+        "profiling_no_data": "Henüz kaydedilmiş işlem yok.",
+        "prof_action": "İşlem",
+        "prof_duration": "Süre",
+        "prof_time": "Zaman",
+        "prof_thread": "İş Parçacığı",
+        "prof_breakdown": "İşlemlerin içindeki adımlar",
+        "prof_step": "Adım",
+        "prof_calls": "Çağrı",
+        "prof_avg": "Ortalama",
+        "prof_max": "En Fazla",
+        "data_folder_moved": "Veri klasörü değiştirildi ve dosyalar taşındı.",
+        "data_folder_exists_loading": "Seçilen klasör zaten MailFlow verisi içeriyor. Bunun yerine o veriler yüklenecek.",
+        "data_folder_moving": "Veri dosyaları taşınıyor...",
+        "data_folder_move_failed": "Bazı dosyalar taşınamadı. Eski klasörde bırakıldılar:\n{errors}",
+        "data_folder_restore_failed": "Veri klasörü taşınamadı ve bazı dosyalar geri taşınamadı:\n{errors}\n\nUygulama kapanacak. Taşıma bir sonraki başlangıçta yeniden denenecek.",
         "settings_saved": "Ayarlar kaydedildi.",
         "lang_restart": "Dil değiştirildi. Tam olarak uygulanması için uygulamayı yeniden başlatın.",
         "theme": "Görünüm Teması",
@@ -228,6 +382,22 @@ TRANSLATIONS = {
         "report_subject": "Konu",
         "no_message": "Kayıtlı mesaj içeriği yok.",
         "attachments_label": "Ekler:",
+        "report_search_placeholder": "E-posta veya alan adı (örn. @ornek.com)",
+        "status_all": "Tümü",
+        "status_sent": "Gönderildi",
+        "status_error": "Hata",
+        "status_skipped": "Atlandı",
+        "date_from": "Başlangıç YYYY-AA-GG",
+        "date_to": "Bitiş YYYY-AA-GG",
+        "search": "Ara",
+        "reset": "Sıfırla",
+        "load_more": "Daha fazla yükle",
+        "no_results": "Eşleşen gönderim yok.",
+        "invalid_date": "Tarihler YYYY-AA-GG biçiminde olmalıdır.",
+        "batch_rolled_up": "Eski gönderim: yalnızca alan adı bazında toplamlar tutulur.",
+        "rollup_counts": "Gönderildi: {sent}   Hata: {errors}   Atlandı: {skipped}",
+        "report_retention_days": "Rapor Detaylarını Sakla (gün, 0 = süresiz)",
+        "report_max_mb": "Maks. Rapor Boyutu (MB, 0 = sınırsız)",
 
         # Help
         "help_title": "MailFlow Yardım & Rehber",
@@ -279,6 +449,11 @@ TRANSLATIONS = {
         "copying_files": "Dosyalar kopyalanıyor... ({current}/{total})",
         "email_required": "Alıcı E-posta adresi gereklidir",
         "tag": "Kategori Etiketi",
+        "template": "Mesaj Şablonu",
+        "no_template": "(Şablon yok)",
+        "save_as_template": "Şablon Olarak Kaydet",
+        "template_name_prompt": "Şablon adı:",
+        "template_exists": "Bu adda bir şablon zaten var.",
         "all_tags": "Tüm Etiketler",
         
         # Favorites
@@ -295,11 +470,14 @@ TRANSLATIONS = {
         # Mail Engine
         "smtp_error": "Lütfen önce SMTP ayarlarını yapılandırın.",
         "sending": "Gönderiliyor...",
+        "retry_scheduled": "Tekrar {attempt}/{max}, {seconds} sn sonra",
+        "retry_pending_title": "Bekleyen Tekrar Denemeler",
+        "retry_pending_msg": "Geçen sefer geçici olarak başarısız olan {count} gönderim tekrar denenmeyi bekliyor. Şimdi tekrar denensin mi?",
         "sent_ok": "Gönderildi ✓",
         "error_prefix": "Hata",
         "skipped_disabled": "Atlandı (Devre Dışı)",
         "notif_title": "MailFlow - Gönderim Tamamlandı",
-        "notif_body": "Gönderilen: {sent} | Hata: {errors} | Atlanan: {skipped}",
+        "notif_body": "Gönderilen: {sent} | Hata: {errors} | Atlanan: {skipped} | Engellenen: {suppressed}",
 
         # Dialogs
         "delete_confirm_title": "Silme Onayı",
@@ -330,6 +508,38 @@ def set_language(lang_code):
     if lang_code in TRANSLATIONS:
         _current_lang = lang_code
 
+# Widgets registered for in-place re-translation: (widget, key, option, index, kwargs)
+_bindings = []
+
+def bind(widget, key, option="text", index=None, **kwargs):
+    """Register a widget option to be re-translated when the language changes.
+    Use index for menu entries. Binding the same option again replaces its key and
+    kwargs (for text that changes while shown). Returns the widget."""
+    binding = (widget, key, option, index, kwargs)
+    for i, (w, _key, o, ix, _kwargs) in enumerate(_bindings):
+        if w is widget and o == option and ix == index:
+            _bindings[i] = binding
+            return widget
+    _bindings.append(binding)
+    return widget
+
+def relocalize():
+    """Re-apply translated text to every registered widget, dropping destroyed ones."""
+    alive = []
+    for binding in _bindings:
+        widget, key, option, index, kwargs = binding
+        try:
+            if not widget.winfo_exists():
+                continue
+            if index is not None:
+                widget.entryconfigure(index, **{option: t(key, **kwargs)})
+            else:
+                widget.configure(**{option: t(key, **kwargs)})
+        except Exception:
+            continue
+        alive.append(binding)
+    _bindings[:] = alive
+
 def get_language():
     """Get the current language code."""
     return _current_lang
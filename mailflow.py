@@ -0,0 +1,120 @@
+# mailflow.py - Headless command-line campaign runner (python -m mailflow send ...)
+import os
+import sys
+import argparse
+
+import config
+import langs
+import engine
+import preflight
+
+# Exit codes
+EXIT_OK = 0            # Every delivery was sent, skipped or suppressed (check: no errors found)
+EXIT_FAILURES = 1      # The run finished but some deliveries failed (check: errors found)
+EXIT_USAGE = 2         # Bad arguments or incomplete SMTP settings
+EXIT_SMTP = 3          # Could not log in to / connect to the SMTP server
+
+
+def open_campaign(args):
+    """Point config at --data-dir and load settings. Returns settings, or an exit code on bad input."""
+    if args.data_dir:
+        if not os.path.isdir(args.data_dir):
+            print(f"Data folder not found: {args.data_dir}", file=sys.stderr)
+            return EXIT_USAGE
+        config.use_app_dir(os.path.abspath(args.data_dir))
+
+    settings = engine.load_settings()
+    saved_lang = settings.get("language", "")
+    langs.set_language(saved_lang if saved_lang in langs.TRANSLATIONS else langs.detect_system_language())
+    return settings
+
+
+def load_contacts(args, settings, data):
+    contacts = data.load_contacts(settings)
+    if args.tag:
+        contacts = [c for c in contacts if c.get("tag", "").strip() == args.tag]
+    return contacts
+
+
+def cmd_check(args):
+    settings = open_campaign(args)
+    if not isinstance(settings, dict):
+        return settings
+    data = engine.DataFolder()
+    try:
+        report = preflight.check(engine.MailingEngine(settings, load_contacts(args, settings, data), data))
+    finally:
+        data.close()
+    for line in report.lines(per_kind=args.limit):
+        print(line)
+    print(f"{report.checked} contact(s) checked: {len(report.errors)} error(s), {len(report.warnings)} warning(s). "
+          f"Estimated total size {report.total_bytes / 1048576:.1f} MB, largest message "
+          f"{report.largest[0] / 1048576:.1f} MB ({report.largest[1] or '-'})")
+    return EXIT_FAILURES if report.errors else EXIT_OK
+
+
+def cmd_send(args):
+    settings = open_campaign(args)
+    if not isinstance(settings, dict):
+        return settings
+    smtp_conf = settings.get("smtp", {})
+    if not all(smtp_conf.get(k) for k in ("server", "port", "user", "password")):
+        print(f"SMTP settings are incomplete in {config.CONFIG_FILE}", file=sys.stderr)
+        return EXIT_USAGE
+    if args.metrics_port is not None:
+        settings["metrics_port"] = args.metrics_port
+
+    data = engine.DataFolder()
+    try:
+        contacts = load_contacts(args, settings, data)
+        total = sum(1 for c in contacts if c.get("enabled", True))
+        print(f"Sending to {total} contact(s) from {config.APP_DIR}", flush=True)
+
+        finished = set()
+
+        def on_status(contact, state, text):
+            if state == "sending":
+                return
+            if state != "retry" and contact.get("enabled", True):
+                finished.add(contact.get("id"))
+            print(f"[{len(finished)}/{total}] {contact.get('email', '')}: {text}", flush=True)
+
+        def on_error(kind, error):
+            print(f"SMTP {kind} error: {error}", file=sys.stderr, flush=True)
+
+        mailer = engine.MailingEngine(settings, contacts, data, on_status=on_status, on_error=on_error)
+        stats = mailer.run(resume=args.resume)
+        if stats is None:
+            return EXIT_SMTP
+
+        print(f"Sent: {stats['sent']} | Errors: {stats['error']} | Skipped: {stats['skipped']} | Suppressed: {stats['suppressed']}")
+        data.apply_retention(settings)
+        return EXIT_FAILURES if stats["error"] else EXIT_OK
+    finally:
+        data.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="mailflow", description=f"{config.APP_NAME} {config.APP_VERSION} command-line runner")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    send = sub.add_parser("send", help="Send the campaign to all enabled contacts")
+    send.add_argument("--data-dir", help="Folder holding config.json and contacts.db (default: the app's data folder)")
+    send.add_argument("--tag", help="Only send to contacts with this category tag")
+    send.add_argument("--resume", action="store_true", help="Only process deliveries left in the retry queue")
+    send.add_argument("--metrics-port", type=int, metavar="PORT",
+                      help="Serve live metrics on http://127.0.0.1:PORT/metrics while sending (overrides metrics_port in config.json)")
+    send.set_defaults(func=cmd_send)
+
+    check = sub.add_parser("check", help="Validate addresses, attachments and templates without sending")
+    check.add_argument("--data-dir", help="Folder holding config.json and contacts.db (default: the app's data folder)")
+    check.add_argument("--tag", help="Only check contacts with this category tag")
+    check.add_argument("--limit", type=int, default=20, help="Example rows shown per problem (default: 20)")
+    check.set_defaults(func=cmd_check)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
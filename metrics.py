@@ -0,0 +1,188 @@
+# metrics.py - Campaign counters and latency histograms, exported as Prometheus text and JSON
+import os
+import json
+import time
+import threading
+import contextlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PROM_FILE_NAME = "metrics.prom"
+JSON_FILE_NAME = "metrics.json"
+WRITE_INTERVAL = 15  # Seconds between metric file snapshots during a run
+
+# Phases of a delivery that are timed: connect (TCP + EHLO), tls (STARTTLS), auth (LOGIN),
+# build (render + MIME encode) and data (the MAIL / RCPT / DATA exchange)
+PHASES = ("connect", "tls", "auth", "build", "data")
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+# name -> help text; counters end in _total
+COUNTERS = {
+    "messages_built_total": "Messages rendered and MIME-encoded",
+    "messages_sent_total": "Messages accepted by the SMTP server",
+    "bytes_sent_total": "Bytes written to the SMTP connection (before TLS)",
+    "retries_total": "Deliveries scheduled for another attempt after a transient failure",
+    "reconnects_total": "SMTP connections opened after the first one",
+    "messages_oversized_total": "Messages not sent because they exceed the server's SIZE limit",
+    "deliveries_total": "Deliveries by final outcome",
+}
+GAUGES = {
+    "campaign_running": "1 while a campaign is running",
+    "campaign_contacts": "Contacts in the current campaign",
+    "campaign_started_timestamp_seconds": "Unix time the current campaign started",
+    "smtp_size_limit_bytes": "Message size limit advertised by the SMTP server (0 = none)",
+}
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)  # Non-cumulative; made cumulative on export
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += seconds
+        self.count += 1
+
+
+class CampaignMetrics:
+    """Live counters, gauges and per-phase latency histograms for one campaign. Thread-safe."""
+
+    def __init__(self, prefix="mailflow"):
+        self.prefix = prefix
+        self.lock = threading.Lock()
+        self.counters = {}  # (name, outcome or None) -> value
+        self.gauges = {name: 0 for name in GAUGES}
+        self.phases = {p: _Histogram() for p in PHASES}
+
+    def inc(self, name, value=1, outcome=None):
+        with self.lock:
+            key = (name, outcome)
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def value(self, name, outcome=None):
+        with self.lock:
+            return self.counters.get((name, outcome), 0)
+
+    def set(self, name, value):
+        with self.lock:
+            self.gauges[name] = value
+
+    def observe(self, phase, seconds):
+        with self.lock:
+            self.phases[phase].observe(seconds)
+
+    @contextlib.contextmanager
+    def timer(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(phase, time.perf_counter() - start)
+
+    # --- Export ---
+
+    def snapshot(self):
+        """Return the current values as a JSON-serializable dict."""
+        with self.lock:
+            counters = {}
+            for (name, outcome), value in sorted(self.counters.items(), key=lambda kv: (kv[0][0], kv[0][1] or "")):
+                if outcome is None:
+                    counters[name] = value
+                else:
+                    counters.setdefault(name, {})[outcome] = value
+            phases = {}
+            for p, h in self.phases.items():
+                phases[p] = {"count": h.count, "sum_seconds": round(h.sum, 6),
+                             "avg_ms": round(h.sum / h.count * 1000, 2) if h.count else None,
+                             "buckets": {str(b): n for b, n in zip(BUCKETS, self._cumulative(h))}}
+            return {"time": time.time(), "counters": counters, "gauges": dict(self.gauges), "phases": phases}
+
+    @staticmethod
+    def _cumulative(h):
+        total, out = 0, []
+        for n in h.counts:
+            total += n
+            out.append(total)
+        return out
+
+    def to_prometheus(self):
+        """Return the metrics in the Prometheus text exposition format."""
+        p = self.prefix
+        lines = []
+        with self.lock:
+            for name, help_text in COUNTERS.items():
+                lines.append(f"# HELP {p}_{name} {help_text}")
+                lines.append(f"# TYPE {p}_{name} counter")
+                values = [(o, v) for (n, o), v in self.counters.items() if n == name]
+                if not values:
+                    values = [(None, 0)]
+                for outcome, value in sorted(values, key=lambda ov: ov[0] or ""):
+                    labels = f'{{outcome="{outcome}"}}' if outcome else ""
+                    lines.append(f"{p}_{name}{labels} {value}")
+            for name, help_text in GAUGES.items():
+                lines.append(f"# HELP {p}_{name} {help_text}")
+                lines.append(f"# TYPE {p}_{name} gauge")
+                lines.append(f"{p}_{name} {self.gauges[name]}")
+            lines.append(f"# HELP {p}_phase_seconds Latency of each delivery phase")
+            lines.append(f"# TYPE {p}_phase_seconds histogram")
+            for phase, h in self.phases.items():
+                for bound, n in zip(BUCKETS, self._cumulative(h)):
+                    lines.append(f'{p}_phase_seconds_bucket{{phase="{phase}",le="{bound}"}} {n}')
+                lines.append(f'{p}_phase_seconds_bucket{{phase="{phase}",le="+Inf"}} {h.count}')
+                lines.append(f'{p}_phase_seconds_sum{{phase="{phase}"}} {h.sum:.6f}')
+                lines.append(f'{p}_phase_seconds_count{{phase="{phase}"}} {h.count}')
+        return "\n".join(lines) + "\n"
+
+    def write_files(self, folder):
+        """Write metrics.prom and metrics.json into folder (atomically replaced)."""
+        for name, text in ((PROM_FILE_NAME, self.to_prometheus()),
+                           (JSON_FILE_NAME, json.dumps(self.snapshot(), indent=4))):
+            path = os.path.join(folder, name)
+            try:
+                with open(path + ".tmp", "w", encoding="utf-8") as f:
+                    f.write(text)
+                os.replace(path + ".tmp", path)
+            except OSError as e:
+                print(f"Failed to write {name}: {e}")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        metrics = self.server.metrics
+        if self.path in ("/metrics", "/"):
+            body, ctype = metrics.to_prometheus().encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path == "/metrics.json":
+            body, ctype = json.dumps(metrics.snapshot()).encode("utf-8"), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scrapes every few seconds would flood the console
+
+
+class MetricsServer:
+    """Serves /metrics (Prometheus text) and /metrics.json on 127.0.0.1 only."""
+
+    def __init__(self, metrics, port):
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), _MetricsHandler)
+        self.server.daemon_threads = True
+        self.server.metrics = metrics
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
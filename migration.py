@@ -0,0 +1,267 @@
+# migration.py - Moves the app data folder (config, reports, attachments) to a new location
+import os
+import json
+import shutil
+import hashlib
+
+# Entries that belong to the data folder and get migrated
+DATA_FILES = ["config.json", "contacts.db", "reports.db", "reports.json", "retry_queue.json", "suppression.db",
+              "startup_times.jsonl", "stalls.log", "stalls.log.1", "loop_latency.json", "metrics.prom", "metrics.json"]
+DATA_DIRS = ["attachments", "report_bodies", "profiles"]
+
+JOURNAL_NAME = "migration_journal.jsonl"
+CHUNK_SIZE = 1024 * 1024
+
+
+def _file_hash(path):
+    """Return the sha256 hex digest of a file, read in chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _same_device(src_dir, dst_dir):
+    try:
+        return os.stat(src_dir).st_dev == os.stat(dst_dir).st_dev
+    except OSError:
+        return False
+
+
+class MigrationJob:
+    """Moves data entries from src_dir to dst_dir.
+
+    Uses an atomic rename when both folders live on the same device, otherwise
+    stream-copies every file, verifies size and hash, and only then removes the
+    source. Renames and verified copies are recorded in a journal in dst_dir so an
+    interrupted job can be resumed with pending_job(); a failed job is undone.
+    """
+
+    def __init__(self, src_dir, dst_dir):
+        self.src_dir = src_dir
+        self.dst_dir = dst_dir
+        self.journal_path = os.path.join(dst_dir, JOURNAL_NAME)
+        self.total_bytes = 0
+        self.done_bytes = 0
+        self.current = ""
+        self.errors = []
+        self.restored = False
+        self.finished = False
+
+    # --- Planning ---
+
+    def _plan(self):
+        """Return [(rel_path, size)] for every file that has to be moved."""
+        items = []
+        for fname in DATA_FILES:
+            src = os.path.join(self.src_dir, fname)
+            if os.path.isfile(src):
+                items.append((fname, os.path.getsize(src)))
+        for dname in DATA_DIRS:
+            root_dir = os.path.join(self.src_dir, dname)
+            for root, _dirs, files in os.walk(root_dir):
+                for f in files:
+                    full = os.path.join(root, f)
+                    items.append((os.path.relpath(full, self.src_dir), os.path.getsize(full)))
+        return items
+
+    # --- Journal ---
+
+    def _read_journal(self):
+        """Return the journal's records (after the header) in order."""
+        records = []
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # Torn last line after a crash
+                    if "done" in rec or "moving" in rec:
+                        records.append(rec)
+        return records
+
+    def _journal(self, record):
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    # --- Execution ---
+
+    def run(self):
+        """Run (or resume) the migration. Safe to call from a worker thread.
+
+        On errors the source folder is put back as it was and the journal is dropped
+        (restored is then True); if that fails too, the journal is kept for a resume."""
+        try:
+            os.makedirs(self.dst_dir, exist_ok=True)
+            if not os.path.exists(self.journal_path):
+                self._journal({"src": self.src_dir, "dst": self.dst_dir})
+
+            if _same_device(self.src_dir, self.dst_dir):
+                self._run_rename()
+            else:
+                self._run_copy()
+
+            if not self.errors:
+                os.remove(self.journal_path)
+        except Exception as e:
+            self.errors.append(str(e))
+        finally:
+            self.finished = True
+
+    def _run_rename(self):
+        entries = [e for e in DATA_FILES + DATA_DIRS if os.path.exists(os.path.join(self.src_dir, e))]
+        self.total_bytes = len(entries)
+        for name in entries:
+            self.current = name
+            src = os.path.join(self.src_dir, name)
+            dst = os.path.join(self.dst_dir, name)
+            if os.path.exists(dst):
+                # Entries this job moved are no longer in the source; anything else is not ours to replace
+                self.errors.append(f"{name}: already exists in {self.dst_dir}")
+                continue
+            # The intent is journaled first, so a crash right after the rename still leaves a record
+            self._journal({"moving": name})
+            try:
+                os.replace(src, dst)
+            except OSError as e:
+                self.errors.append(f"{name}: {e}")
+                continue
+            self._journal({"done": name})
+            self.done_bytes += 1
+
+        if self.errors:
+            self._roll_back()
+
+    def _roll_back(self):
+        """Move every journaled entry, of this run or an interrupted one, back to the source."""
+        names = []
+        for rec in self._read_journal():
+            if "moving" in rec and rec["moving"] not in names:
+                names.append(rec["moving"])
+        for name in reversed(names):
+            src = os.path.join(self.src_dir, name)
+            dst = os.path.join(self.dst_dir, name)
+            if not os.path.exists(dst):
+                continue  # The rename never happened
+            try:
+                if os.path.exists(src):
+                    raise OSError(f"{src} exists")
+                os.replace(dst, src)
+            except OSError as e:
+                self.errors.append(f"{name}: could not be moved back: {e}")
+                return  # Keep the journal; it still lists what is in dst_dir
+        os.remove(self.journal_path)
+        self.restored = True
+
+    def _run_copy(self):
+        done = {rec["done"]: rec for rec in self._read_journal() if "done" in rec}
+        items = self._plan()
+        self.total_bytes = sum(size for _rel, size in items)
+
+        for rel, size in items:
+            self.current = rel
+            if not self._copied(rel, done.get(rel)):
+                try:
+                    mtime = self._copy_verified(rel, size)
+                except Exception as e:
+                    self.errors.append(f"{rel}: {e}")
+                    continue
+                done[rel] = {"done": rel, "size": size, "mtime": mtime}
+                self._journal(done[rel])
+            self.done_bytes += size
+
+        if self.errors:
+            self._discard_copies(done)  # Every source file is still there
+            return
+
+        # Empty folders (e.g. a profile without attachments) have no files to carry them over
+        for dname in DATA_DIRS:
+            for root, _dirs, _files in os.walk(os.path.join(self.src_dir, dname)):
+                os.makedirs(os.path.join(self.dst_dir, os.path.relpath(root, self.src_dir)), exist_ok=True)
+        for rel, _size in items:
+            try:
+                os.remove(os.path.join(self.src_dir, rel))
+            except OSError:
+                pass
+        for dname in DATA_DIRS:
+            shutil.rmtree(os.path.join(self.src_dir, dname), ignore_errors=True)
+
+    def _copied(self, rel, record):
+        """True if a journaled copy is still current: the source is unchanged since it was copied."""
+        if not record:
+            return False
+        try:
+            st = os.stat(os.path.join(self.src_dir, rel))
+            copy_size = os.path.getsize(os.path.join(self.dst_dir, rel))
+        except OSError:
+            return False
+        return st.st_size == record.get("size") == copy_size and st.st_mtime_ns == record.get("mtime")
+
+    def _copy_verified(self, rel, size):
+        """Copy one file through a temp file and verify it. Returns the source's mtime (ns) as copied."""
+        src = os.path.join(self.src_dir, rel)
+        dst = os.path.join(self.dst_dir, rel)
+        tmp = dst + ".part"
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        mtime = os.stat(src).st_mtime_ns
+
+        h = hashlib.sha256()
+        base_done = self.done_bytes
+        try:
+            with open(src, "rb") as fin, open(tmp, "wb") as fout:
+                for chunk in iter(lambda: fin.read(CHUNK_SIZE), b""):
+                    h.update(chunk)
+                    fout.write(chunk)
+                    self.done_bytes += len(chunk)
+                fout.flush()
+                os.fsync(fout.fileno())
+        finally:
+            # The caller accounts for the whole file once it is verified
+            self.done_bytes = base_done
+        shutil.copystat(src, tmp)
+        os.replace(tmp, dst)
+
+        if os.path.getsize(dst) != size or _file_hash(dst) != h.hexdigest():
+            os.remove(dst)
+            raise IOError("verification failed")
+        return mtime
+
+    def _discard_copies(self, done):
+        """Remove the copies made so far and the journal, leaving dst_dir as it was."""
+        for rel in done:
+            if not os.path.exists(os.path.join(self.src_dir, rel)):
+                return  # An interrupted run already removed this source; the copy is all there is
+        for rel in done:
+            for path in (os.path.join(self.dst_dir, rel), os.path.join(self.dst_dir, rel) + ".part"):
+                if os.path.isfile(path):
+                    os.remove(path)
+        os.remove(self.journal_path)
+        self.restored = True
+
+    def progress(self):
+        """Return progress as a float between 0 and 1."""
+        if not self.total_bytes:
+            return 1.0 if self.finished else 0.0
+        return min(1.0, self.done_bytes / self.total_bytes)
+
+
+def pending_job(app_dir):
+    """Return a MigrationJob for an interrupted migration into app_dir, or None."""
+    journal_path = os.path.join(app_dir, JOURNAL_NAME)
+    if not os.path.exists(journal_path):
+        return None
+    try:
+        with open(journal_path, "r", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+    except (OSError, ValueError):
+        return None
+    src = header.get("src")
+    if not src or not os.path.isdir(src):
+        # Source is gone; nothing left to resume
+        os.remove(journal_path)
+        return None
+    return MigrationJob(src, header.get("dst", app_dir))
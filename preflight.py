@@ -0,0 +1,157 @@
+# preflight.py - Checks a whole campaign up front, before any SMTP connection is opened
+import os
+import re
+import collections
+from concurrent.futures import ThreadPoolExecutor
+
+import engine
+import progress
+import templating
+import suppression
+from langs import t
+
+MAX_WORKERS = 16
+
+# A {word} left over after rendering is most likely a misspelt variable
+LEFTOVER_VAR_RE = re.compile(r"\{[A-Za-z_]+\}")
+
+# Issue kinds. Errors make the delivery fail (engine.MailingEngine.deliver rejects them the
+# same way); warnings are sent but worth a look.
+ERROR_KINDS = ("no_email", "bad_address", "missing_file", "missing_template", "too_large")
+WARNING_KINDS = ("unknown_variable", "empty_subject", "empty_message", "duplicate", "suppressed")
+
+
+def stat_sizes(paths, workers=MAX_WORKERS):
+    """Return {path: size in bytes, or None if it can't be stat'ed}, one stat per path, in parallel."""
+    def size(path):
+        try:
+            return os.stat(path).st_size
+        except OSError:
+            return None
+    paths = list(paths)
+    if len(paths) < 2:
+        return {p: size(p) for p in paths}
+    with ThreadPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        return dict(zip(paths, pool.map(size, paths)))
+
+
+def resolve_attachments(paths, workers=MAX_WORKERS):
+    """Resolve attachment paths like engine.resolve_att_path, but stat each distinct file once.
+    Returns {path: (resolved path, size)}; size is None for missing files."""
+    found = stat_sizes(set(p for p in paths if p), workers)
+    relocated = {p: engine.relocated_att_path(p) for p, n in found.items() if n is None}
+    relocated_sizes = stat_sizes(set(r for r in relocated.values() if r), workers)
+    result = {}
+    for p, n in found.items():
+        r = relocated.get(p)
+        if n is None and r and relocated_sizes.get(r) is not None:
+            result[p] = (r, relocated_sizes[r])
+        else:
+            result[p] = (p, n)
+    return result
+
+
+class PreflightReport:
+    def __init__(self):
+        self.checked = 0
+        self.issues = []   # (kind, email, detail)
+        self.sizes = {}    # contact id -> estimated message size in bytes
+        self.largest = (0, "")
+
+    def add(self, kind, email, detail=""):
+        self.issues.append((kind, email, detail))
+
+    @property
+    def errors(self):
+        return [i for i in self.issues if i[0] in ERROR_KINDS]
+
+    @property
+    def warnings(self):
+        return [i for i in self.issues if i[0] in WARNING_KINDS]
+
+    def counts(self):
+        return collections.Counter(kind for kind, _, _ in self.issues)
+
+    @property
+    def total_bytes(self):
+        return sum(self.sizes.values())
+
+    def lines(self, per_kind=20):
+        """Human-readable report: a count per kind, then up to per_kind example rows each."""
+        out = []
+        by_kind = collections.defaultdict(list)
+        for kind, email, detail in self.issues:
+            by_kind[kind].append((email, detail))
+        for kind in ERROR_KINDS + WARNING_KINDS:
+            rows = by_kind.get(kind)
+            if not rows:
+                continue
+            level = t("preflight_error") if kind in ERROR_KINDS else t("preflight_warning")
+            out.append(f"[{level}] {t('preflight_' + kind)}: {len(rows)}")
+            for email, detail in rows[:per_kind]:
+                out.append(f"    {email or '-'}" + (f"  ({detail})" if detail else ""))
+            if len(rows) > per_kind:
+                out.append("    " + t("preflight_more", count=len(rows) - per_kind))
+        return out
+
+
+def check(mailer, workers=MAX_WORKERS):
+    """Validate every enabled contact of an engine.MailingEngine's campaign: addresses,
+    attachments (stat'ed once each, in parallel), templates and estimated message sizes
+    (against the server's SIZE limit, if one was seen before)."""
+    report = PreflightReport()
+    contacts = [c for c in mailer.contacts if c.get("enabled", True)]
+
+    def attachments_of(c):
+        legacy = c.get("attachment")
+        return c.get("attachments", [legacy] if legacy else [])
+
+    files = resolve_attachments((p for c in contacts for p in attachments_of(c)), workers)
+    seen = collections.Counter(suppression.normalize(c.get("email")) for c in contacts)
+    suppressed = mailer.data.suppression if mailer.data is not None else ()
+
+    for c in contacts:
+        report.checked += 1
+        email = (c.get("email") or "").strip()
+        if not email:
+            report.add("no_email", c.get("company", ""))
+            continue
+        if not engine.ADDRESS_RE.match(email):
+            report.add("bad_address", email)
+        elif email in suppressed:
+            report.add("suppressed", email)
+        if seen[suppression.normalize(email)] > 1:
+            report.add("duplicate", email)
+
+        att_sizes = []
+        for p in attachments_of(c):
+            if not p:
+                continue
+            _, size = files[p]
+            if size is None:
+                report.add("missing_file", email, os.path.basename(p))
+            else:
+                att_sizes.append(size)
+
+        tid = templating.missing_template(c, mailer.templates)
+        if tid:
+            report.add("missing_template", email, tid)
+        subject, body = templating.resolve(c, mailer.templates)
+        if not subject.strip():
+            report.add("empty_subject", email)
+        if not body.strip():
+            report.add("empty_message", email)
+        values = mailer.template_values(c)
+        subject = mailer.render(subject, values)
+        body = mailer.render(body, values)
+        leftovers = sorted(set(LEFTOVER_VAR_RE.findall(subject) + LEFTOVER_VAR_RE.findall(body)))
+        if leftovers:
+            report.add("unknown_variable", email, ", ".join(leftovers))
+
+        size = engine.estimate_message_size(subject, body, att_sizes)
+        report.sizes[c.get("id")] = size
+        if mailer.size_limit and size > mailer.size_limit:
+            report.add("too_large", email, f"{progress.format_bytes(size)} > {progress.format_bytes(mailer.size_limit)}")
+        if size > report.largest[0]:
+            report.largest = (size, email)
+    return report
@@ -0,0 +1,134 @@
+# profiling.py - Optional timing spans (and cProfile capture) for UI actions and campaigns
+import os
+import time
+import cProfile
+import datetime
+import functools
+import threading
+import contextlib
+import collections
+
+PROFILE_DIR_NAME = "profiles"
+RECENT_ACTIONS = 200     # Top-level spans kept for the "slowest actions" table
+CAPTURE_MIN_MS = 50      # Faster actions are timed but their cProfile output is not written
+MAX_PROFILE_FILES = 50   # Oldest .prof files are removed beyond this
+
+# Off by default; every wrapped call then costs one global lookup
+enabled = False
+_capture_dir = None
+
+_recent = collections.deque(maxlen=RECENT_ACTIONS)
+_nested = {}  # name -> [count, total_ms, max_ms] for spans inside another span (e.g. per-contact engine steps)
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def configure(on, capture_dir=None):
+    """Turn span recording on or off. With capture_dir, each top-level action is also run
+    under cProfile and actions slower than CAPTURE_MIN_MS are dumped there as .prof files."""
+    global enabled, _capture_dir
+    enabled = bool(on)
+    _capture_dir = capture_dir if on else None
+
+
+class _Span:
+    __slots__ = ("name", "depth", "start", "profiler")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.depth = getattr(_local, "depth", 0)
+        _local.depth = self.depth + 1
+        self.profiler = None
+        if _capture_dir and self.depth == 0:
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+                self.profiler = profiler
+            except ValueError:
+                pass  # Another thread's action is already being profiled (Python 3.12+ allows one)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        ms = (time.perf_counter() - self.start) * 1000
+        _local.depth = self.depth
+        if self.depth:
+            with _lock:
+                agg = _nested.setdefault(self.name, [0, 0.0, 0.0])
+                agg[0] += 1
+                agg[1] += ms
+                agg[2] = max(agg[2], ms)
+            return False
+        path = None
+        if self.profiler is not None:
+            self.profiler.disable()
+            if ms >= CAPTURE_MIN_MS:
+                path = _dump(self.profiler, self.name)
+        with _lock:
+            _recent.append({
+                "name": self.name,
+                "ms": round(ms, 1),
+                "at": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "thread": threading.current_thread().name,
+                "profile": path,
+            })
+        return False
+
+
+_NO_SPAN = contextlib.nullcontext()
+
+
+def span(name):
+    """Context manager timing a block as a named action (a no-op while profiling is off)."""
+    return _Span(name) if enabled else _NO_SPAN
+
+
+def profiled(name=None):
+    """Decorator: time every call of the function as an action named name (default: the function name)."""
+    def decorate(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            with _Span(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _dump(profiler, name):
+    try:
+        os.makedirs(_capture_dir, exist_ok=True)
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        path = os.path.join(_capture_dir, f"{stamp}_{name}.prof")
+        profiler.dump_stats(path)
+        old = sorted(f for f in os.listdir(_capture_dir) if f.endswith(".prof"))
+        for f in old[:-MAX_PROFILE_FILES]:
+            os.remove(os.path.join(_capture_dir, f))
+        return path
+    except OSError as e:
+        print(f"Failed to write profile: {e}")
+        return None
+
+
+def slowest(limit=20):
+    """Return the slowest recent top-level actions, slowest first."""
+    with _lock:
+        return sorted(_recent, key=lambda s: s["ms"], reverse=True)[:limit]
+
+
+def breakdown():
+    """Return [(name, count, avg_ms, max_ms)] for nested spans, by total time spent."""
+    with _lock:
+        rows = [(name, c, total / c, mx) for name, (c, total, mx) in _nested.items()]
+    return sorted(rows, key=lambda r: r[1] * r[2], reverse=True)
+
+
+def clear():
+    with _lock:
+        _recent.clear()
+        _nested.clear()
@@ -0,0 +1,96 @@
+# progress.py - Rolling campaign throughput and ETA, derived incrementally from engine status events
+import time
+import threading
+import collections
+
+WINDOW = 60  # Seconds of history behind the rolling rates
+FINAL_STATES = ("sent", "error", "skipped")  # "sending" and "retry" don't finish a contact
+
+
+class ThroughputTracker:
+    """Progress of one campaign. record() is called from the engine thread for each status event,
+    view() from the UI; both do amortized O(1) work regardless of the number of contacts.
+
+    bytes_total is a callable returning the bytes sent so far (e.g. from the engine's metrics).
+    """
+
+    def __init__(self, total, bytes_total=None, window=WINDOW, clock=time.monotonic):
+        self.total = total
+        self.bytes_total = bytes_total or (lambda: 0)
+        self.window = window
+        self.clock = clock
+        self.started = clock()
+        self.ended = None
+        self.done = 0
+        self.sent = 0
+        self.errors = 0
+        self.finished_times = collections.deque()  # Completion times inside the window
+        self.sent_times = collections.deque()
+        self.byte_samples = collections.deque()    # (time, bytes_total) taken at each view()
+        self.lock = threading.Lock()
+
+    def record(self, state, enabled=True):
+        """Count a status event. Disabled contacts are not part of the total and are ignored."""
+        if state not in FINAL_STATES or not enabled:
+            return
+        now = self.clock()
+        with self.lock:
+            self.done += 1
+            self.finished_times.append(now)
+            if state == "sent":
+                self.sent += 1
+                self.sent_times.append(now)
+            elif state == "error":
+                self.errors += 1
+
+    def finish(self):
+        with self.lock:
+            self.ended = self.clock()
+
+    def view(self):
+        """Return the current numbers: done, total, sent, errors, msgs_per_min, bytes_per_sec,
+        error_rate (0..1), eta_seconds (None if unknown), elapsed and finished."""
+        now = self.ended or self.clock()
+        sent_bytes = self.bytes_total()
+        cutoff = now - self.window
+        with self.lock:
+            self.byte_samples.append((now, sent_bytes))
+            for dq in (self.finished_times, self.sent_times):
+                while dq and dq[0] < cutoff:
+                    dq.popleft()
+            while len(self.byte_samples) > 1 and self.byte_samples[0][0] < cutoff:
+                self.byte_samples.popleft()
+
+            span = min(self.window, now - self.started)
+            first_time, first_bytes = self.byte_samples[0]
+            finish_rate = len(self.finished_times) / span if span > 0 else 0
+            remaining = max(0, self.total - self.done)
+            return {
+                "done": self.done,
+                "total": self.total,
+                "sent": self.sent,
+                "errors": self.errors,
+                "msgs_per_min": len(self.sent_times) * 60 / span if span > 0 else 0.0,
+                "bytes_per_sec": (sent_bytes - first_bytes) / (now - first_time) if now > first_time else 0.0,
+                "error_rate": self.errors / self.done if self.done else 0.0,
+                "eta_seconds": remaining / finish_rate if finish_rate else (0 if not remaining else None),
+                "elapsed": now - self.started,
+                "finished": self.ended is not None,
+            }
+
+
+def format_duration(seconds):
+    seconds = int(round(seconds))
+    if seconds >= 3600:
+        return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+def format_bytes(n):
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
@@ -0,0 +1,404 @@
+# reports.py - Storage for campaign send reports
+import os
+import json
+import zlib
+import sqlite3
+import contextlib
+import hashlib
+import datetime
+import threading
+
+PAGE_SIZE = 100
+SCHEMA_VERSION = 2
+
+
+class BlobStore:
+    """Content-addressed store for report message bodies.
+
+    Each distinct body is zlib-compressed once into <dir>/<hash[:2]>/<hash>.z;
+    deliveries keep only the hash, so a body sent to many recipients is stored once.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def _file(self, digest):
+        return os.path.join(self.path, digest[:2], digest + ".z")
+
+    def put(self, text):
+        """Store text (if new) and return its hash. Empty text is not stored and returns ""."""
+        if not text:
+            return ""
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._file(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(zlib.compress(data, 6))
+            os.replace(tmp, path)
+        return digest
+
+    def get(self, digest):
+        """Return the stored text for a hash, or None if it is missing."""
+        if not digest:
+            return None
+        try:
+            with open(self._file(digest), "rb") as f:
+                return zlib.decompress(f.read()).decode("utf-8")
+        except (OSError, zlib.error):
+            return None
+
+    def delete(self, digests):
+        """Delete the given blobs and return the number of bytes freed."""
+        freed = 0
+        for digest in digests:
+            path = self._file(digest)
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+                freed += size
+            except OSError:
+                pass
+        return freed
+
+    def size(self):
+        total = 0
+        for root, _dirs, files in os.walk(self.path):
+            for fname in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, fname))
+                except OSError:
+                    pass
+        return total
+
+    def prune(self, keep):
+        """Delete every blob whose hash is not in keep."""
+        if not os.path.isdir(self.path):
+            return
+        for root, _dirs, files in os.walk(self.path):
+            for fname in files:
+                if fname[:-2] not in keep:
+                    try:
+                        os.remove(os.path.join(root, fname))
+                    except OSError:
+                        pass
+
+
+def status_class(status):
+    """Map a delivery status message to "sent", "skipped" or "error"."""
+    if status == "Sent":
+        return "sent"
+    if "Skip" in status:
+        return "skipped"
+    return "error"
+
+
+def search_keys(email):
+    """Return the (email_key, domain) index keys for an address."""
+    email_key = (email or "").strip().lower()
+    return email_key, email_key.rpartition("@")[2]
+
+
+def _prefix_range(col, prefix):
+    """SQL condition matching values of col that start with prefix, usable by an index."""
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return f"({col} >= ? AND {col} < ?)", [prefix, upper]
+
+
+class ReportStore:
+    """SQLite store of send batches and their deliveries.
+
+    The batches table is the manifest (date and per-status counts) and is all the
+    Reports list reads; deliveries of a batch are only queried when it is opened.
+    Deliveries are appended by the mailing worker thread, so access is serialized.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.executescript(
+            "CREATE TABLE IF NOT EXISTS batches ("
+            " id INTEGER PRIMARY KEY, date TEXT NOT NULL,"
+            " sent INTEGER NOT NULL DEFAULT 0, error INTEGER NOT NULL DEFAULT 0,"
+            " skipped INTEGER NOT NULL DEFAULT 0, rollup TEXT);"
+            "CREATE TABLE IF NOT EXISTS deliveries ("
+            " id INTEGER PRIMARY KEY, batch_id INTEGER NOT NULL, email TEXT, subject TEXT,"
+            " status TEXT, message_hash TEXT, attachment TEXT);"
+        )
+        self._upgrade()
+        self.conn.executescript(
+            "CREATE INDEX IF NOT EXISTS idx_deliveries_batch ON deliveries(batch_id);"
+            "CREATE INDEX IF NOT EXISTS idx_deliveries_hash ON deliveries(message_hash);"
+            "CREATE INDEX IF NOT EXISTS idx_deliveries_class ON deliveries(status_class, id);"
+            "CREATE INDEX IF NOT EXISTS idx_deliveries_email ON deliveries(email_key);"
+            "CREATE INDEX IF NOT EXISTS idx_deliveries_domain ON deliveries(domain, id);"
+            "CREATE INDEX IF NOT EXISTS idx_deliveries_domain_class ON deliveries(domain, status_class, id);"
+        )
+        self.conn.commit()
+
+    def _upgrade(self):
+        """Add the search columns (date, status_class, email_key, domain) and batch rollups to older databases."""
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(deliveries)")}
+        batch_columns = {row[1] for row in self.conn.execute("PRAGMA table_info(batches)")}
+        with self.conn:
+            if "rollup" not in batch_columns:
+                self.conn.execute("ALTER TABLE batches ADD COLUMN rollup TEXT")
+            for col in ("date", "status_class", "email_key", "domain"):
+                if col not in columns:
+                    self.conn.execute(f"ALTER TABLE deliveries ADD COLUMN {col} TEXT")
+            rows = self.conn.execute(
+                "SELECT d.id, d.email, d.status, b.date FROM deliveries d JOIN batches b ON b.id = d.batch_id").fetchall()
+            self.conn.executemany(
+                "UPDATE deliveries SET date = ?, status_class = ?, email_key = ?, domain = ? WHERE id = ?",
+                [(date, status_class(status or ""), *search_keys(email), d_id) for d_id, email, status, date in rows])
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.execute("PRAGMA optimize")  # Refresh planner statistics for the search indexes
+            self.conn.close()
+            self.conn = None
+
+    def is_empty(self):
+        with self.lock:
+            return self.conn.execute("SELECT 1 FROM batches LIMIT 1").fetchone() is None
+
+    def start_batch(self, date):
+        """Create an empty batch and return its id."""
+        with self.lock, self.conn:
+            return self.conn.execute("INSERT INTO batches (date) VALUES (?)", (date,)).lastrowid
+
+    def _insert(self, batch_id, date, rep):
+        cls = status_class(rep.get("status", ""))
+        email = rep.get("email", "")
+        self.conn.execute(
+            "INSERT INTO deliveries (batch_id, email, subject, status, message_hash, attachment,"
+            " date, status_class, email_key, domain) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (batch_id, email, rep.get("subject", ""), rep.get("status", ""),
+             rep.get("message_hash", ""), rep.get("attachment", ""), date, cls, *search_keys(email)))
+        self.conn.execute(f"UPDATE batches SET {cls} = {cls} + 1 WHERE id = ?", (batch_id,))
+
+    @contextlib.contextmanager
+    def _write(self):
+        """A write transaction that holds SQLite's write lock from the start, so blob files and the
+        rows referencing them change together, also across processes (e.g. a campaign process)."""
+        with self.lock, self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            yield
+
+    def add_delivery(self, batch_id, rep, body="", blobs=None):
+        """Append a delivery. With blobs, body is stored there and its hash recorded in the same
+        write transaction, so retention can't delete the blob in between."""
+        with self._write():
+            if blobs is not None:
+                rep = dict(rep, message_hash=blobs.put(body))
+            date = self.conn.execute("SELECT date FROM batches WHERE id = ?", (batch_id,)).fetchone()[0]
+            self._insert(batch_id, date, rep)
+
+    def batches(self):
+        """Return manifest rows (newest first) of batches that have at least one delivery."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT id, date, sent, error, skipped, rollup IS NOT NULL FROM batches"
+                " WHERE sent + error + skipped > 0 ORDER BY id DESC").fetchall()
+        return [{"id": r[0], "date": r[1], "sent": r[2], "error": r[3], "skipped": r[4],
+                 "total": r[2] + r[3] + r[4], "rolled_up": bool(r[5])} for r in rows]
+
+    def rollup(self, batch_id):
+        """Return {domain: {status_class: count}} of a compacted batch, or None."""
+        with self.lock:
+            row = self.conn.execute("SELECT rollup FROM batches WHERE id = ?", (batch_id,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def deliveries(self, batch_id):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT email, subject, status, message_hash, attachment FROM deliveries"
+                " WHERE batch_id = ? ORDER BY id", (batch_id,)).fetchall()
+        return [dict(zip(("email", "subject", "status", "message_hash", "attachment"), r)) for r in rows]
+
+    def search(self, text="", status=None, date_from=None, date_to=None, before=None, limit=PAGE_SIZE):
+        """Return up to limit deliveries matching the filters, newest first.
+
+        text is an email prefix ("john", "john@ex") or a domain ("@example.com";
+        "example.com" matches the domain or an email prefix). status is a
+        status_class(); date_from / date_to are inclusive "YYYY-MM-DD" strings.
+        Pass the last returned "id" as before to get the next page.
+        """
+        conds, params = [], []
+        if status:
+            conds.append("status_class = ?")
+            params.append(status)
+        if date_from or date_to:
+            bounds = self._id_bounds(date_from, date_to)
+            if bounds is None:
+                return []
+            conds.append("id BETWEEN ? AND ? AND date >= ? AND date <= ?")
+            params += bounds + [date_from or "", (date_to or "9999-12-31") + " 23:59:59"]
+
+        # Each text match runs as its own query so it can walk a single index.
+        # Email prefix ranges are not in id order, so "+id" keeps SQLite from
+        # trading the email index for a primary key scan when paging.
+        text = (text or "").strip().lower()
+        if not text:
+            text_conds = [("", [], "id")]
+        elif text.startswith("@"):
+            text_conds = [("domain = ?", [text[1:]], "id")]
+        elif "@" in text:
+            text_conds = [_prefix_range("email_key", text) + ("+id",)]
+        elif "." in text:
+            text_conds = [("domain = ?", [text], "id"), _prefix_range("email_key", text) + ("+id",)]
+        else:
+            text_conds = [_prefix_range("email_key", text) + ("+id",)]
+
+        rows = []
+        with self.lock:
+            for text_cond, text_params, id_col in text_conds:
+                where = ([text_cond] if text_cond else []) + conds
+                page_params = []
+                if before is not None:
+                    where.append(f"{id_col} < ?")
+                    page_params.append(before)
+                rows += self.conn.execute(
+                    "SELECT id, email, subject, status, message_hash, attachment, date FROM deliveries"
+                    + (" WHERE " + " AND ".join(where) if where else "")
+                    + " ORDER BY id DESC LIMIT ?", text_params + params + page_params + [limit]).fetchall()
+        if len(text_conds) > 1:
+            rows = sorted(set(rows), reverse=True)[:limit]
+        return [dict(zip(("id", "email", "subject", "status", "message_hash", "attachment", "date"), r)) for r in rows]
+
+    def _id_bounds(self, date_from, date_to):
+        """Return the [first, last] delivery id range of batches dated within the range, or None.
+
+        Batches run one at a time, so batch ids follow their dates and each batch's
+        deliveries occupy a contiguous id range; a date filter becomes a primary key range.
+        """
+        lo = date_from or ""
+        hi = (date_to or "9999-12-31") + " 23:59:59"
+        with self.lock:
+            first_batch, last_batch = self.conn.execute(
+                "SELECT MIN(id), MAX(id) FROM batches WHERE date >= ? AND date <= ?", (lo, hi)).fetchone()
+            if first_batch is None:
+                return None
+            first = self.conn.execute(
+                "SELECT id FROM deliveries WHERE batch_id >= ? ORDER BY batch_id, id LIMIT 1", (first_batch,)).fetchone()
+            last = self.conn.execute(
+                "SELECT id FROM deliveries WHERE batch_id <= ? ORDER BY batch_id DESC, id DESC LIMIT 1", (last_batch,)).fetchone()
+        if first is None or last is None or first[0] > last[0]:
+            return None
+        return [first[0], last[0]]
+
+    def _delete_deliveries(self, batch_id):
+        """Delete a batch's delivery rows; returns the message hashes no other delivery references any more."""
+        hashes = {h for (h,) in self.conn.execute(
+            "SELECT DISTINCT message_hash FROM deliveries WHERE batch_id = ?", (batch_id,))} - {None, ""}
+        self.conn.execute("DELETE FROM deliveries WHERE batch_id = ?", (batch_id,))
+        return {h for h in hashes
+                if self.conn.execute("SELECT 1 FROM deliveries WHERE message_hash = ? LIMIT 1", (h,)).fetchone() is None}
+
+    def delete_batch(self, batch_id, blobs):
+        """Delete one batch and the blobs no other delivery references any more; returns the bytes freed."""
+        with self._write():
+            freed = blobs.delete(self._delete_deliveries(batch_id))
+            self.conn.execute("DELETE FROM batches WHERE id = ?", (batch_id,))
+            return freed
+
+    def compact_batch(self, batch_id, blobs):
+        """Replace a batch's deliveries with per-domain status counts and delete the blobs
+        no other delivery references any more. Returns the bytes freed."""
+        with self._write():
+            rollup = {}
+            for domain, cls, count in self.conn.execute(
+                    "SELECT domain, status_class, COUNT(*) FROM deliveries WHERE batch_id = ? GROUP BY domain, status_class",
+                    (batch_id,)):
+                rollup.setdefault(domain or "", {})[cls] = count
+            self.conn.execute("UPDATE batches SET rollup = ? WHERE id = ?", (json.dumps(rollup), batch_id))
+            # Unlinked before the commit: an add_delivery() storing the same body waits for it and rewrites the file
+            return blobs.delete(self._delete_deliveries(batch_id))
+
+    def detailed_batches(self, before_date=None):
+        """Ids of batches that still have per-delivery detail, oldest first, excluding the newest batch
+        (it may still be receiving deliveries). before_date limits them to older batches."""
+        with self.lock:
+            newest = self.conn.execute("SELECT MAX(id) FROM batches").fetchone()[0]
+            rows = self.conn.execute(
+                "SELECT id FROM batches WHERE rollup IS NULL AND id < ? AND date < ? ORDER BY id",
+                (newest or 0, before_date or "9999")).fetchall()
+        return [r[0] for r in rows]
+
+    def live_bytes(self):
+        """Bytes of database pages in use (freed pages are reused, so this is what the data grows by)."""
+        with self.lock:
+            page_size = self.conn.execute("PRAGMA page_size").fetchone()[0]
+            pages = self.conn.execute("PRAGMA page_count").fetchone()[0]
+            free = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return (pages - free) * page_size
+
+    def clear(self, blobs):
+        """Delete every batch and every stored body."""
+        with self._write():
+            self.conn.execute("DELETE FROM deliveries")
+            self.conn.execute("DELETE FROM batches")
+            blobs.prune(set())
+
+    def import_runs(self, runs, blobs):
+        """Import the run list of a legacy reports.json file."""
+        with self._write():
+            for run in runs:
+                date = run.get("date", "")
+                batch_id = self.conn.execute("INSERT INTO batches (date) VALUES (?)", (date,)).lastrowid
+                for rep in run.get("deliveries", []):
+                    if rep.get("status") == "Skipped (Disabled)":
+                        continue
+                    if "message" in rep:
+                        rep["message_hash"] = blobs.put(rep.pop("message"))
+                    self._insert(batch_id, date, rep)
+
+
+def apply_retention(store, blobs, max_age_days=0, max_bytes=0):
+    """Compact old batches into rollups.
+
+    Batches older than max_age_days are compacted first; then, oldest first, more
+    batches until the database plus blob store fit in max_bytes. 0 disables a limit.
+    Returns the number of batches compacted.
+    """
+    compacted = 0
+    if max_age_days:
+        cutoff = (datetime.datetime.now() - datetime.timedelta(days=max_age_days)).strftime("%Y-%m-%d %H:%M:%S")
+        for batch_id in store.detailed_batches(before_date=cutoff):
+            store.compact_batch(batch_id, blobs)
+            compacted += 1
+    if max_bytes:
+        blob_bytes = blobs.size()
+        for batch_id in store.detailed_batches():
+            if store.live_bytes() + blob_bytes <= max_bytes:
+                break
+            blob_bytes -= store.compact_batch(batch_id, blobs)
+            compacted += 1
+    return compacted
+
+
+def import_legacy_file(path, store, blobs):
+    """Move a legacy reports.json into the store and remove it. Only runs on an empty store."""
+    if not os.path.exists(path) or not store.is_empty():
+        return
+    try:
+        with open(path, "r") as f:
+            runs = json.load(f)
+    except Exception as e:
+        print(f"Error loading reports: {e}")
+        return
+    store.import_runs(runs, blobs)
+    os.remove(path)
+
+
+def message_of(rep, blobs):
+    """Return the message body of a delivery record, loading it from the blob store if needed."""
+    if "message" in rep:
+        return rep["message"]
+    return blobs.get(rep.get("message_hash"))
@@ -0,0 +1,89 @@
+# retry.py - SMTP failure classification and the persistent retry queue
+import os
+import json
+import time
+import smtplib
+
+# Backoff for transient failures: BASE_DELAY * 2^(attempt - 1), capped at MAX_DELAY
+BASE_DELAY = 30
+MAX_DELAY = 15 * 60
+MAX_ATTEMPTS = 5
+
+
+def classify(exc):
+    """Return (transient, code, message) for an exception raised while sending.
+
+    4xx replies are transient, 5xx are permanent. Dropped connections and socket
+    errors have no reply code and are treated as transient.
+    """
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        # One recipient per message: take its (code, message) pair
+        code, msg = next(iter(exc.recipients.values()), (None, b""))
+    elif isinstance(exc, smtplib.SMTPResponseException):
+        code, msg = exc.smtp_code, exc.smtp_error
+    elif isinstance(exc, (smtplib.SMTPServerDisconnected, OSError)):
+        return True, None, str(exc)
+    else:
+        return False, None, str(exc)
+    if isinstance(msg, bytes):
+        msg = msg.decode("utf-8", "replace")
+    return 400 <= (code or 0) < 500, code, msg
+
+
+def backoff(attempts):
+    """Seconds to wait before the next try after the given number of failed attempts."""
+    return min(MAX_DELAY, BASE_DELAY * 2 ** (attempts - 1))
+
+
+class RetryQueue:
+    """Contacts whose delivery failed transiently, saved to a JSON file so they survive a restart.
+
+    Entries: {"contact_id", "email", "attempts", "next_at" (epoch seconds), "code", "error"}.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.entries = {e["contact_id"]: e for e in json.load(f)}
+            except Exception as e:
+                print(f"Error loading retry queue: {e}")
+
+    def __len__(self):
+        return len(self.entries)
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(list(self.entries.values()), f, indent=4)
+        os.replace(tmp, self.path)
+
+    def schedule(self, contact_id, email, code, error):
+        """Record a transient failure. Returns the entry, or None once MAX_ATTEMPTS is reached
+        (the entry is dropped and the failure should be treated as final)."""
+        entry = self.entries.get(contact_id) or {"contact_id": contact_id, "email": email, "attempts": 0}
+        entry["attempts"] += 1
+        entry.update(code=code, error=error)
+        if entry["attempts"] >= MAX_ATTEMPTS:
+            self.entries.pop(contact_id, None)
+            self.save()
+            return None
+        entry["next_at"] = time.time() + backoff(entry["attempts"])
+        self.entries[contact_id] = entry
+        self.save()
+        return entry
+
+    def clear(self):
+        if self.entries:
+            self.entries = {}
+            self.save()
+
+    def remove(self, contact_id):
+        if self.entries.pop(contact_id, None) is not None:
+            self.save()
+
+    def next_due(self):
+        """Return the entry with the earliest next_at, or None if the queue is empty."""
+        return min(self.entries.values(), key=lambda e: e["next_at"], default=None)
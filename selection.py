@@ -0,0 +1,68 @@
+# selection.py - Contact selection model keyed by contact ID
+class SelectionModel:
+    """Tracks selected contact IDs and the current visible row order.
+
+    Every mutating method returns the set of IDs whose selected state changed,
+    so the UI only restyles those rows.
+    """
+
+    def __init__(self):
+        self.selected = set()
+        self.anchor = None  # Last clicked ID, start of shift-click ranges
+        self.order = []     # Visible contact IDs, top to bottom
+        self.index = {}     # ID -> position in order
+
+    def set_order(self, ids):
+        """Set the visible order after the list has been filtered or re-sorted."""
+        self.order = list(ids)
+        self.index = {c_id: i for i, c_id in enumerate(self.order)}
+
+    def __contains__(self, c_id):
+        return c_id in self.selected
+
+    def __len__(self):
+        return len(self.selected)
+
+    def _replace(self, new_selected):
+        changed = self.selected ^ new_selected
+        self.selected = new_selected
+        return changed
+
+    def select_only(self, c_id):
+        self.anchor = c_id
+        return self._replace({c_id})
+
+    def toggle(self, c_id):
+        self.anchor = c_id
+        if c_id in self.selected:
+            self.selected.discard(c_id)
+        else:
+            self.selected.add(c_id)
+        return {c_id}
+
+    def select_range(self, c_id):
+        """Select every visible row between the anchor and c_id (inclusive)."""
+        start = self.index.get(self.anchor)
+        end = self.index.get(c_id)
+        if start is None or end is None:
+            return self.select_only(c_id)
+        if start > end:
+            start, end = end, start
+        return self._replace(set(self.order[start:end + 1]))
+
+    def clear(self):
+        self.anchor = None
+        return self._replace(set())
+
+    def discard(self, ids):
+        """Forget IDs that no longer exist (e.g. deleted contacts)."""
+        ids = set(ids)
+        self.selected -= ids
+        if self.anchor in ids:
+            self.anchor = None
+
+    def ordered(self):
+        """Selected IDs in visible order; hidden selected rows follow at the end."""
+        visible = sorted((c_id for c_id in self.selected if c_id in self.index), key=self.index.__getitem__)
+        hidden = [c_id for c_id in self.selected if c_id not in self.index]
+        return visible + hidden
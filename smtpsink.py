@@ -0,0 +1,113 @@
+# smtpsink.py - Local SMTP server that accepts and discards mail (used by bench.py)
+import time
+import base64
+import threading
+import socketserver
+
+
+class _SinkHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough ESMTP for smtplib: EHLO, AUTH, MAIL, RCPT, DATA, RSET, NOOP, QUIT.
+    Every login is accepted and every message is discarded after the server's latency."""
+
+    def reply(self, line):
+        self.wfile.write((line + "\r\n").encode("ascii"))
+
+    def handle(self):
+        sink = self.server.sink
+        self.reply("220 localhost MailFlow sink ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            verb = line.decode("ascii", "replace").strip().split(" ", 1)[0].upper()
+            if verb in ("EHLO", "HELO"):
+                self.wfile.write(b"250-localhost\r\n250-8BITMIME\r\n250-AUTH PLAIN LOGIN\r\n")
+                self.reply(f"250 SIZE {sink.max_size}" if sink.max_size else "250 HELP")
+            elif verb == "AUTH":
+                args = line.decode("ascii", "replace").split()
+                if len(args) >= 2 and args[1].upper() == "LOGIN":
+                    # smtplib sends the username with the command and the password on request
+                    if len(args) < 3:
+                        self.reply("334 " + base64.b64encode(b"Username:").decode())
+                        self.rfile.readline()
+                    self.reply("334 " + base64.b64encode(b"Password:").decode())
+                    self.rfile.readline()
+                self.reply("235 Authentication successful")
+            elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                size = 0
+                for chunk in self.rfile:
+                    if chunk in (b".\r\n", b".\n"):
+                        break
+                    size += len(chunk)
+                if sink.latency:
+                    time.sleep(sink.latency)
+                sink.record(size)
+                self.reply("250 OK queued")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class SmtpSink:
+    """Threaded SMTP sink on 127.0.0.1. latency is the delay (seconds) before each message is
+    acknowledged; max_size, if set, is advertised as the ESMTP SIZE limit."""
+
+    def __init__(self, port=0, latency=0.0, max_size=0):
+        self.latency = latency
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.messages = 0
+        self.bytes = 0
+        self.server = _Server(("127.0.0.1", port), _SinkHandler)
+        self.server.sink = self
+        self.port = self.server.server_address[1]
+        self.thread = None
+
+    def record(self, size):
+        with self.lock:
+            self.messages += 1
+            self.bytes += size
+
+    def reset(self):
+        with self.lock:
+            self.messages = 0
+            self.bytes = 0
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Local SMTP sink that accepts and discards all mail")
+    parser.add_argument("--port", type=int, default=2525)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay before each message is acknowledged")
+    args = parser.parse_args()
+    sink = SmtpSink(args.port, args.latency_ms / 1000)
+    print(f"SMTP sink listening on 127.0.0.1:{sink.port} (Ctrl+C to stop)")
+    try:
+        sink.server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n{sink.messages} message(s), {sink.bytes} bytes received")
@@ -0,0 +1,157 @@
+# stallwatch.py - Detects stalls of the Tk main loop and logs where the main thread was blocked
+import os
+import sys
+import json
+import time
+import datetime
+import threading
+import traceback
+
+STALL_LOG_NAME = "stalls.log"
+LATENCY_FILE_NAME = "loop_latency.json"
+MAX_LOG_BYTES = 1024 * 1024  # stalls.log is rotated to stalls.log.1 beyond this
+HISTOGRAM_SAVE_INTERVAL = 60  # Seconds between histogram snapshots
+
+# Upper bounds (ms) of the heartbeat lag buckets; the last bucket is open-ended
+LAG_BUCKETS = [16, 33, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+def bucket_label(i):
+    if i == 0:
+        return f"<{LAG_BUCKETS[0]}"
+    if i == len(LAG_BUCKETS):
+        return f">={LAG_BUCKETS[-1]}"
+    return f"{LAG_BUCKETS[i - 1]}-{LAG_BUCKETS[i]}"
+
+
+class StallWatchdog:
+    """Schedules after() heartbeats on the Tk root and measures how late each one runs.
+
+    A helper thread watches the time since the last heartbeat. Once it passes threshold_ms
+    the main thread's stack is written to the stall log, and sampled again each time the
+    stall doubles in length, so a long freeze shows where the time went. log_dir is a
+    callable returning the current data folder.
+    """
+
+    def __init__(self, root, log_dir, interval_ms=100, threshold_ms=500):
+        self.root = root
+        self.log_dir = log_dir
+        self.interval_ms = interval_ms
+        self.threshold_ms = threshold_ms
+        self.counts = [0] * (len(LAG_BUCKETS) + 1)
+        self.beats = 0
+        self.stalls = 0
+        self.max_lag_ms = 0.0
+        self.since = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.main_ident = threading.main_thread().ident
+        self.last_beat = time.perf_counter()
+        self.next_sample_ms = threshold_ms  # Stall length at which the stack is sampled next
+        self.stall_reported = False
+        self.running = False
+        self.lock = threading.Lock()
+
+    # --- Main thread ---
+
+    def start(self):
+        if self.running or self.threshold_ms <= 0:
+            return
+        self.running = True
+        self.last_beat = time.perf_counter()
+        self.root.after(self.interval_ms, self._beat)
+        threading.Thread(target=self._watch, name="stall-watchdog", daemon=True).start()
+
+    def stop(self):
+        self.running = False
+        self.save_histogram()
+
+    def _beat(self):
+        if not self.running:
+            return
+        now = time.perf_counter()
+        lag_ms = max(0.0, (now - self.last_beat) * 1000 - self.interval_ms)
+        with self.lock:
+            self.last_beat = now
+            self.beats += 1
+            self.counts[self._bucket(lag_ms)] += 1
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+            ended = self.stall_reported
+            self.stall_reported = False
+            self.next_sample_ms = self.threshold_ms
+        if ended:
+            # Written from the helper thread so the main loop never waits on the disk
+            threading.Thread(target=self._write, args=(f"--- main loop resumed after {lag_ms + self.interval_ms:.0f} ms\n\n",), daemon=True).start()
+        self.root.after(self.interval_ms, self._beat)
+
+    @staticmethod
+    def _bucket(lag_ms):
+        for i, bound in enumerate(LAG_BUCKETS):
+            if lag_ms < bound:
+                return i
+        return len(LAG_BUCKETS)
+
+    # --- Helper thread ---
+
+    def _watch(self):
+        poll = max(0.02, self.interval_ms / 2000)
+        last_save = time.monotonic()
+        while self.running:
+            time.sleep(poll)
+            with self.lock:
+                stalled_ms = (time.perf_counter() - self.last_beat) * 1000 - self.interval_ms
+                sample = stalled_ms >= self.next_sample_ms
+                if sample:
+                    first = not self.stall_reported
+                    self.stall_reported = True
+                    self.next_sample_ms *= 2
+                    if first:
+                        self.stalls += 1
+            if sample:
+                self._log_stack(stalled_ms, first)
+            if time.monotonic() - last_save >= HISTOGRAM_SAVE_INTERVAL:
+                self.save_histogram()
+                last_save = time.monotonic()
+
+    def _log_stack(self, stalled_ms, first):
+        frame = sys._current_frames().get(self.main_ident)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else "  (main thread stack unavailable)\n"
+        stamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        title = "main loop stalled" if first else "still stalled"
+        self._write(f"=== {stamp}  {title} for {stalled_ms:.0f} ms ===\n{stack}")
+        if first:
+            self.save_histogram()
+
+    def _write(self, text):
+        path = os.path.join(self.log_dir(), STALL_LOG_NAME)
+        try:
+            if os.path.exists(path) and os.path.getsize(path) > MAX_LOG_BYTES:
+                os.replace(path, path + ".1")
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(text)
+        except OSError as e:
+            print(f"Failed to write stall log: {e}")
+
+    # --- Histogram ---
+
+    def histogram(self):
+        with self.lock:
+            return {
+                "since": self.since,
+                "interval_ms": self.interval_ms,
+                "threshold_ms": self.threshold_ms,
+                "beats": self.beats,
+                "stalls": self.stalls,
+                "max_lag_ms": round(self.max_lag_ms, 1),
+                "lag_ms": {bucket_label(i): n for i, n in enumerate(self.counts)},
+            }
+
+    def save_histogram(self):
+        if not self.beats:
+            return
+        path = os.path.join(self.log_dir(), LATENCY_FILE_NAME)
+        try:
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.histogram(), f, indent=4)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Failed to write loop latency histogram: {e}")
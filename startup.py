@@ -0,0 +1,55 @@
+# startup.py - Cold start timing breakdown (imports, config load, view build, first paint)
+import os
+import json
+import time
+import datetime
+import contextlib
+
+_T0 = time.perf_counter()
+_last = _T0
+
+# Phase name -> milliseconds
+TIMINGS = {}
+
+STARTUP_LOG_NAME = "startup_times.jsonl"
+
+
+def mark(name):
+    """Record the time elapsed since the previous mark under the given phase name."""
+    global _last
+    now = time.perf_counter()
+    TIMINGS[name] = round((now - _last) * 1000, 1)
+    _last = now
+
+
+@contextlib.contextmanager
+def phase(name):
+    """Time a block of code as a named phase."""
+    global _last
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _last = time.perf_counter()
+        TIMINGS[name] = round((_last - start) * 1000, 1)
+
+
+def elapsed_ms():
+    """Milliseconds since this module was first imported."""
+    return round((time.perf_counter() - _T0) * 1000, 1)
+
+
+def write_report(app_dir, version):
+    """Append this start's timings to the startup log so cold start can be compared across releases."""
+    record = {
+        "date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "version": version,
+        "total_ms": elapsed_ms(),
+        "phases": dict(TIMINGS),
+    }
+    try:
+        with open(os.path.join(app_dir, STARTUP_LOG_NAME), "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+    except OSError as e:
+        print(f"Failed to write startup timings: {e}")
+    return record
@@ -0,0 +1,77 @@
+# store.py - Per-record contact storage with sortable rank keys
+import json
+import sqlite3
+
+# Spacing between consecutive ranks; inserts take the midpoint until a gap is exhausted
+RANK_GAP = 1 << 20
+
+
+def ranks_between(lo, hi, count):
+    """Return count increasing integer ranks strictly between lo and hi, or None if there is no room.
+    lo / hi may be None for the start / end of the list."""
+    if lo is None and hi is None:
+        return [RANK_GAP * (i + 1) for i in range(count)]
+    if lo is None:
+        return [hi - RANK_GAP * (count - i) for i in range(count)]
+    if hi is None:
+        return [lo + RANK_GAP * (i + 1) for i in range(count)]
+    step = (hi - lo) // (count + 1)
+    if step < 1:
+        return None
+    return [lo + step * (i + 1) for i in range(count)]
+
+
+class ContactStore:
+    """SQLite table of contacts, one row per contact, ordered by an integer rank.
+
+    Contacts are plain dicts; the rank is kept in contact["rank"] in memory and
+    in its own indexed column on disk. Writes only touch the rows passed in.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS contacts ("
+            "id INTEGER PRIMARY KEY, rank INTEGER NOT NULL, data TEXT NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_contacts_rank ON contacts(rank)")
+        self.conn.commit()
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def is_empty(self):
+        return self.conn.execute("SELECT 1 FROM contacts LIMIT 1").fetchone() is None
+
+    def load_all(self):
+        """Return every contact dict in rank order."""
+        contacts = []
+        for rank, data in self.conn.execute("SELECT rank, data FROM contacts ORDER BY rank, id"):
+            c = json.loads(data)
+            c["rank"] = rank
+            contacts.append(c)
+        return contacts
+
+    @staticmethod
+    def _row(c):
+        data = {k: v for k, v in c.items() if k != "rank" and not k.startswith("_")}
+        return (c["id"], c["rank"], json.dumps(data))
+
+    def upsert(self, contacts):
+        """Insert or replace the given contacts (each needs "id" and "rank")."""
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO contacts (id, rank, data) VALUES (?, ?, ?)",
+                                  [self._row(c) for c in contacts])
+
+    def delete(self, ids):
+        with self.conn:
+            self.conn.executemany("DELETE FROM contacts WHERE id = ?", [(c_id,) for c_id in ids])
+
+    def rebalance(self, contacts):
+        """Re-space ranks evenly for contacts in their current order and rewrite them all."""
+        for i, c in enumerate(contacts):
+            c["rank"] = RANK_GAP * (i + 1)
+        self.upsert(contacts)
@@ -0,0 +1,40 @@
+# styles.py - Shared fonts and colors for list rows
+import customtkinter as ctk
+
+# Text colors for enabled / disabled contact rows (light, dark)
+ROW_TEXT_COLOR = ("gray10", "#DCE4EE")
+ROW_DISABLED_TEXT_COLOR = "gray50"
+
+# Favorite star button
+STAR_ON = ("⭐️", "gold")
+STAR_OFF = ("☆", "gray")
+
+_FONT_SPECS = {
+    "row": {"overstrike": False, "slant": "roman"},
+    "row_disabled": {"overstrike": True, "slant": "italic"},
+    "star": {"size": 18},
+    "bold": {"weight": "bold"},
+}
+
+# Every CTkFont is a Tk named font, so rows share one instance per variant
+_fonts = {}
+
+
+def font(name):
+    """Return the shared CTkFont for a named variant, created on first use (needs a Tk root)."""
+    f = _fonts.get(name)
+    if f is None:
+        f = _fonts[name] = ctk.CTkFont(**_FONT_SPECS[name])
+    return f
+
+
+def row_style(enabled):
+    """Return (font, text_color) for a contact row label."""
+    if enabled:
+        return font("row"), ROW_TEXT_COLOR
+    return font("row_disabled"), ROW_DISABLED_TEXT_COLOR
+
+
+def star_style(favorite):
+    """Return (text, text_color) for the favorite star button."""
+    return STAR_ON if favorite else STAR_OFF
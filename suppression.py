@@ -0,0 +1,83 @@
+# suppression.py - Addresses that permanently rejected mail and are skipped on later sends
+import csv
+import sqlite3
+import datetime
+import threading
+
+# Permanent reply codes that are about the mailbox itself, not the message
+# (552 size / 554 content rejections don't mean the address is bad)
+ADDRESS_CODES = {550, 551, 553}
+
+
+def normalize(address):
+    return (address or "").strip().lower()
+
+
+class SuppressionList:
+    """Suppressed addresses, kept in SQLite and mirrored in an in-memory set for O(1) checks."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS suppressed ("
+            "address TEXT PRIMARY KEY, code INTEGER, reason TEXT, added TEXT) WITHOUT ROWID"
+        )
+        self.conn.commit()
+        self.addresses = {a for (a,) in self.conn.execute("SELECT address FROM suppressed")}
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def __len__(self):
+        return len(self.addresses)
+
+    def __contains__(self, address):
+        return normalize(address) in self.addresses
+
+    def add_many(self, rows):
+        """Add (address, code, reason) rows; returns how many addresses were new."""
+        added = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        new = [(normalize(a), code, reason, added) for a, code, reason in rows
+               if normalize(a) and normalize(a) not in self.addresses]
+        if new:
+            with self.lock, self.conn:
+                self.conn.executemany("INSERT OR IGNORE INTO suppressed VALUES (?, ?, ?, ?)", new)
+            self.addresses.update(r[0] for r in new)
+        return len({r[0] for r in new})
+
+    def add(self, address, code=None, reason=""):
+        return self.add_many([(address, code, reason)]) > 0
+
+    def clear(self):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM suppressed")
+        self.addresses = set()
+
+    def import_file(self, path):
+        """Import addresses from a CSV (an "email"/"address" column, or the first column) or a plain list.
+        Returns the number of new addresses."""
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            rows = [r for r in csv.reader(f) if r]
+        if not rows:
+            return 0
+        header = [h.strip().lower() for h in rows[0]]
+        col = next((header.index(k) for k in ("email", "address", "e-mail", "mail") if k in header), None)
+        if col is None:
+            col = 0
+        else:
+            rows = rows[1:]
+        return self.add_many((r[col], None, "imported") for r in rows if len(r) > col and "@" in r[col])
+
+    def export_file(self, path):
+        """Write the list as CSV (address, code, reason, added). Returns the number of rows."""
+        with self.lock:
+            rows = self.conn.execute("SELECT address, code, reason, added FROM suppressed ORDER BY address").fetchall()
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["address", "code", "reason", "added"])
+            writer.writerows(rows)
+        return len(rows)
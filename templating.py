@@ -0,0 +1,54 @@
+# templating.py - Shared message templates and {variable} rendering
+import re
+
+TEMPLATE_VARS = ["{company_name}", "{email}", "{email_prefix}", "{date}", "{time}", "{signature}"]
+
+_VAR_RE = re.compile("(" + "|".join(re.escape(v) for v in TEMPLATE_VARS) + ")")
+
+
+def resolve(contact, templates):
+    """Return (subject, message) for a contact.
+
+    A contact may reference a shared template by "template_id"; its own non-empty
+    subject / message override the template's.
+    """
+    tpl = templates.get(contact.get("template_id") or "", {})
+    subject = contact.get("subject") or tpl.get("subject", "")
+    message = contact.get("message") or tpl.get("message", "")
+    return subject, message
+
+
+def missing_template(contact, templates):
+    """Return the template id a contact references if that template is gone and the
+    contact has no subject and message of its own to fall back on, else None."""
+    tid = contact.get("template_id")
+    if tid and tid not in templates and not (contact.get("subject") and contact.get("message")):
+        return tid
+    return None
+
+
+def compile_text(text):
+    """Split text into literal and variable parts once, so rendering is a single join."""
+    return _VAR_RE.split(text)
+
+
+def render(parts, values):
+    """Render compiled parts; odd indexes are variable names."""
+    return "".join(values.get(p, p) if i % 2 else p for i, p in enumerate(parts))
+
+
+class Renderer:
+    """Compiles each distinct subject / body text once per run and renders it per recipient."""
+
+    def __init__(self):
+        self._compiled = {}
+
+    def __call__(self, text, values):
+        parts = self._compiled.get(text)
+        if parts is None:
+            parts = self._compiled[text] = compile_text(text)
+        return render(parts, values)
+
+
+def new_template_id(templates):
+    return str(max((int(k) for k in templates if k.isdigit()), default=0) + 1)
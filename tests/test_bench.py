@@ -0,0 +1,55 @@
+# test_bench.py - The benchmark suite's SMTP sink and a small end-to-end run
+import json
+import time
+import smtplib
+from email.message import EmailMessage
+
+import bench
+import config
+import smtpsink
+
+
+def send(port, body, user="u", password="p"):
+    msg = EmailMessage()
+    msg["From"], msg["To"], msg["Subject"] = "a@x.com", "b@x.com", "Hi"
+    msg.set_content(body)
+    with smtplib.SMTP("127.0.0.1", port) as smtp:
+        smtp.login(user, password)
+        smtp.send_message(msg)
+        return smtp.esmtp_features
+
+
+def test_sink_accepts_logins_and_counts_messages():
+    with smtpsink.SmtpSink() as sink:
+        features = send(sink.port, "x" * 1000)
+        send(sink.port, "short")
+        assert "size" not in features
+        assert sink.messages == 2
+        assert sink.bytes > 1000
+        sink.reset()
+        assert (sink.messages, sink.bytes) == (0, 0)
+
+
+def test_sink_advertises_size_and_applies_latency():
+    with smtpsink.SmtpSink(latency=0.2, max_size=12345) as sink:
+        start = time.perf_counter()
+        features = send(sink.port, "body")
+        assert time.perf_counter() - start >= 0.2
+    assert features["size"] == "12345"
+
+
+def test_small_benchmark_run_writes_json(tmp_path):
+    old_app_dir = config.APP_DIR
+    output = tmp_path / "results.json"
+    try:
+        assert bench.main(["--sizes", "50", "--attachment-kb", "0,1", "--repeat", "1", "--send-count", "5",
+                           "--gui-max", "0", "--work-dir", str(tmp_path / "work"), "--output", str(output)]) == 0
+    finally:
+        config.use_app_dir(old_app_dir)
+
+    result = json.loads(output.read_text())
+    assert result["gui_skipped"] == "disabled"
+    entry = result["results"]["50"]
+    assert {"load_data_folder", "report_search_email", "send_0kb", "send_1kb"} <= set(entry)
+    assert entry["send_1kb"]["messages"] == 5
+    assert entry["send_1kb"]["wire_bytes_per_msg"] > entry["send_0kb"]["wire_bytes_per_msg"]
@@ -0,0 +1,127 @@
+# test_migration.py - Moving the data folder: rename and copy paths, resume and failure handling
+import os
+import json
+
+import pytest
+
+import migration
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def read(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def write_journal(dst, src, *records):
+    with open(os.path.join(dst, migration.JOURNAL_NAME), "w", encoding="utf-8") as f:
+        for rec in ({"src": src, "dst": dst},) + records:
+            f.write(json.dumps(rec) + "\n")
+
+
+@pytest.fixture
+def folders(tmp_path):
+    src, dst = str(tmp_path / "src"), str(tmp_path / "dst")
+    for name in ("config.json", "contacts.db", "reports.db", "metrics.json", "stalls.log", "startup_times.jsonl"):
+        write(os.path.join(src, name), name)
+    write(os.path.join(src, "attachments", "acme", "offer.pdf"), "pdf")
+    os.makedirs(os.path.join(src, "attachments", "empty_profile"))
+    write(os.path.join(src, "profiles", "run.prof"), "prof")
+    os.makedirs(dst)
+    return src, dst
+
+
+@pytest.fixture(params=["rename", "copy"])
+def mode(request, monkeypatch):
+    if request.param == "copy":
+        monkeypatch.setattr(migration, "_same_device", lambda a, b: False)
+    return request.param
+
+
+def test_moves_every_data_entry(folders, mode):
+    src, dst = folders
+    job = migration.MigrationJob(src, dst)
+    job.run()
+
+    assert job.errors == []
+    for name in ("config.json", "contacts.db", "reports.db", "metrics.json", "stalls.log", "startup_times.jsonl"):
+        assert read(os.path.join(dst, name)) == name
+        assert not os.path.exists(os.path.join(src, name))
+    assert read(os.path.join(dst, "attachments", "acme", "offer.pdf")) == "pdf"
+    assert os.path.isdir(os.path.join(dst, "attachments", "empty_profile"))
+    assert read(os.path.join(dst, "profiles", "run.prof")) == "prof"
+    assert not os.path.exists(os.path.join(dst, migration.JOURNAL_NAME))
+
+
+def test_failed_move_leaves_the_source_complete(folders, mode):
+    src, dst = folders
+    if mode == "rename":
+        write(os.path.join(dst, "reports.db"), "someone else's")  # Not ours: never overwritten
+    else:
+        os.makedirs(os.path.join(dst, "reports.db.part"))  # The copy can't open its temp file
+    job = migration.MigrationJob(src, dst)
+    job.run()
+
+    assert job.errors
+    assert job.restored
+    for name in ("config.json", "contacts.db", "reports.db"):
+        assert read(os.path.join(src, name)) == name
+    assert read(os.path.join(src, "attachments", "acme", "offer.pdf")) == "pdf"
+    assert not os.path.exists(os.path.join(dst, "config.json"))
+    assert not os.path.exists(os.path.join(dst, migration.JOURNAL_NAME))
+
+
+def test_copy_resume_recopies_sources_changed_since_the_journal(folders, monkeypatch):
+    monkeypatch.setattr(migration, "_same_device", lambda a, b: False)
+    src, dst = folders
+    write(os.path.join(src, "config.json"), "v1")
+    write(os.path.join(dst, "config.json"), "v1")
+    st = os.stat(os.path.join(src, "config.json"))
+    write_journal(dst, src, {"done": "config.json", "size": st.st_size, "mtime": st.st_mtime_ns})
+    # Edited after the interrupted copy
+    write(os.path.join(src, "config.json"), "v2 edit")
+
+    job = migration.pending_job(dst)
+    job.run()
+
+    assert job.errors == []
+    assert read(os.path.join(dst, "config.json")) == "v2 edit"
+    assert not os.path.exists(os.path.join(src, "config.json"))
+
+
+def test_rename_resume_after_crash_between_rename_and_journal(folders):
+    src, dst = folders
+    # The intent was journaled, the rename happened, then the process died
+    os.replace(os.path.join(src, "config.json"), os.path.join(dst, "config.json"))
+    write_journal(dst, src, {"moving": "config.json"})
+
+    job = migration.pending_job(dst)
+    job.run()
+
+    assert job.errors == []
+    assert read(os.path.join(dst, "config.json")) == "config.json"
+    assert read(os.path.join(dst, "contacts.db")) == "contacts.db"
+
+
+def test_rename_rollback_includes_entries_of_an_interrupted_run(folders):
+    src, dst = folders
+    for name in ("config.json", "contacts.db"):
+        os.replace(os.path.join(src, name), os.path.join(dst, name))
+    write_journal(dst, src, {"moving": "config.json"}, {"done": "config.json"}, {"moving": "contacts.db"})
+    write(os.path.join(dst, "reports.db"), "someone else's")
+
+    job = migration.pending_job(dst)
+    job.run()
+
+    assert job.errors
+    assert job.restored
+    for name in ("config.json", "contacts.db", "reports.db"):
+        assert read(os.path.join(src, name)) == name
+    assert not os.path.exists(os.path.join(dst, "config.json"))
+    assert read(os.path.join(dst, "reports.db")) == "someone else's"
+    assert not os.path.exists(os.path.join(dst, migration.JOURNAL_NAME))
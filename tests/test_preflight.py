@@ -0,0 +1,125 @@
+# test_preflight.py - The up-front campaign check and the issue kinds it reports
+import types
+
+import pytest
+
+import bench
+import config
+import engine
+import preflight
+import smtpsink
+import suppression
+
+SETTINGS = {
+    "smtp": {"server": "mail.test", "port": 587},
+    "smtp_size_limit": {"server": "mail.test", "port": "587", "bytes": 20_000},
+    "templates": {"1": {"name": "Offer", "subject": "Offer for {company_name}", "message": "Hello {company_name}"}},
+}
+
+
+def contact(c_id, email, **fields):
+    c = {"id": c_id, "company": f"Company {c_id}", "email": email, "subject": "Hi", "message": "Body", "enabled": True}
+    c.update(fields)
+    return c
+
+
+@pytest.fixture
+def data(tmp_path):
+    sup = suppression.SuppressionList(str(tmp_path / "suppression.db"))
+    yield types.SimpleNamespace(suppression=sup)
+    sup.close()
+
+
+def run_check(contacts, data):
+    return preflight.check(engine.MailingEngine(SETTINGS, contacts, data), workers=4)
+
+
+def kinds_by_email(report):
+    return {(kind, email) for kind, email, _ in report.issues}
+
+
+def test_each_issue_kind_is_reported(tmp_path, data):
+    small = tmp_path / "small.pdf"
+    small.write_bytes(b"x" * 1000)
+    big = tmp_path / "big.bin"
+    big.write_bytes(b"x" * 30_000)
+    data.suppression.add("bounced@x.com", 550)
+    contacts = [
+        contact(1, "ok@x.com", attachments=[str(small)]),
+        contact(2, ""),
+        contact(3, "not-an-address"),
+        contact(4, "gone@x.com", attachments=[str(tmp_path / "missing.pdf")]),
+        contact(5, "tpl@x.com", template_id="9", subject="", message=""),
+        contact(6, "large@x.com", attachments=[str(big)]),
+        contact(7, "typo@x.com", message="Hello {compnay_name}"),
+        contact(8, "blank@x.com", subject=" ", message=""),
+        contact(9, "Dup@x.com"),
+        contact(10, "dup@x.com"),
+        contact(11, "bounced@x.com"),
+        contact(12, "shared@x.com", template_id="1", subject="", message=""),
+        contact(13, "", enabled=False),
+    ]
+    report = run_check(contacts, data)
+
+    assert report.checked == 12  # Disabled contacts are not checked
+    assert kinds_by_email(report) == {
+        ("no_email", "Company 2"), ("bad_address", "not-an-address"), ("missing_file", "gone@x.com"),
+        ("missing_template", "tpl@x.com"), ("empty_subject", "tpl@x.com"), ("empty_message", "tpl@x.com"),
+        ("too_large", "large@x.com"), ("unknown_variable", "typo@x.com"),
+        ("empty_subject", "blank@x.com"), ("empty_message", "blank@x.com"),
+        ("duplicate", "Dup@x.com"), ("duplicate", "dup@x.com"), ("suppressed", "bounced@x.com"),
+    }
+    assert {kind for kind, _, _ in report.errors} == set(preflight.ERROR_KINDS)
+    assert {kind for kind, _, _ in report.warnings} == set(preflight.WARNING_KINDS)
+    assert report.largest[1] == "large@x.com"
+    assert report.sizes[1] > report.sizes[9]  # The attachment counts towards the estimate
+
+
+def test_clean_campaign_has_no_issues(data):
+    report = run_check([contact(i, f"user{i}@x.com") for i in range(5)], data)
+    assert report.issues == []
+    assert report.checked == 5
+    assert report.total_bytes == sum(report.sizes.values()) > 0
+
+
+def test_report_lines_summarize_each_kind(data):
+    report = run_check([contact(i, f"bad{i}") for i in range(5)], data)
+    lines = report.lines(per_kind=2)
+    assert lines[0].endswith(": 5")
+    assert lines[1:3] == ["    bad0", "    bad1"]
+    assert len(lines) == 4  # Header, two examples, "and N more"
+
+
+def test_estimate_matches_the_built_message():
+    mailer = engine.MailingEngine(SETTINGS, [], None)
+    c = contact(1, "a@x.com", message="Hello {company_name}\n" * 200)
+    subject, body, msg = mailer.build_message(c, c["subject"], c["message"], [])
+    estimate = engine.estimate_message_size(subject, body, [])
+    actual = len(msg.as_bytes())
+    assert actual * 0.8 <= estimate <= actual * 1.5
+
+
+def test_engine_rejects_what_preflight_reports_as_errors(tmp_path):
+    old_app_dir = config.APP_DIR
+    with smtpsink.SmtpSink() as sink:
+        bench.make_data_folder(str(tmp_path), 1, [], sink.port)
+        settings = engine.load_settings()
+        contacts = [
+            contact(1, "ok@x.com"),
+            contact(2, "not-an-address"),
+            contact(3, "tpl@x.com", template_id="9", subject="", message=""),
+            contact(4, "gone@x.com", attachments=[str(tmp_path / "missing.pdf")]),
+        ]
+        data = engine.DataFolder()
+        statuses = {}
+        try:
+            assert {kind for kind, _, _ in preflight.check(engine.MailingEngine(settings, contacts, data)).errors} == \
+                {"bad_address", "missing_template", "missing_file"}
+            stats = engine.MailingEngine(settings, contacts, data,
+                                         on_status=lambda c, state, text: statuses.__setitem__(c["id"], text)).run()
+        finally:
+            data.close()
+            config.use_app_dir(old_app_dir)
+    assert stats["sent"] == 1 and stats["error"] == 3
+    assert statuses == {1: "Sent", 2: "Error: Invalid Address", 3: "Error: Template Missing", 4: "Error: File(s) Missing"}
+    assert sink.messages == 1
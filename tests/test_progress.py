@@ -0,0 +1,60 @@
+# test_progress.py - Campaign throughput, error rate and ETA
+import progress
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_counts_only_final_states_of_enabled_contacts():
+    tracker = progress.ThroughputTracker(4, clock=Clock())
+    for state, enabled in (("sending", True), ("sent", True), ("retry", True), ("error", True),
+                           ("skipped", True), ("sent", False)):
+        tracker.record(state, enabled)
+    v = tracker.view()
+    assert (v["done"], v["sent"], v["errors"]) == (3, 1, 1)
+    assert v["error_rate"] == 1 / 3
+
+
+def test_rates_and_eta_over_the_rolling_window():
+    clock = Clock()
+    sent_bytes = [0]
+    tracker = progress.ThroughputTracker(100, lambda: sent_bytes[0], window=60, clock=clock)
+    assert tracker.view()["eta_seconds"] is None  # Nothing finished yet
+
+    for _ in range(10):
+        clock.now += 3
+        sent_bytes[0] += 1000
+        tracker.record("sent")
+    v = tracker.view()
+    assert v["msgs_per_min"] == 20
+    assert v["eta_seconds"] == 90 / (10 / 30)
+    assert v["bytes_per_sec"] == 10000 / 30
+
+    clock.now += 120  # Stalled: the window has emptied
+    v = tracker.view()
+    assert v["msgs_per_min"] == 0
+    assert v["eta_seconds"] is None
+    assert v["elapsed"] == 150
+
+
+def test_finish_freezes_the_view():
+    clock = Clock()
+    tracker = progress.ThroughputTracker(1, clock=clock)
+    clock.now += 5
+    tracker.record("sent")
+    tracker.finish()
+    clock.now += 100
+    v = tracker.view()
+    assert v["finished"]
+    assert v["elapsed"] == 5
+    assert v["eta_seconds"] == 0
+
+
+def test_formatting():
+    assert [progress.format_duration(s) for s in (42, 65, 3725)] == ["42s", "1m 05s", "1h 02m"]
+    assert [progress.format_bytes(n) for n in (512, 2048, 5 * 1024 ** 3)] == ["512 B", "2.0 KB", "5.0 GB"]
@@ -0,0 +1,161 @@
+# test_reports.py - Report store, message body blobs and retention
+import threading
+
+import pytest
+
+import reports
+
+
+@pytest.fixture
+def blobs(tmp_path):
+    return reports.BlobStore(str(tmp_path / "report_bodies"))
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = reports.ReportStore(str(tmp_path / "reports.db"))
+    yield s
+    s.close()
+
+
+def delivery(email, status="Sent"):
+    return {"email": email, "subject": "Offer", "status": status, "attachment": ""}
+
+
+def test_bodies_are_stored_once_and_freed_with_their_last_delivery(store, blobs):
+    first = store.start_batch("2025-01-01 10:00:00")
+    second = store.start_batch("2025-01-02 10:00:00")
+    store.add_delivery(first, delivery("a@x.com"), "shared body", blobs)
+    store.add_delivery(first, delivery("b@x.com"), "only in first", blobs)
+    store.add_delivery(second, delivery("c@x.com"), "shared body", blobs)
+    only_first = store.deliveries(first)[1]
+
+    assert store.delete_batch(first, blobs) > 0
+    (rep,) = store.deliveries(second)
+    assert reports.message_of(rep, blobs) == "shared body"
+    assert reports.message_of(only_first, blobs) is None
+    store.clear(blobs)
+    assert store.batches() == []
+    assert blobs.size() == 0
+
+
+def test_retention_does_not_delete_a_body_stored_during_compaction(tmp_path, blobs, monkeypatch):
+    path = str(tmp_path / "reports.db")
+    gui = reports.ReportStore(path)
+    campaign = reports.ReportStore(path)  # A second connection, like a campaign process
+    old = gui.start_batch("2020-01-01 10:00:00")
+    gui.add_delivery(old, delivery("a@x.com"), "same body", blobs)
+    new = campaign.start_batch("2025-01-01 10:00:00")
+
+    unlink = blobs.delete
+    writers = []
+
+    def delete(digests):
+        # The campaign logs the same body while the compaction is about to unlink it
+        writer = threading.Thread(target=campaign.add_delivery, args=(new, delivery("b@x.com"), "same body", blobs))
+        writer.start()
+        writer.join(0.2)
+        assert writer.is_alive()  # Waits for the compaction's write lock
+        writers.append(writer)
+        return unlink(digests)
+
+    monkeypatch.setattr(blobs, "delete", delete)
+    gui.compact_batch(old, blobs)
+    writers[0].join()
+
+    (rep,) = campaign.deliveries(new)
+    assert reports.message_of(rep, blobs) == "same body"
+    gui.close()
+    campaign.close()
+
+
+@pytest.fixture
+def history(store):
+    """Three daily batches to a few addresses; returns the store and batch ids."""
+    ids = []
+    for day, statuses in (("01", ["Sent", "Sent", "Error: 550"]), ("02", ["Sent", "Skipped (Suppressed)", "Sent"]),
+                          ("03", ["Error: 421", "Sent", "Sent"])):
+        batch = store.start_batch(f"2025-03-{day} 09:00:00")
+        for email, status in zip(("john@example.com", "jane@example.com", "joe@other.org"), statuses):
+            store.add_delivery(batch, delivery(email, status))
+        ids.append(batch)
+    return store, ids
+
+
+def emails(rows):
+    return [(r["email"], r["date"][:10]) for r in rows]
+
+
+def test_search_by_email_prefix_domain_and_status(history):
+    store, _ = history
+    assert emails(store.search("jo")) == [("joe@other.org", "2025-03-03"), ("john@example.com", "2025-03-03"),
+                                          ("joe@other.org", "2025-03-02"), ("john@example.com", "2025-03-02"),
+                                          ("joe@other.org", "2025-03-01"), ("john@example.com", "2025-03-01")]
+    assert {r["email"] for r in store.search("@example.com")} == {"john@example.com", "jane@example.com"}
+    assert {r["email"] for r in store.search("other.org")} == {"joe@other.org"}
+    assert emails(store.search(status="error")) == [("john@example.com", "2025-03-03"), ("joe@other.org", "2025-03-01")]
+    assert emails(store.search("JANE@", status="skipped")) == [("jane@example.com", "2025-03-02")]
+
+
+def test_search_by_date_range(history):
+    store, _ = history
+    assert {r["date"][:10] for r in store.search(date_from="2025-03-02")} == {"2025-03-02", "2025-03-03"}
+    assert {r["date"][:10] for r in store.search(date_to="2025-03-01")} == {"2025-03-01"}
+    assert emails(store.search("joe", date_from="2025-03-02", date_to="2025-03-02")) == [("joe@other.org", "2025-03-02")]
+    assert store.search(date_from="2025-04-01") == []
+
+
+def test_id_bounds_cover_the_deliveries_of_the_dated_batches(history):
+    store, ids = history
+    first, last = store._id_bounds("2025-03-02", "2025-03-03")
+    assert {r["id"] for r in store.search()} & set(range(first, last + 1)) == \
+        {r["id"] for r in store.search(date_from="2025-03-02")}
+    assert store._id_bounds("2024-01-01", "2024-12-31") is None
+    store.start_batch("2025-03-04 09:00:00")  # A batch without deliveries yet
+    assert store._id_bounds("2025-03-04", None) is None
+
+
+@pytest.mark.parametrize("text", ["", "jo", "example.com"])
+def test_paging_returns_every_match_once(history, text):
+    store, _ = history
+    everything = store.search(text, limit=100)
+    pages, before = [], None
+    while True:
+        page = store.search(text, before=before, limit=2)
+        if not page:
+            break
+        pages += page
+        before = page[-1]["id"]
+    assert pages == everything
+
+
+def test_retention_compacts_old_batches_into_rollups(store, blobs):
+    old = store.start_batch("2000-01-01 09:00:00")
+    for email, status in (("a@x.com", "Sent"), ("b@x.com", "Sent"), ("c@y.org", "Error: 550")):
+        store.add_delivery(old, delivery(email, status), f"body for {email}", blobs)
+    newest = store.start_batch("2001-01-01 09:00:00")
+    store.add_delivery(newest, delivery("a@x.com"), "new body", blobs)
+
+    assert reports.apply_retention(store, blobs, max_age_days=30) == 1  # The newest batch is never compacted
+    assert store.deliveries(old) == []
+    assert store.rollup(old) == {"x.com": {"sent": 2}, "y.org": {"error": 1}}
+    assert [(b["id"], b["total"], b["rolled_up"]) for b in store.batches()] == [(newest, 1, False), (old, 3, True)]
+    assert blobs.get(store.deliveries(newest)[0]["message_hash"]) == "new body"
+    assert reports.apply_retention(store, blobs, max_age_days=30) == 0
+
+
+def test_retention_by_size_compacts_oldest_first_until_it_fits(store, blobs):
+    batches = []
+    for day in range(1, 5):
+        batch = store.start_batch(f"2025-01-0{day} 09:00:00")
+        for i in range(20):
+            store.add_delivery(batch, delivery(f"u{i}@x.com"), f"day {day} recipient {i} " + "x" * 2000, blobs)
+        batches.append(batch)
+    total = store.live_bytes() + blobs.size()
+
+    compacted = reports.apply_retention(store, blobs, max_bytes=total - 1)
+    assert compacted >= 1
+    rolled = [b["id"] for b in store.batches() if b["rolled_up"]]
+    assert sorted(rolled) == batches[:compacted]
+    assert reports.apply_retention(store, blobs, max_bytes=1) == len(batches) - 1 - compacted
+    assert store.rollup(batches[-1]) is None
@@ -0,0 +1,60 @@
+# test_retry.py - SMTP failure classification, backoff and the persistent retry queue
+import smtplib
+
+import pytest
+
+import retry
+
+
+@pytest.mark.parametrize("exc, transient, code", [
+    (smtplib.SMTPResponseException(421, b"Try again later"), True, 421),
+    (smtplib.SMTPResponseException(550, b"No such user"), False, 550),
+    (smtplib.SMTPRecipientsRefused({"a@x.com": (452, b"Mailbox full")}), True, 452),
+    (smtplib.SMTPRecipientsRefused({"a@x.com": (553, b"Rejected")}), False, 553),
+    (smtplib.SMTPServerDisconnected("Connection unexpectedly closed"), True, None),
+    (ConnectionResetError("reset by peer"), True, None),
+    (ValueError("bad header"), False, None),
+])
+def test_classify(exc, transient, code):
+    got_transient, got_code, message = retry.classify(exc)
+    assert (got_transient, got_code) == (transient, code)
+    assert isinstance(message, str)
+
+
+def test_backoff_doubles_up_to_the_cap():
+    assert [retry.backoff(n) for n in (1, 2, 3)] == [retry.BASE_DELAY, retry.BASE_DELAY * 2, retry.BASE_DELAY * 4]
+    assert retry.backoff(50) == retry.MAX_DELAY
+
+
+def test_queue_survives_a_restart(tmp_path):
+    path = str(tmp_path / "retry_queue.json")
+    queue = retry.RetryQueue(path)
+    queue.schedule(1, "a@x.com", 421, "later")
+    queue.schedule(2, "b@x.com", 450, "busy")
+    queue.schedule(2, "b@x.com", 450, "busy")
+
+    reloaded = retry.RetryQueue(path)
+    assert len(reloaded) == 2
+    assert reloaded.next_due()["contact_id"] == 1  # One attempt: the shorter backoff
+    assert reloaded.entries[2]["attempts"] == 2
+
+    reloaded.remove(1)
+    assert list(retry.RetryQueue(path).entries) == [2]
+    reloaded.clear()
+    assert len(retry.RetryQueue(path)) == 0
+
+
+def test_entry_is_dropped_after_max_attempts(tmp_path):
+    queue = retry.RetryQueue(str(tmp_path / "retry_queue.json"))
+    for _ in range(retry.MAX_ATTEMPTS - 1):
+        assert queue.schedule(1, "a@x.com", 421, "later") is not None
+    assert queue.schedule(1, "a@x.com", 421, "later") is None
+    assert len(queue) == 0
+    assert queue.next_due() is None
+
+
+def test_unreadable_queue_file_starts_empty(tmp_path, capsys):
+    path = tmp_path / "retry_queue.json"
+    path.write_text("{not json")
+    assert len(retry.RetryQueue(str(path))) == 0
+    assert "Error loading retry queue" in capsys.readouterr().out
@@ -0,0 +1,57 @@
+# test_selection.py - Contact selection: click, ctrl-click, shift-click ranges
+import selection
+
+
+def model(ids=(10, 20, 30, 40, 50)):
+    m = selection.SelectionModel()
+    m.set_order(ids)
+    return m
+
+
+def test_select_only_reports_the_rows_to_restyle():
+    m = model()
+    assert m.select_only(20) == {20}
+    assert m.select_only(40) == {20, 40}
+    assert list(m.selected) == [40]
+
+
+def test_toggle_adds_and_removes():
+    m = model()
+    m.toggle(10)
+    m.toggle(30)
+    assert m.toggle(10) == {10}
+    assert 10 not in m and 30 in m
+    assert len(m) == 1
+
+
+def test_range_from_the_anchor_in_either_direction():
+    m = model()
+    m.select_only(40)
+    assert m.select_range(20) == {20, 30}
+    assert m.ordered() == [20, 30, 40]
+    m.select_only(20)
+    assert m.select_range(50) == {30, 40, 50}
+    assert m.ordered() == [20, 30, 40, 50]
+
+
+def test_range_without_a_visible_anchor_selects_only_the_row():
+    m = model()
+    assert m.select_range(30) == {30}
+    m.select_only(30)
+    m.set_order([40, 50])  # The anchor was filtered out
+    assert m.select_range(50) == {30, 50}
+    assert m.ordered() == [50]
+
+
+def test_ordered_puts_hidden_rows_last_and_discard_forgets_deleted():
+    m = model()
+    m.toggle(50)
+    m.toggle(10)
+    m.set_order([30, 50])
+    assert m.ordered() == [50, 10]
+    m.discard([50])
+    assert m.ordered() == [10]
+    assert m.anchor == 10
+    m.discard([10])
+    assert m.anchor is None
+    assert m.clear() == set()
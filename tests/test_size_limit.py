@@ -0,0 +1,80 @@
+# test_size_limit.py - Messages over the server's ESMTP SIZE limit fail before they are sent
+import os
+
+import pytest
+
+import bench
+import config
+import engine
+import mailflow
+import smtpsink
+
+SIZE_LIMIT = 50_000
+
+
+@pytest.fixture
+def campaign(tmp_path):
+    """A data folder of three enabled contacts sending to a sink that advertises SIZE_LIMIT."""
+    old_app_dir = config.APP_DIR
+    with smtpsink.SmtpSink(max_size=SIZE_LIMIT) as sink:
+        bench.make_data_folder(str(tmp_path), 3, [10], sink.port)
+        settings = engine.load_settings()
+        data = engine.DataFolder()
+        contacts = data.load_contacts(settings)
+        for c in contacts:
+            c["enabled"] = True
+        data.contact_store.rebalance(contacts)
+        data.close()
+        yield tmp_path, sink
+    config.use_app_dir(old_app_dir)
+
+
+def make_oversized(folder, count):
+    """Give the first count contacts an attachment larger than the limit."""
+    big = os.path.join(folder, "big.bin")
+    with open(big, "wb") as f:
+        f.write(os.urandom(SIZE_LIMIT * 2))
+    data = engine.DataFolder()
+    contacts = data.load_contacts(engine.load_settings())
+    for c in contacts[:count]:
+        c["attachments"] = [big]
+    data.contact_store.rebalance(contacts)
+    data.close()
+    return contacts
+
+
+def test_oversized_messages_are_errors_and_not_sent(campaign):
+    folder, sink = campaign
+    make_oversized(str(folder), 2)
+    settings = engine.load_settings()
+    data = engine.DataFolder()
+    statuses = []
+    mailer = engine.MailingEngine(settings, data.load_contacts(settings), data,
+                                  on_status=lambda c, state, text: statuses.append((state, text)))
+    try:
+        stats = mailer.run()
+    finally:
+        data.close()
+
+    assert mailer.size_limit == SIZE_LIMIT
+    assert stats == {"sent": 1, "error": 2, "skipped": 0, "suppressed": 0}
+    assert sum(1 for state, text in statuses if state == "error" and text.startswith("Error: Too Large")) == 2
+    assert sink.messages == 1
+    assert mailer.metrics.value("messages_oversized_total") == 2
+    assert mailer.metrics.value("messages_built_total") == 1
+
+
+def test_cli_exit_code_when_every_message_is_too_large(campaign, capsys):
+    folder, sink = campaign
+    make_oversized(str(folder), 3)
+
+    assert mailflow.main(["send", "--data-dir", str(folder)]) == mailflow.EXIT_FAILURES
+    assert "Sent: 0 | Errors: 3" in capsys.readouterr().out
+    assert sink.messages == 0
+
+
+def test_messages_under_the_limit_are_sent(campaign):
+    folder, sink = campaign
+
+    assert mailflow.main(["send", "--data-dir", str(folder)]) == mailflow.EXIT_OK
+    assert sink.messages == 3
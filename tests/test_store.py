@@ -0,0 +1,49 @@
+# test_store.py - Contact ranks and the per-record contact store
+import store
+
+
+def test_ranks_at_the_ends_of_the_list():
+    assert store.ranks_between(None, None, 3) == [store.RANK_GAP, store.RANK_GAP * 2, store.RANK_GAP * 3]
+    before = store.ranks_between(None, 100, 2)
+    after = store.ranks_between(100, None, 2)
+    assert before == sorted(before) and before[-1] < 100
+    assert after == sorted(after) and after[0] > 100
+
+
+def test_ranks_between_neighbours_until_the_gap_is_exhausted():
+    assert store.ranks_between(10, 20, 1) == [15]
+    assert store.ranks_between(0, 10, 3) == [2, 4, 6]
+    assert store.ranks_between(10, 12, 1) == [11]
+    assert store.ranks_between(10, 11, 1) is None
+    assert store.ranks_between(10, 12, 2) is None
+
+
+def test_upsert_delete_and_rank_order(tmp_path):
+    path = str(tmp_path / "contacts.db")
+    s = store.ContactStore(path)
+    assert s.is_empty()
+    a, b = {"id": 1, "rank": 200, "email": "a@x.com"}, {"id": 2, "rank": 100, "email": "b@x.com", "_widget": object()}
+    s.upsert([a, b])
+    (c_rank,) = store.ranks_between(100, 200, 1)
+    s.upsert([{"id": 3, "rank": c_rank, "email": "c@x.com"}])
+    s.delete([1])
+    s.close()
+
+    s = store.ContactStore(path)
+    loaded = s.load_all()
+    assert [c["email"] for c in loaded] == ["b@x.com", "c@x.com"]
+    assert "_widget" not in loaded[0]  # Underscore keys are in-memory only
+    s.close()
+
+
+def test_rebalance_respaces_ranks_in_list_order(tmp_path):
+    s = store.ContactStore(str(tmp_path / "contacts.db"))
+    contacts = [{"id": i, "rank": 10 + i, "email": f"{i}@x.com"} for i in range(3)]
+    s.upsert(contacts)
+    contacts.reverse()
+    s.rebalance(contacts)
+
+    assert [c["rank"] for c in contacts] == [store.RANK_GAP, store.RANK_GAP * 2, store.RANK_GAP * 3]
+    assert [c["id"] for c in s.load_all()] == [2, 1, 0]
+    assert store.ranks_between(contacts[0]["rank"], contacts[1]["rank"], 1000) is not None
+    s.close()
@@ -0,0 +1,63 @@
+# test_suppression.py - The suppression list and its CSV import/export
+import csv
+
+import pytest
+
+import suppression
+
+
+@pytest.fixture
+def sup(tmp_path):
+    s = suppression.SuppressionList(str(tmp_path / "suppression.db"))
+    yield s
+    s.close()
+
+
+def test_addresses_are_normalized_and_persisted(tmp_path, sup):
+    assert sup.add(" Bounce@Example.com ", 550, "No such user")
+    assert not sup.add("bounce@example.com")
+    assert "BOUNCE@example.COM" in sup
+    assert sup.add_many([("a@x.com", 551, ""), ("A@x.com", 551, ""), ("", None, ""), ("b@x.com", 553, "")]) == 2
+    sup.close()
+
+    reopened = suppression.SuppressionList(sup.path)
+    assert len(reopened) == 3
+    reopened.clear()
+    reopened.close()
+    assert len(suppression.SuppressionList(sup.path)) == 0
+
+
+@pytest.mark.parametrize("content", [
+    "Name,Email\nJohn,john@x.com\nJane,JANE@x.com\nNobody,\n",
+    "address\njohn@x.com\njane@x.com\nnot an address\n",
+    "john@x.com\njane@x.com\n\n",
+    "\ufeffE-Mail,Note\njohn@x.com,\njane@x.com,vip\n",
+])
+def test_import_finds_the_address_column(tmp_path, sup, content):
+    path = tmp_path / "list.csv"
+    path.write_text(content, encoding="utf-8")
+    assert sup.import_file(str(path)) == 2
+    assert "john@x.com" in sup and "jane@x.com" in sup
+    assert sup.import_file(str(path)) == 0
+
+
+def test_import_of_an_empty_file(tmp_path, sup):
+    path = tmp_path / "empty.csv"
+    path.write_text("")
+    assert sup.import_file(str(path)) == 0
+
+
+def test_export_round_trips(tmp_path, sup):
+    sup.add("b@x.com", 550, "No such user")
+    sup.add("a@x.com")
+    path = str(tmp_path / "export.csv")
+    assert sup.export_file(path) == 2
+
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["address", "code", "reason", "added"]
+    assert [r[:3] for r in rows[1:]] == [["a@x.com", "", ""], ["b@x.com", "550", "No such user"]]
+
+    other = suppression.SuppressionList(str(tmp_path / "other.db"))
+    assert other.import_file(path) == 2
+    other.close()
@@ -0,0 +1,38 @@
+# test_templating.py - Shared templates and {variable} rendering
+import templating
+
+TEMPLATES = {"1": {"name": "Offer", "subject": "Offer for {company_name}", "message": "Hi {email_prefix},\n{signature}"}}
+
+
+def test_contact_text_overrides_the_template():
+    assert templating.resolve({"template_id": "1"}, TEMPLATES) == ("Offer for {company_name}", "Hi {email_prefix},\n{signature}")
+    assert templating.resolve({"template_id": "1", "subject": "Own"}, TEMPLATES) == ("Own", "Hi {email_prefix},\n{signature}")
+    assert templating.resolve({"subject": "S", "message": "M"}, TEMPLATES) == ("S", "M")
+    assert templating.resolve({"template_id": "9"}, TEMPLATES) == ("", "")
+
+
+def test_missing_template_unless_the_contact_has_its_own_text():
+    assert templating.missing_template({"template_id": "9"}, TEMPLATES) == "9"
+    assert templating.missing_template({"template_id": "9", "subject": "S"}, TEMPLATES) == "9"
+    assert templating.missing_template({"template_id": "9", "subject": "S", "message": "M"}, TEMPLATES) is None
+    assert templating.missing_template({"template_id": "1"}, TEMPLATES) is None
+    assert templating.missing_template({}, TEMPLATES) is None
+
+
+def test_render_replaces_known_variables_only():
+    values = {"{company_name}": "Acme", "{email_prefix}": "john", "{signature}": "-- Sales"}
+    parts = templating.compile_text("Hi {email_prefix} at {company_name}, {unknown} {{email_prefix}}\n{signature}")
+    assert templating.render(parts, values) == "Hi john at Acme, {unknown} {john}\n-- Sales"
+    assert templating.render(templating.compile_text("no variables"), values) == "no variables"
+
+
+def test_renderer_compiles_each_text_once():
+    renderer = templating.Renderer()
+    assert renderer("Dear {company_name}", {"{company_name}": "Acme"}) == "Dear Acme"
+    assert renderer("Dear {company_name}", {"{company_name}": "Initech"}) == "Dear Initech"
+    assert len(renderer._compiled) == 1
+
+
+def test_new_template_id():
+    assert templating.new_template_id({}) == "1"
+    assert templating.new_template_id({"1": {}, "7": {}, "legacy": {}}) == "8"
@@ -0,0 +1,151 @@
+# worker.py - Runs a campaign off the GUI thread (in a child process or a thread) and relays its progress
+import queue
+import threading
+import multiprocessing
+
+import config
+import langs
+import engine
+
+# Events sent to the GUI (tuples):
+#   ("status", contact_id, state, text, bytes_sent)
+#   ("error", kind, message)
+#   ("done", stats or None, cancelled, SIZE limit the server advertised)
+# Commands sent to the child: "pause", "resume", "cancel", "detach"
+
+
+def run_campaign(app_dir, lang, settings, contacts, resume, events, commands):
+    """Child process entry point: send the campaign with the data folder at app_dir."""
+    config.use_app_dir(app_dir)
+    langs.set_language(lang)
+    detached = threading.Event()
+
+    def post(*event):
+        if not detached.is_set():
+            events.put(event)
+
+    data = engine.DataFolder()
+    mailer = engine.MailingEngine(
+        settings, contacts, data,
+        on_status=lambda c, state, text: post("status", c.get("id"), state, text, mailer.metrics.value("bytes_sent_total")),
+        on_error=lambda kind, error: post("error", kind, str(error)))
+
+    def listen():
+        while True:
+            command = commands.get()
+            if command == "pause":
+                mailer.pause()
+            elif command == "resume":
+                mailer.resume()
+            elif command == "cancel":
+                mailer.cancel()
+            elif command == "detach":
+                # The window was closed: keep sending, but nobody reads events any more
+                detached.set()
+                events.cancel_join_thread()
+
+    threading.Thread(target=listen, name="campaign-commands", daemon=True).start()
+    try:
+        stats = mailer.run(resume=resume)
+        if detached.is_set():
+            data.apply_retention(settings)  # The GUI would have done this after the "done" event
+    finally:
+        data.close()
+    post("done", stats, mailer.cancelled.is_set(), mailer.size_limit)
+
+
+class CampaignProcess:
+    """GUI-side handle on a campaign running in a child process. Has the same pause(),
+    resume() and cancel() controls as engine.MailingEngine; poll() returns pending events."""
+
+    def __init__(self, settings, contacts, resume=False):
+        ctx = multiprocessing.get_context("spawn")  # Same behaviour on every platform, and no Tk state is forked
+        self.events = ctx.Queue()
+        self.commands = ctx.Queue()
+        self.bytes_sent = 0
+        settings = {k: v for k, v in settings.items() if k != "contacts"}
+        contacts = [{k: v for k, v in c.items() if not k.startswith("_")} for c in contacts]
+        self.process = ctx.Process(
+            target=run_campaign, name="mailflow-campaign",
+            args=(config.APP_DIR, langs.get_language(), settings, contacts, resume, self.events, self.commands))
+
+    def start(self):
+        self.process.start()
+
+    def pause(self):
+        self.commands.put("pause")
+
+    def resume(self):
+        self.commands.put("resume")
+
+    def cancel(self):
+        self.commands.put("cancel")
+
+    def detach(self):
+        """Let the campaign finish on its own after the window is closed."""
+        self.commands.put("detach")
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def poll(self, limit=1000):
+        """Return up to limit pending events without blocking."""
+        events = _drain(self.events, limit)
+        for event in events:
+            if event[0] == "status":
+                self.bytes_sent = event[4]
+        return events
+
+
+class CampaignThread:
+    """Runs a campaign on a thread of the GUI process, behind the same interface as
+    CampaignProcess: engine callbacks become queued events for the GUI thread to apply."""
+
+    def __init__(self, settings, contacts, data, resume=False):
+        self.events = queue.Queue()
+        self.resume_run = resume
+        self.mailer = engine.MailingEngine(
+            settings, contacts, data,
+            on_status=lambda c, state, text: self.events.put(("status", c.get("id"), state, text, self.bytes_sent)),
+            on_error=lambda kind, error: self.events.put(("error", kind, str(error))))
+        self.thread = threading.Thread(target=self._run, name="mailflow-campaign", daemon=True)
+
+    @property
+    def bytes_sent(self):
+        return self.mailer.metrics.value("bytes_sent_total")
+
+    def _run(self):
+        stats = None
+        try:
+            stats = self.mailer.run(resume=self.resume_run)
+        finally:
+            self.events.put(("done", stats, self.mailer.cancelled.is_set(), self.mailer.size_limit))
+
+    def start(self):
+        self.thread.start()
+
+    def pause(self):
+        self.mailer.pause()
+
+    def resume(self):
+        self.mailer.resume()
+
+    def cancel(self):
+        self.mailer.cancel()
+
+    def is_alive(self):
+        return self.thread.is_alive()
+
+    def poll(self, limit=1000):
+        """Return up to limit pending events without blocking."""
+        return _drain(self.events, limit)
+
+
+def _drain(events, limit):
+    drained = []
+    try:
+        while len(drained) < limit:
+            drained.append(events.get_nowait())
+    except queue.Empty:
+        pass
+    return drained